@@ -8,31 +8,124 @@ Main Features:
 - Crawls real-time or historical stock data using an asynchronous crawler.
 - Processes the data with a stock processor.
 - Returns a processed CSV file as a downloadable response.
-- Includes a simple health check endpoint.
+- Offers a streaming variant that sends CSV rows to the client as each stock completes.
+- Shares a long-lived browser pool (started with the app) across all requests.
+- Optional TTL quote cache shared by all requests (and other adapters via SQLite).
+- Repeated stock codes within a request share a single in-flight fetch; across requests,
+  fetched quotes are shared through the cache. Coalescing is scoped to one request's
+  crawler, whose page pool the shared fetch runs on and which closes with the request.
+- Optional requests-per-second budget shared by all requests (and other adapters via a state file).
+- A circuit breaker shared by all requests fails fast while the LSE site is erroring.
+- Job-based processing for large uploads (`/jobs`): submit a CSV, poll progress and
+  download the result, with a bounded job queue (429 when full) and a fixed number of workers.
+- Optional quote history (SQLite, `QUOTE_HISTORY_PATH`) recording every fetched quote,
+  with endpoints serving the latest quote and a range of quote times per ticker straight
+  from the store (`/quotes/{stock_code}`, `/quotes/{stock_code}/history`), without
+  crawling; queries run off the event loop.
+- CSV parsing and serialisation run off the event loop (`core.async_io`), and the
+  event-loop lag is monitored and reported.
+- Includes a health check endpoint reporting browser pool readiness.
+- Exposes crawl pipeline metrics in the Prometheus format on `/metrics`.
 
 """
 
 import logging
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import StreamingResponse
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from contextlib import asynccontextmanager, nullcontext
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from api.job_manager import JobManager, JobQueueFullError
+from core.async_io import LoopLagMonitor, default_pool, open_records, run_blocking
+from core.browser_pool import BrowserPool
 from core.csv_handler import CSVHandler
 from core.crawler import Crawler
+from core.http_fetcher import HttpQuoteFetcher
+from core.quote_cache import create_quote_cache
+from core.quote_history import create_quote_history
+from core.rate_limiter import create_rate_limiter
+from core.resilience import CircuitBreaker
 from core.stock_processor import StocksProcessor
 from utils.logger_setup import setup_logging
 
 setup_logging("api")
 logger = logging.getLogger(__name__)
-app = FastAPI(title="Stock Processor API")
+
+
+@asynccontextmanager
+async def lifespan(app_: FastAPI):
+    pool_size = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+    app_.state.engine = os.getenv("CRAWLER_ENGINE", "browser")
+    app_.state.circuit_breaker = CircuitBreaker()
+    app_.state.rate_limiter = create_rate_limiter(
+        float(os.getenv("RATE_LIMIT_RPS", "0")),
+        burst=int(os.getenv("RATE_LIMIT_BURST", "5")),
+        path=os.getenv("RATE_LIMIT_FILE"),
+    )
+    app_.state.quote_cache = create_quote_cache(
+        os.getenv("QUOTE_CACHE_PATH"),
+        ttl=float(os.getenv("QUOTE_CACHE_TTL", "0")),
+        max_size=int(os.getenv("QUOTE_CACHE_SIZE", "10000")),
+    )
+    app_.state.quote_history = create_quote_history(os.getenv("QUOTE_HISTORY_PATH"))
+    job_manager = JobManager(
+        _create_crawler,
+        history=app_.state.quote_history,
+        workers=int(os.getenv("JOB_WORKERS", "2")),
+        max_queue=int(os.getenv("JOB_QUEUE_SIZE", "10")),
+        result_dir=os.getenv("JOB_RESULT_DIR"),
+    )
+    app_.state.loop_monitor = LoopLagMonitor()
+    # the HTTP fast path is only used by the http engine; its client is shared by all requests
+    http_fetcher_context = HttpQuoteFetcher() if app_.state.engine == "http" else nullcontext()
+    async with BrowserPool(size=pool_size) as pool, http_fetcher_context as http_fetcher, app_.state.loop_monitor:
+        app_.state.browser_pool = pool
+        app_.state.http_fetcher = http_fetcher
+        async with job_manager:
+            app_.state.job_manager = job_manager
+            yield
+        app_.state.job_manager = None
+    app_.state.browser_pool = None
+    app_.state.http_fetcher = None
+    if app_.state.quote_cache is not None:
+        app_.state.quote_cache.close()
+    if app_.state.quote_history is not None:
+        app_.state.quote_history.close()
+
+
+app = FastAPI(title="Stock Processor API", lifespan=lifespan)
+
+
+async def _create_crawler(refresh: bool) -> Crawler:
+    browser = await app.state.browser_pool.acquire()
+    return Crawler(
+        max_concurrent=5,
+        browser=browser,
+        engine=app.state.engine,
+        http_fetcher=app.state.http_fetcher,
+        cache=app.state.quote_cache,
+        force_refresh=refresh,
+        circuit_breaker=app.state.circuit_breaker,
+        rate_limiter=app.state.rate_limiter,
+    )
 
 
 @app.post("/process_csv", summary="Upload CSV and get processed CSV in response")
-async def process_csv(file: UploadFile = File(...)):
+async def process_csv(
+    file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Bypass cached quotes and fetch every stock again"),
+):
     """
     Process an uploaded CSV file containing stock information and return the processed data.
 
     This endpoint accepts a CSV file upload containing stock tickers.
     It reads the file, processes each stock entry asynchronously using a crawler, and
     returns a new CSV file containing the last known price along with a timestamp.
+    The connection stays open for the whole crawl, so it is meant for small files;
+    submit large files to `POST /jobs` instead.
 
     The process includes:
     - Validating the file format (must be a `.csv` file)
@@ -42,6 +135,7 @@ async def process_csv(file: UploadFile = File(...)):
 
     Args:
         file (UploadFile): The uploaded CSV file. Must have a `.csv` extension.
+        refresh (bool): If true, cached quotes are ignored and refreshed from the website.
 
     Returns:
         StreamingResponse: A downloadable CSV file (`stocks_result.csv`) containing the processed data.
@@ -55,12 +149,12 @@ async def process_csv(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
     try:
         content = await file.read()
-        stocks = CSVHandler.read_csv(content)
+        stocks = await run_blocking(CSVHandler.read_csv, content)
         logger.info("Received CSV with %s rows", len(stocks))
-        async with Crawler(max_concurrent=5) as crawler:
-            processor = StocksProcessor(crawler)
+        async with await _create_crawler(refresh) as crawler:
+            processor = StocksProcessor(crawler, history=app.state.quote_history)
             results = await processor.process_stocks(stocks)
-        csv_bytes = CSVHandler.write_csv(results, as_bytes=True)
+        csv_bytes = await run_blocking(CSVHandler.write_csv, results, as_bytes=True)
         return StreamingResponse(
             csv_bytes, media_type="text/csv", headers={"Content-Disposition": "attachment; filename=stocks_result.csv"}
         )
@@ -70,6 +164,184 @@ async def process_csv(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@app.post("/process_csv/stream", summary="Upload CSV and stream processed CSV rows as they complete")
+async def process_csv_stream(
+    file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Bypass cached quotes and fetch every stock again"),
+):
+    """
+    Process an uploaded CSV file and stream the processed rows back as they are produced.
+
+    Unlike `/process_csv`, the response starts as soon as the first stock completes, and rows
+    are sent in completion order rather than input order. Memory use does not grow with the
+    size of the result. Failed stocks are logged and omitted, as in `/process_csv`.
+
+    Args:
+        file (UploadFile): The uploaded CSV file. Must have a `.csv` extension.
+        refresh (bool): If true, cached quotes are ignored and refreshed from the website.
+
+    Returns:
+        StreamingResponse: A chunked CSV download (`stocks_result.csv`).
+
+    Raises:
+        HTTPException:
+            - 400: If the uploaded file is not a CSV file or lacks the required columns.
+            - 500: If the upload cannot be read or parsed. Errors after streaming has started
+              are logged and end the response early.
+    """
+    if not file.filename.endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    try:
+        await file.seek(0)
+        stocks = await open_records(file.file)
+        logger.info("Received CSV '%s' for streaming", file.filename)
+        crawler = await _create_crawler(refresh)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        logger.exception("Error processing CSV: %s", str(e))
+        raise HTTPException(status_code=500, detail=str(e)) from e
+
+    async def rows():
+        async with crawler:
+            processor = StocksProcessor(crawler, history=app.state.quote_history)
+            async for chunk in CSVHandler.stream_csv(processor.process_stream(stocks)):
+                yield chunk
+
+    return StreamingResponse(
+        rows(), media_type="text/csv", headers={"Content-Disposition": "attachment; filename=stocks_result.csv"}
+    )
+
+
+@app.post("/jobs", status_code=202, summary="Submit a CSV for background processing")
+async def submit_job(
+    file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Bypass cached quotes and fetch every stock again"),
+):
+    """
+    Queue an uploaded CSV file for background processing and return a job id immediately.
+
+    Use this endpoint for large files: poll `GET /jobs/{job_id}` for status and progress, then
+    download the processed CSV from `GET /jobs/{job_id}/result` once the job is `done`.
+
+    Args:
+        file (UploadFile): The uploaded CSV file. Must have a `.csv` extension.
+        refresh (bool): If true, cached quotes are ignored and refreshed from the website.
+
+    Returns:
+        dict: The queued job status, including `job_id`.
+
+    Raises:
+        HTTPException:
+            - 400: If the uploaded file is not a CSV file or lacks the required columns.
+            - 429: If the job queue is full; retry later.
+    """
+    if not file.filename.endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only CSV files are supported")
+    try:
+        job = await app.state.job_manager.submit(file.file, file.filename, refresh=refresh)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"}) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return job.to_dict()
+
+
+def _get_job(job_id: str):
+    job = app.state.job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@app.get("/jobs/{job_id}", summary="Get job status and progress")
+async def get_job(job_id: str):
+    return _get_job(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/result", summary="Download the processed CSV of a finished job")
+async def get_job_result(job_id: str):
+    """
+    Download the processed CSV of a job.
+
+    Raises:
+        HTTPException:
+            - 404: If the job does not exist (or has been evicted).
+            - 409: If the job is still queued or running, or has failed.
+    """
+    job = _get_job(job_id)
+    if job.status != "done":
+        detail = f"Job {job_id} is {job.status}" + (f": {job.error}" if job.error else "")
+        raise HTTPException(status_code=409, detail=detail)
+    return FileResponse(job.result_path, media_type="text/csv", filename=f"{Path(job.filename).stem}_result.csv")
+
+
+def _get_quote_history():
+    history = getattr(app.state, "quote_history", None)
+    if history is None:
+        raise HTTPException(status_code=503, detail="Quote history is not enabled (set QUOTE_HISTORY_PATH)")
+    return history
+
+
+@app.get("/quotes/{stock_code}", summary="Get the latest recorded quote of a stock")
+async def get_latest_quote(stock_code: str):
+    """
+    Return the most recently fetched quote of a stock from the quote history, without crawling.
+
+    Raises:
+        HTTPException:
+            - 404: If no quote of the stock has been recorded.
+            - 503: If the quote history is not enabled.
+    """
+    quote = await run_blocking(_get_quote_history().latest, stock_code)
+    if quote is None:
+        raise HTTPException(status_code=404, detail=f"No recorded quote for {stock_code}")
+    return quote
+
+
+@app.get("/quotes/{stock_code}/history", summary="Get recorded quotes of a stock over a time range")
+async def get_quote_history(
+    stock_code: str,
+    start: Optional[datetime] = Query(None, description="Earliest quote time (ISO 8601, UTC if no offset)"),
+    end: Optional[datetime] = Query(None, description="Latest quote time (ISO 8601, UTC if no offset)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of quotes, oldest first"),
+):
+    """
+    Return the quotes of a stock recorded between `start` and `end` (by quote time, inclusive),
+    oldest first, from the quote history, without crawling.
+
+    Raises:
+        HTTPException:
+            - 503: If the quote history is not enabled.
+    """
+    history = _get_quote_history()
+    quotes = await run_blocking(history.history, stock_code, start=start, end=end, limit=limit)
+    return {"stock_code": stock_code, "count": len(quotes), "quotes": quotes}
+
+
 @app.get("/health", summary="Health check")
 async def health():
-    return {"status": "ok"}
+    pool = getattr(app.state, "browser_pool", None)
+    pool_health = pool.health() if pool is not None else {"ready": False}
+    cache = getattr(app.state, "quote_cache", None)
+    breaker = getattr(app.state, "circuit_breaker", None)
+    jobs = getattr(app.state, "job_manager", None)
+    history = getattr(app.state, "quote_history", None)
+    loop_monitor = getattr(app.state, "loop_monitor", None)
+    content = {
+        "browser_pool": pool_health,
+        "quote_cache": cache.stats() if cache is not None else None,
+        "circuit_breaker": breaker.stats() if breaker is not None else None,
+        "jobs": jobs.stats() if jobs is not None else None,
+        "quote_history": history.stats() if history is not None else None,
+        "event_loop": loop_monitor.stats() if loop_monitor is not None else None,
+        "io_pool": default_pool().stats(),
+    }
+    if not pool_health["ready"]:
+        return JSONResponse(status_code=503, content={"status": "unavailable", **content})
+    return {"status": "ok", **content}
+
+
+@app.get("/metrics", summary="Prometheus metrics")
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,207 @@
+"""
+Job Manager
+------------------
+This module defines the `JobManager` class, which runs CSV processing jobs for the
+API in the background, so large uploads do not hold an HTTP connection open for
+the whole crawl.
+
+Features:
+- Uploads are copied to disk in chunks (never held in memory whole) and validated
+  (required columns, row count) on submit, off the event loop.
+- Jobs wait in a bounded `asyncio.Queue` and are run by a fixed number of workers,
+  each with its own crawler from the supplied factory.
+- Backpressure: `submit` raises `JobQueueFullError` when the queue is full.
+- Progress (processed / succeeded / failed rows) is updated as results arrive, and
+  results are streamed to a CSV file on disk; input parsing and output writes run
+  off the event loop (`core.async_io`).
+- Only the most recent finished jobs are retained; older ones are evicted together
+  with their result files.
+"""
+
+import asyncio
+import itertools
+import logging
+import shutil
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, BinaryIO, Callable, Optional, Union
+from core.async_io import AsyncRowWriter, open_records, run_blocking
+from core.csv_handler import CSVHandler
+from core.quote_history import QuoteHistory
+from core.stock_processor import StocksProcessor
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+class JobQueueFullError(Exception):
+    pass
+
+
+class Job:
+
+    def __init__(self, job_id: str, filename: str, total: int, refresh: bool, input_path: Path, result_path: Path):
+        self.id = job_id
+        self.filename = filename
+        self.total = total
+        self.refresh = refresh
+        self.input_path = input_path
+        self.result_path = result_path
+        self.status = "queued"
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def record(self, result: dict):
+        self.processed += 1
+        if result.get("status") == "success":
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "progress": round(self.processed / self.total, 4) if self.total else 1.0,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+
+    def __init__(
+        self,
+        crawler_factory: Callable[[bool], Awaitable],
+        workers: int = 2,
+        max_queue: int = 10,
+        result_dir: Optional[Union[str, Path]] = None,
+        max_finished_jobs: int = 100,
+        history: Optional[QuoteHistory] = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        self.crawler_factory = crawler_factory
+        self.workers = workers
+        self.max_finished_jobs = max_finished_jobs
+        self.history = history
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.jobs = OrderedDict()
+        self.owns_result_dir = result_dir is None
+        self.result_dir = Path(result_dir) if result_dir is not None else Path(tempfile.mkdtemp(prefix="lse_jobs_"))
+        self.result_dir.mkdir(parents=True, exist_ok=True)
+        self._tasks = []
+        logger.info("JobManager initialized with %s workers, queue size %s", workers, max_queue)
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.owns_result_dir:
+            shutil.rmtree(self.result_dir, ignore_errors=True)
+        logger.info("JobManager stopped.")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def submit(self, source: BinaryIO, filename: str, refresh: bool = False) -> Job:
+        if self.queue.full():
+            raise JobQueueFullError(f"Job queue is full ({self.queue.maxsize} jobs waiting)")
+        job_id = uuid.uuid4().hex
+        input_path = self.result_dir / f"{job_id}.input.csv"
+        try:
+            total = await run_blocking(self._spool, source, input_path)
+        except Exception:
+            input_path.unlink(missing_ok=True)
+            raise
+        job = Job(job_id, filename, total, refresh, input_path, self.result_dir / f"{job_id}.csv")
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull as e:
+            input_path.unlink(missing_ok=True)
+            raise JobQueueFullError(f"Job queue is full ({self.queue.maxsize} jobs waiting)") from e
+        self.jobs[job_id] = job
+        logger.info("Queued job %s for '%s' (%s rows, %s jobs waiting)", job_id, filename, total, self.queue.qsize())
+        return job
+
+    @staticmethod
+    def _spool(source: BinaryIO, path: Path) -> int:
+        with open(path, "wb") as target:
+            shutil.copyfileobj(source, target)
+        return sum(1 for _ in CSVHandler.iter_records(path))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self.queue.task_done()
+                self._evict_finished()
+            logger.info("Worker #%s finished job %s: %s", index, job.id, job.status)
+
+    async def _run(self, job: Job):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            stocks = await open_records(job.input_path)
+            async with await self.crawler_factory(job.refresh) as crawler:
+                processor = StocksProcessor(crawler, history=self.history)
+                async with AsyncRowWriter(CSVHandler.open_writer(job.result_path)) as writer:
+                    async for row in processor.process_stream(stocks, on_result=job.record):
+                        await writer.write_row(row)
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status, job.error = "failed", "Cancelled by shutdown"
+            raise
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.exception("Job %s failed: %s", job.id, str(e))
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.finished_at = time.time()
+            job.input_path.unlink(missing_ok=True)
+
+    def _evict_finished(self):
+        finished = [job for job in self.jobs.values() if job.finished]
+        for job in itertools.islice(finished, max(0, len(finished) - self.max_finished_jobs)):
+            del self.jobs[job.id]
+            job.result_path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        for job in self.jobs.values():
+            counts[job.status] += 1
+        return {"workers": self.workers, "queue_size": self.queue.qsize(), "max_queue": self.queue.maxsize, **counts}
@@ -5,15 +5,27 @@ This module defines the `CLIAdapter` class, which provides a command-line interf
 for processing stock data using the same underlying logic as the API.
 
 The adapter reads stock data from an input CSV file, processes each stock asynchronously
-(using the `Crawler` and `StocksProcessor`), and writes the processed results to an output CSV.
+(using the `Crawler` and `StocksProcessor`), and appends the processed results to an output CSV
+row by row as they are produced.
+
+With `workers > 1` the stock list is sharded across worker processes, each
+running its own crawler, and results are written back in input order.
+
+An optional Prometheus metrics snapshot is written at the end of the run, and
+successful quotes can be recorded in a `QuoteHistory`.
 
 It is designed to be invoked by a CLI entry point.
 """
 
 import logging
+from typing import Optional
+from core.async_io import AsyncRowWriter, open_records, run_blocking
 from core.stock_processor import StocksProcessor
-from core.crawler import Crawler
+from core.crawler import CrawlerOptions
+from core.sharding import create_crawler
 from core.csv_handler import CSVHandler
+from core.metrics import write_metrics_snapshot
+from core.quote_history import QuoteHistory
 
 logger = logging.getLogger(__name__)
 
@@ -21,21 +33,34 @@ logger = logging.getLogger(__name__)
 class CLIAdapter:
 
     @staticmethod
-    async def run(input_csv: str, output_csv: str):
+    async def run(
+        input_csv: str,
+        output_csv: str,
+        crawler_options: Optional[CrawlerOptions] = None,
+        workers: int = 1,
+        metrics_file: Optional[str] = None,
+        history: Optional[QuoteHistory] = None,
+    ):
         logger.info("Starting CLIAdapter run with input='%s' and output='%s'", input_csv, output_csv)
         try:
-            logger.info("Reading input CSV: %s", input_csv)
-            stocks = CSVHandler.read_csv(input_csv)
-            logger.info("Loaded %s stock entries from CSV", len(stocks))
-            async with Crawler(max_concurrent=5) as crawler:
-                processor = StocksProcessor(crawler)
-                logger.info("Processing stocks asynchronously...")
-                results = await processor.process_stocks(stocks)
+            logger.info("Reading input CSV lazily: %s", input_csv)
+            stocks = await open_records(input_csv)
+            crawler_options = crawler_options or CrawlerOptions(max_concurrent=5)
+            async with create_crawler(crawler_options, workers=workers) as crawler:
+                processor = StocksProcessor(crawler, history=history)
+                logger.info("Processing stocks asynchronously, appending results to %s...", output_csv)
+                async with AsyncRowWriter(CSVHandler.open_writer(output_csv, append=True)) as writer:
+                    async for row in processor.process_stream(stocks):
+                        await writer.write_row(row)
                 logger.info("Stock processing completed successfully.")
-            logger.info("Saving results to %s", output_csv)
-            CSVHandler.write_csv(data=results, path=output_csv, append=True)
-            logger.info("Output CSV written successfully.")
+            logger.info("Output CSV written successfully (%s rows).", writer.rows_written)
         except Exception as e:
             logger.exception("Error during CLIAdapter run: %s", str(e))
             raise
+        finally:
+            if history is not None:
+                await run_blocking(history.close)
+            if metrics_file:
+                write_metrics_snapshot(metrics_file)
+                logger.info("Metrics snapshot written to %s", metrics_file)
         logger.info("CLIAdapter run completed.")
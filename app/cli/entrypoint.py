@@ -15,14 +15,21 @@ The CLI provides an easy way to run processing of single csv file.
 import asyncio
 import argparse
 import logging
+import signal
 import sys
 from cli.cli_adapter import CLIAdapter
+from utils.crawler_options import add_crawler_arguments, crawler_options_from_args
+from utils.history_options import add_history_arguments, quote_history_from_args
 from utils.logger_setup import setup_logging
 
 setup_logging("cli")
 logger = logging.getLogger(__name__)
 
 
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
 def main():
     parser = argparse.ArgumentParser(description="London Stock Exchange crawler CLI")
     parser.add_argument(
@@ -37,13 +44,35 @@ def main():
         required=True,
         help="Path to output CSV file to save results",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="Number of crawler processes to shard the input across (default: 1, no sharding).",
+    )
+    parser.add_argument(
+        "--metrics-file", help="Write a Prometheus metrics snapshot (text format) to this file after each run."
+    )
+    add_history_arguments(parser)
+    add_crawler_arguments(parser)
 
     args = parser.parse_args()
     logger.info("CLI Entrypoint started")
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
     try:
-        asyncio.run(CLIAdapter.run(args.input, args.output))
+        asyncio.run(
+            CLIAdapter.run(
+                args.input,
+                args.output,
+                crawler_options_from_args(args),
+                workers=args.workers,
+                metrics_file=args.metrics_file,
+                history=quote_history_from_args(args),
+            )
+        )
     except KeyboardInterrupt:
-        logger.warning("Execution interrupted by user (Ctrl+C)")
+        logger.warning("Execution interrupted (Ctrl+C or SIGTERM)")
         sys.exit(1)
     except Exception as e:  # pylint:disable=broad-exception-caught
         logger.error("Fatal error: %s", str(e))
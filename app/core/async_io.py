@@ -0,0 +1,228 @@
+"""
+Async I/O
+----------------
+This module keeps blocking file work (CSV parsing and serialisation, Parquet and
+CSV writes) off the event loop, so large reads and writes do not stall in-flight
+Playwright pages or API requests, and provides a monitor of event-loop lag.
+
+Components:
+- `BlockingPool`: a thread pool with a bounded number of submitted calls; callers
+  wait (asynchronously) for a free slot instead of queueing work without limit.
+- `run_blocking`: run a call on the shared default pool.
+- `open_records`: `CSVHandler.iter_records` as an async iterator, parsing each
+  chunk in the pool.
+- `AsyncRowWriter`: wraps a row writer (`CSVStreamWriter`, `ParquetStreamWriter`);
+  rows are buffered and written in batches, in order, by the pool, with a bounded
+  number of batches waiting (backpressure on the producer).
+- `LoopLagMonitor`: measures how late the event loop wakes up from a short sleep,
+  records it in the `lse_event_loop_lag_seconds` metric and warns above a threshold.
+
+Threads rather than processes are used: the work is dominated by file I/O and by
+libraries that release the GIL (pyarrow, sqlite3), and rows would otherwise have
+to be pickled to another process.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Callable, Iterable, Iterator, Optional, Union
+from core.csv_handler import REQUIRED_COLUMNS, CSVHandler
+from core.metrics import LOOP_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingPool:
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_pending < max_workers:
+            raise ValueError("max_pending must be at least max_workers")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lse-io")
+        self._slots = None
+        self.pending = 0
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            self.pending += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+            finally:
+                self.pending -= 1
+
+    def stats(self) -> dict:
+        return {"max_workers": self.max_workers, "max_pending": self.max_pending, "pending": self.pending}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+_default_pool = None
+
+
+def default_pool() -> BlockingPool:
+    global _default_pool  # pylint:disable=global-statement
+    if _default_pool is None:
+        _default_pool = BlockingPool()
+    return _default_pool
+
+
+async def run_blocking(fn: Callable, *args, **kwargs):
+    return await default_pool().run(fn, *args, **kwargs)
+
+
+async def open_records(
+    path_or_bytes: Union[str, Path, bytes, BinaryIO],
+    chunk_size: int = 1000,
+    required_columns: Optional[Iterable[str]] = REQUIRED_COLUMNS,
+    pool: Optional[BlockingPool] = None,
+) -> AsyncIterator[dict]:
+    pool = pool or default_pool()
+    # opened (and the header validated) up front, so a bad file fails before any crawling starts
+    chunks = await pool.run(CSVHandler.iter_csv, path_or_bytes, chunk_size, required_columns)
+    return _aiter_chunks(chunks, pool)
+
+
+async def _aiter_chunks(chunks: Iterator[list[dict]], pool: BlockingPool) -> AsyncIterator[dict]:
+    try:
+        while True:
+            chunk = await pool.run(next, chunks, None)
+            if chunk is None:
+                return
+            for record in chunk:
+                yield record
+    finally:
+        await pool.run(chunks.close)
+
+
+class AsyncRowWriter:
+
+    def __init__(
+        self, writer, batch_size: int = 500, max_pending_batches: int = 4, pool: Optional[BlockingPool] = None
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.writer = writer
+        self.batch_size = batch_size
+        self.pool = pool or default_pool()
+        self._batch = []
+        self._queue = asyncio.Queue(maxsize=max_pending_batches)
+        self._drain = None
+        self.rows_written = 0
+        self.closed = False
+
+    async def write_row(self, row: dict):
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_size:
+            await self._submit()
+
+    async def _submit(self):
+        if not self._batch:
+            return
+        if self._drain is None:
+            self._drain = asyncio.create_task(self._drain_batches())
+        batch, self._batch = self._batch, []
+        await self._put(batch)
+
+    async def _put(self, item: Optional[list[dict]]):
+        # fail instead of waiting forever on a full queue when the writer task has died
+        put = asyncio.ensure_future(self._queue.put(item))
+        try:
+            await asyncio.wait({put, self._drain}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not put.done():
+                put.cancel()
+        if not put.done() or put.cancelled():
+            self._drain.result()
+
+    async def _drain_batches(self):
+        # a single consumer keeps batches in order
+        while True:
+            batch = await self._queue.get()
+            if batch is None:
+                return
+            await self.pool.run(self._write_batch, batch)
+            self.rows_written += len(batch)
+
+    def _write_batch(self, batch: list[dict]):
+        for row in batch:
+            self.writer.write_row(row)
+
+    async def close(self):
+        try:
+            await self._submit()
+            if self._drain is not None:
+                await self._put(None)
+                await self._drain
+        finally:
+            if self._drain is not None and not self._drain.done():
+                self._drain.cancel()
+            await self.pool.run(self.writer.close)
+        # only set once every row reached the underlying writer and it closed cleanly
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+class LoopLagMonitor:
+
+    def __init__(self, interval: float = 0.5, warn_threshold: float = 0.25):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.warnings = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def record(self, lag: float):
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        LOOP_LAG_SECONDS.observe(lag)
+        if lag >= self.warn_threshold:
+            self.warnings += 1
+            logger.warning("Event loop lagged %.3fs behind schedule; a blocking call is stalling the loop", lag)
+
+    def stats(self) -> dict:
+        return {
+            "last_lag_seconds": round(self.last_lag, 4),
+            "max_lag_seconds": round(self.max_lag, 4),
+            "samples": self.samples,
+            "warnings": self.warnings,
+        }
@@ -0,0 +1,58 @@
+"""
+Batch Crawler
+--------------------
+This module defines the `BatchCrawler` class, a view over a shared, long-lived
+`Crawler` that fetches each stock code at most once for the lifetime of the view.
+
+The Watchdog adapter creates one per batch of files that arrive together, so a
+ticker listed in several of those files (processed concurrently or one after
+another) is fetched only once; every file still gets its own row with its own
+company name.
+
+Features:
+- Concurrent requests for the same code join one fetch (`SingleFlight`); results
+  (successful or failed) are kept for later requests from the same batch.
+- Same `crawl_iter` interface as `Crawler`, so it can be passed to `StocksProcessor`.
+- A counter of requests served without a new fetch.
+"""
+
+import logging
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Union
+from core.crawler import SAMPLED, Crawler
+from core.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCrawler:
+
+    def __init__(self, crawler: Crawler):
+        self.crawler = crawler
+        self.results = {}
+        self.single_flight = SingleFlight()
+        self.reused = 0
+
+    @property
+    def deduplicated(self) -> int:
+        return self.reused + self.single_flight.coalesced
+
+    async def get_stock_data(self, stock: dict, force_refresh: Optional[bool] = None) -> dict:
+        code = stock["stock code"]
+        result = self.results.get(code)
+        if result is None:
+            result = await self.single_flight.do(code, lambda: self._fetch(stock, force_refresh))
+        else:
+            self.reused += 1
+            logger.debug("Reusing result for %s from this batch", code, extra=SAMPLED)
+        return {**result, "company name": stock["company name"]}
+
+    async def _fetch(self, stock: dict, force_refresh: Optional[bool]) -> dict:
+        result = await self.crawler.get_stock_data(stock, force_refresh=force_refresh)
+        # stored before the shared task completes, so no later caller can start a second fetch
+        self.results[stock["stock code"]] = result
+        return result
+
+    def crawl_iter(
+        self, stocks: Union[Iterable[dict], AsyncIterable[dict]], force_refresh: Optional[bool] = None
+    ) -> AsyncIterator[dict]:
+        return self.crawler.crawl_iter(stocks, force_refresh=force_refresh, fetch=self.get_stock_data)
@@ -0,0 +1,92 @@
+"""
+Browser Pool
+--------------------
+This module defines the `BrowserPool` class, which owns a single Playwright
+instance and a fixed number of long-lived Chromium browsers that can be shared
+by many `Crawler` instances.
+
+It is designed for long-running services (e.g. the API) where launching a new
+browser per request would dominate request latency.
+
+Features:
+- Playwright is started and browsers are launched once, at pool start-up.
+- Configurable number of browser instances handed out round-robin.
+- Disconnected (crashed) browsers are relaunched transparently on acquire.
+- Health/readiness reporting for monitoring endpoints.
+"""
+
+import asyncio
+import itertools
+import logging
+from playwright.async_api import async_playwright
+from core.metrics import BROWSER_LAUNCH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+
+    def __init__(self, size: int = 1, headless: bool = True):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.headless = headless
+        self.playwright = None
+        self.browsers = []
+        self._cycle = None
+        self._lock = asyncio.Lock()
+        self.started = False
+        logger.info("BrowserPool initialized with size=%s", size)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def start(self):
+        logger.info("Starting Playwright and launching %s browser(s)...", self.size)
+        self.playwright = await async_playwright().start()
+        self.browsers = [await self._launch() for _ in range(self.size)]
+        self._cycle = itertools.cycle(range(self.size))
+        self.started = True
+        logger.info("BrowserPool ready.")
+
+    async def stop(self):
+        logger.info("Closing browser pool...")
+        self.started = False
+        for browser in self.browsers:
+            try:
+                await browser.close()
+            except Exception as e:  # pylint:disable=broad-exception-caught
+                logger.warning("Error closing pooled browser: %s", str(e))
+        self.browsers = []
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+        logger.info("Browser pool shut down cleanly.")
+
+    async def _launch(self):
+        with BROWSER_LAUNCH_SECONDS.time():
+            return await self.playwright.chromium.launch(headless=self.headless)
+
+    async def acquire(self):
+        if not self.started:
+            raise RuntimeError("BrowserPool is not started")
+        async with self._lock:
+            index = next(self._cycle)
+            browser = self.browsers[index]
+            if not browser.is_connected():
+                logger.warning("Pooled browser #%s disconnected, relaunching...", index)
+                browser = await self._launch()
+                self.browsers[index] = browser
+        return browser
+
+    def health(self) -> dict:
+        connected = sum(1 for b in self.browsers if b.is_connected())
+        return {
+            "ready": self.started and connected > 0,
+            "size": self.size,
+            "connected": connected,
+        }
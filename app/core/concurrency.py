@@ -0,0 +1,137 @@
+"""
+Concurrency Limiters
+---------------------------
+This module defines the concurrency limiters used by `Crawler` to bound how many
+stocks are fetched at the same time.
+
+Limiters:
+- `FixedLimiter`: a static limit, equivalent to `asyncio.Semaphore(max_concurrent)`.
+- `AIMDLimiter`: an adaptive limit using additive-increase / multiplicative-decrease
+  on observed latency and error rate, bounded by a floor and a ceiling.
+
+Both are async context managers guarding one fetch, and accept `record(latency, error_class)`
+after each fetch, with the failure class from `resilience.classify_error` (None on success).
+Only transient failures (timeouts, navigation errors) count as overload; a missing page
+or selector says nothing about the site's load. The current limit and in-flight count are exposed via `limit`,
+`in_flight` and `stats()` for monitoring.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Iterable, Optional
+
+from core.resilience import TRANSIENT_ERROR_CLASSES
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY_MODES = ("fixed", "adaptive")
+
+
+class FixedLimiter:
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self.in_flight = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *args):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def record(self, latency: float, error_class: Optional[str]):
+        pass
+
+    def stats(self) -> dict:
+        return {"mode": "fixed", "limit": self.limit, "in_flight": self.in_flight}
+
+
+class AIMDLimiter:
+
+    def __init__(
+        self,
+        initial: int = 5,
+        floor: int = 1,
+        ceiling: int = 50,
+        latency_target: float = 10.0,
+        error_threshold: float = 0.1,
+        window: int = 10,
+        increase: int = 1,
+        decrease_factor: float = 0.5,
+        overload_errors: Iterable[str] = TRANSIENT_ERROR_CLASSES,
+    ):
+        if not 1 <= floor <= ceiling:
+            raise ValueError("expected 1 <= floor <= ceiling")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.floor = floor
+        self.ceiling = ceiling
+        self.limit = min(max(initial, floor), ceiling)
+        self.latency_target = latency_target
+        self.error_threshold = error_threshold
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.overload_errors = frozenset(overload_errors)
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._samples = deque(maxlen=window)
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *args):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, latency: float, error_class: Optional[str]):
+        self._samples.append((latency, error_class not in self.overload_errors))
+        errors = sum(1 for _, ok in self._samples if not ok)
+        slow = sum(1 for elapsed, ok in self._samples if ok and elapsed > self.latency_target)
+        overloaded = errors > self.error_threshold * self._samples.maxlen or slow > len(self._samples) // 2
+        if overloaded:
+            self._set_limit(max(self.floor, int(self.limit * self.decrease_factor)))
+            self.decreases += 1
+            self._samples.clear()
+        elif len(self._samples) == self._samples.maxlen:
+            self._set_limit(min(self.ceiling, self.limit + self.increase))
+            self.increases += 1
+            self._samples.clear()
+
+    def _set_limit(self, limit: int):
+        if limit != self.limit:
+            logger.info("Adaptive concurrency limit %s -> %s (in flight: %s)", self.limit, limit, self.in_flight)
+        # Waiters only block while the limiter is full, so the next release re-checks the new limit.
+        self.limit = limit
+
+    def stats(self) -> dict:
+        return {
+            "mode": "adaptive",
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "floor": self.floor,
+            "ceiling": self.ceiling,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+def create_limiter(mode: str = "fixed", max_concurrent: int = 10, min_concurrent: int = 1):
+    if mode == "fixed":
+        return FixedLimiter(max_concurrent)
+    if mode == "adaptive":
+        floor = min(min_concurrent, max_concurrent)
+        return AIMDLimiter(initial=max(floor, max_concurrent // 2), floor=floor, ceiling=max_concurrent)
+    raise ValueError(f"concurrency mode must be one of {CONCURRENCY_MODES}, got {mode!r}")
@@ -5,101 +5,499 @@ This module defines the `Crawler` class, which asynchronously retrieves
 live stock data from the **London Stock Exchange (LSE)** website using Playwright.
 
 It is designed for concurrent data fetching, supporting configurable
-parallelism through an asyncio semaphore to balance performance and resource usage.
+parallelism through a concurrency limiter to balance performance and resource usage.
 
 Features:
 - Asynchronous crawling using `playwright.async_api`.
-- Concurrency control with configurable limits.
+- Concurrency control with configurable limits: fixed, or adaptive (AIMD on observed
+  latency and error rate between `min_concurrent` and `max_concurrent`).
 - Automatic URL construction based on stock codes and company names.
 - Extraction of price, currency, and timestamp data from company pages.
+- Optional use of an externally owned browser (e.g. from a `BrowserPool`).
+- Warm page reuse across stocks through a `PagePool` in a dedicated browser context.
+- Blocking of unused assets and trackers on that context through a `ResourceBlocker`.
+- Single-round-trip field extraction (one in-page wait for all selectors under
+  one per-stock deadline), with the legacy sequential mode still available.
+- Optional TTL quote cache (`QuoteCache`) in front of every fetch, with forced refresh.
+- Single-flight coalescing of concurrent fetches of the same stock code, and
+  de-duplication of repeated codes within one `crawl_all` batch.
+- Streaming crawl (`crawl_iter`) yielding results as they complete while pulling
+  input lazily from a (sync or async) iterable with a bounded number of pending tasks
+  and a bounded set of recent results reused for repeated codes;
+  the per-stock fetch can be replaced (e.g. by a `BatchCrawler` sharing results across files).
+- Failure classification (`error_class` on failed results), retries with jittered
+  exponential backoff for transient failures (`RetryPolicy`) and a host-level
+  `CircuitBreaker` that fails the rest of a batch fast while the site is down.
+- Optional requests-per-second budget (`TokenBucket`, or `FileTokenBucket` shared
+  between processes) applied to every page request, including retries and fallbacks.
+- Prometheus metrics (`core.metrics`) for browser launch, navigation, per-field
+  selector waits, fetch attempts, results by failure class and pages in flight.
+- All settings grouped in one `CrawlerOptions` object, with per-crawler keyword overrides
+  (e.g. `Crawler(options, browser=browser, force_refresh=True)`).
+- Selectable fetch engine: `"browser"` (Playwright only) or `"http"` (browserless
+  `HttpQuoteFetcher` fast path, falling back to Playwright per stock when needed).
 """
 
 import asyncio
 import re
 import logging
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Optional, Union
 from playwright.async_api import async_playwright
+from core.concurrency import create_limiter
+from core.http_fetcher import HttpQuoteFetcher
+from core.metrics import (
+    BROWSER_LAUNCH_SECONDS,
+    CONCURRENCY_LIMIT,
+    FETCH_SECONDS,
+    NAVIGATION_SECONDS,
+    PAGES_IN_FLIGHT,
+    SELECTOR_WAIT_SECONDS,
+    STOCK_RESULTS,
+)
+from core.page_pool import PagePool
+from core.quote_cache import QuoteCache
+from core.rate_limiter import TokenBucket
+from core.resilience import CircuitBreaker, MissingSelectorError, NotFoundError, RetryPolicy, classify_error
+from core.resource_blocker import ResourceBlocker
+from core.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+ENGINES = ("browser", "http")
+EXTRACTION_MODES = ("single", "sequential")
+SAMPLED = {"sampled": True}  # marks per-stock log lines that LOG_SAMPLE_EVERY / LOG_RATE_LIMIT may thin out
+RECENT_RESULTS = 1024  # results kept by `crawl_iter` for repeated codes; older repeats go through the cache
+
+SELECTORS = {
+    "price": ".price-tag",
+    "timestamp": ".bold-font-weight.refreshed-time",
+    "currency": ".currency-label.small-font-size.item-label strong",
+}
+
+# Waits in-page until every selector has non-empty text (or the timeout expires) and
+# returns all texts plus the time each field took to appear, in a single evaluation.
+EXTRACT_FIELDS_JS = """
+([selectors, timeout]) => new Promise((resolve) => {
+    const start = performance.now();
+    const fields = {};
+    const timings = {};
+    const names = Object.keys(selectors);
+    const check = () => {
+        for (const name of names) {
+            if (name in fields) continue;
+            const element = document.querySelector(selectors[name]);
+            const text = element ? element.textContent : null;
+            if (text && text.trim()) {
+                fields[name] = text;
+                timings[name] = performance.now() - start;
+            }
+        }
+        return names.every((name) => name in fields);
+    };
+    let observer = null;
+    let timer = null;
+    const finish = () => {
+        if (observer) observer.disconnect();
+        if (timer) clearTimeout(timer);
+        resolve({fields, timings, missing: names.filter((name) => !(name in fields))});
+    };
+    if (check()) {
+        finish();
+        return;
+    }
+    observer = new MutationObserver(() => { if (check()) finish(); });
+    observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(finish, timeout);
+})
+"""
+
+
+@dataclass
+class CrawlerOptions:  # pylint:disable=too-many-instance-attributes  # one field per crawler setting
+    # crawl settings; `utils.crawler_options` builds them from the command line
+    max_concurrent: int = 10
+    concurrency: str = "fixed"
+    min_concurrent: int = 1
+    engine: str = "browser"
+    extraction: str = "single"
+    stock_timeout: float = 30.0
+    page_max_uses: int = 50
+    block_resources: bool = True
+    cache: Optional[QuoteCache] = None
+    force_refresh: bool = False
+    retry_policy: Optional[RetryPolicy] = None
+    circuit_breaker: Optional[CircuitBreaker] = None
+    rate_limiter: Optional[TokenBucket] = None
+    # collaborators shared with other crawlers in the same process (not picklable)
+    browser: Any = None
+    http_fetcher: Optional[HttpQuoteFetcher] = None
+    resource_blocker: Optional[ResourceBlocker] = None
+    single_flight: Optional[SingleFlight] = None
+    limiter: Any = None
+
+    def __post_init__(self):
+        if self.engine not in ENGINES:
+            raise ValueError(f"engine must be one of {ENGINES}, got {self.engine!r}")
+        if self.extraction not in EXTRACTION_MODES:
+            raise ValueError(f"extraction must be one of {EXTRACTION_MODES}, got {self.extraction!r}")
+
 
 class Crawler:
 
-    def __init__(self, max_concurrent: int = 10):
+    def __init__(self, options: Optional[CrawlerOptions] = None, **overrides):
+        options = replace(options or CrawlerOptions(), **overrides)
+        self.options = options
         self.base_url = "https://www.londonstockexchange.com/stock/"
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        self.browser = None
+        self.max_concurrent = options.max_concurrent
+        self.limiter = (
+            options.limiter
+            if options.limiter is not None
+            else create_limiter(options.concurrency, options.max_concurrent, options.min_concurrent)
+        )
+        self.browser = options.browser
+        self.owns_browser = options.browser is None
         self.playwright = None
-        logger.info("Crawler initialized with max_concurrent=%s", max_concurrent)
+        self._browser_lock = asyncio.Lock()
+        self.engine = options.engine
+        self.http_fetcher = options.http_fetcher
+        self.owns_http_fetcher = options.engine == "http" and options.http_fetcher is None
+        self.extraction = options.extraction
+        self.stock_timeout = options.stock_timeout
+        self.cache = options.cache
+        self.force_refresh = options.force_refresh
+        self.single_flight = options.single_flight if options.single_flight is not None else SingleFlight()
+        self.retry_policy = options.retry_policy if options.retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = options.circuit_breaker if options.circuit_breaker is not None else CircuitBreaker()
+        self.rate_limiter = options.rate_limiter
+        self.page_max_uses = options.page_max_uses
+        self.context = None
+        self.page_pool = None
+        self._pool_lock = asyncio.Lock()
+        if options.block_resources:
+            self.resource_blocker = (
+                options.resource_blocker if options.resource_blocker is not None else ResourceBlocker()
+            )
+        else:
+            self.resource_blocker = None
+        logger.info(
+            "Crawler initialized with max_concurrent=%s, concurrency=%s, engine=%s",
+            options.max_concurrent,
+            options.concurrency,
+            options.engine,
+        )
 
     def _build_url(self, stock: dict) -> str:
         company_name = stock["company name"].lower().replace(" ", "-")
         url = f'{self.base_url}{stock["stock code"]}/{company_name}/company-page'
-        logger.debug("Built URL for %s (%s): %s", stock["company name"], stock["stock code"], url)
+        logger.debug("Built URL for %s (%s): %s", stock["company name"], stock["stock code"], url, extra=SAMPLED)
         return url
 
+    async def _ensure_browser(self):
+        async with self._browser_lock:
+            if self.browser is not None:
+                return
+            logger.info("Starting Playwright and launching browser...")
+            self.playwright = await async_playwright().start()
+            with BROWSER_LAUNCH_SECONDS.time():
+                self.browser = await self.playwright.chromium.launch(headless=True)
+            logger.info("Browser launched successfully.")
+
     async def __aenter__(self):
-        logger.info("Starting Playwright and launching browser...")
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=True)
-        logger.info("Browser launched successfully.")
+        if self.owns_http_fetcher:
+            self.http_fetcher = HttpQuoteFetcher(max_connections=self.max_concurrent)
+            await self.http_fetcher.start()
+        if not self.owns_browser:
+            logger.info("Using shared browser, skipping launch.")
+        elif self.engine == "browser":
+            await self._ensure_browser()
         return self
 
     async def __aexit__(self, *args):
+        await self._close_page_pool()
+        if self.owns_http_fetcher and self.http_fetcher is not None:
+            await self.http_fetcher.stop()
+            self.http_fetcher = None
+        if not self.owns_browser or self.browser is None:
+            return
         logger.info("Closing browser and stopping Playwright...")
         await self.browser.close()
         await self.playwright.stop()
+        self.browser = None
+        self.playwright = None
         logger.info("Browser and Playwright shut down cleanly.")
 
-    async def get_stock_data(self, stock: dict) -> dict:
+    async def _get_page_pool(self) -> PagePool:
+        async with self._pool_lock:
+            if self.page_pool is None:
+                await self._ensure_browser()
+                self.context = await self.browser.new_context()
+                if self.resource_blocker is not None:
+                    await self.context.route("**/*", self.resource_blocker.handle)
+                self.page_pool = PagePool(self.context, size=self.max_concurrent, max_uses=self.page_max_uses)
+                logger.debug("Created browser context and page pool (size=%s)", self.max_concurrent)
+        return self.page_pool
+
+    async def _close_page_pool(self):
+        if self.page_pool is None:
+            return
+        await self.page_pool.close()
+        try:
+            await self.context.close()
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.warning("Error closing browser context: %s", str(e))
+        self.page_pool = None
+        self.context = None
+        if self.resource_blocker is not None:
+            logger.info("Resource blocking stats: %s", self.resource_blocker.stats())
+
+    @staticmethod
+    def _success_result(stock: dict, price_text: str, currency: str, timestamp: Optional[str]) -> dict:
+        currency = re.sub(r'[^A-Za-z]', '', currency)
+        return {
+            "stock code": stock["stock code"],
+            "company name": stock["company name"],
+            "price": f"{price_text}{currency}",
+            "timestamp": timestamp.strip() if timestamp else None,
+            "status": "success",
+            "error": None,
+        }
+
+    @staticmethod
+    def _failed_result(stock: dict, error: str, error_class: str = "unknown") -> dict:
+        return {
+            "stock code": stock["stock code"],
+            "company name": stock["company name"],
+            "price": None,
+            "timestamp": None,
+            "status": "failed",
+            "error": error,
+            "error_class": error_class,
+        }
+
+    @staticmethod
+    def _check_response(response, url: str):
+        if response is not None and response.status == 404:
+            raise NotFoundError(f"Page not found (404): {url}")
+
+    async def _scrape_page(self, page, url: str, stock: dict) -> dict:
+        if self.extraction == "sequential":
+            return await self._scrape_page_sequential(page, url, stock)
+        return await asyncio.wait_for(self._scrape_page_single(page, url, stock), timeout=self.stock_timeout + 1)
+
+    async def _scrape_page_single(self, page, url: str, stock: dict) -> dict:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        response = await page.goto(url, timeout=self.stock_timeout * 1000, wait_until="domcontentloaded")
+        self._check_response(response, url)
+        navigated = loop.time()
+        NAVIGATION_SECONDS.observe(navigated - started)
+        logger.debug("Navigated to %s in %.0f ms", url, (navigated - started) * 1000, extra=SAMPLED)
+
+        remaining_ms = max(0.0, self.stock_timeout - (navigated - started)) * 1000
+        extracted = await page.evaluate(EXTRACT_FIELDS_JS, [SELECTORS, remaining_ms])
+        for name, elapsed_ms in extracted["timings"].items():
+            SELECTOR_WAIT_SECONDS.labels(name).observe(elapsed_ms / 1000)
+            logger.debug("Field '%s' for %s ready after %.0f ms", name, stock["stock code"], elapsed_ms, extra=SAMPLED)
+        if extracted["missing"]:
+            raise MissingSelectorError(
+                f"Timed out after {self.stock_timeout}s waiting for selectors: "
+                + ", ".join(SELECTORS[name] for name in extracted["missing"])
+            )
+
+        fields = extracted["fields"]
+        return self._success_result(stock, fields["price"].strip(), fields["currency"], fields["timestamp"])
+
+    async def _scrape_page_sequential(self, page, url: str, stock: dict) -> dict:
+        with NAVIGATION_SECONDS.time():
+            response = await page.goto(url, timeout=30000)
+        self._check_response(response, url)
+        logger.debug("Navigated to %s", url, extra=SAMPLED)
+
+        with SELECTOR_WAIT_SECONDS.labels("price").time():
+            await page.wait_for_selector(".price-tag", timeout=30000)
+        price_text = await page.text_content(".price-tag")
+
+        with SELECTOR_WAIT_SECONDS.labels("timestamp").time():
+            await page.wait_for_selector(".bold-font-weight.refreshed-time", timeout=30000)
+        timestamp = await page.text_content(".bold-font-weight.refreshed-time")
+
+        with SELECTOR_WAIT_SECONDS.labels("currency").time():
+            await page.wait_for_selector(".currency-label.small-font-size.item-label strong", timeout=30000)
+        currency = await page.text_content(".currency-label.small-font-size.item-label strong", timeout=30000)
+
+        return self._success_result(stock, price_text, currency, timestamp)
+
+    async def _fetch_with_http(self, url: str, stock: dict) -> Optional[dict]:
+        fields = await self.http_fetcher.fetch(url)
+        if fields is None:
+            logger.info("HTTP fast path missed %s, falling back to browser", stock["stock code"], extra=SAMPLED)
+            return None
+        logger.debug("HTTP fast path hit for %s", stock["stock code"], extra=SAMPLED)
+        return self._success_result(stock, fields["price"], fields["currency"], fields["timestamp"])
+
+    def _get_cached(self, stock: dict, force_refresh: Optional[bool]) -> Optional[dict]:
+        if self.cache is None:
+            return None
+        if force_refresh if force_refresh is not None else self.force_refresh:
+            return None
+        cached = self.cache.get(stock["stock code"])
+        if cached is None:
+            return None
+        logger.debug("Cache hit for %s", stock["stock code"], extra=SAMPLED)
+        cached["company name"] = stock["company name"]
+        return cached
+
+    async def get_stock_data(self, stock: dict, force_refresh: Optional[bool] = None) -> dict:
+        cached = self._get_cached(stock, force_refresh)
+        if cached is not None:
+            return cached
+
+        result = await self.single_flight.do(stock["stock code"], lambda: self._fetch_stock_data(stock))
+        return {**result, "company name": stock["company name"]}
+
+    async def _fetch_stock_data(self, stock: dict) -> dict:
         url = self._build_url(stock)
-        logger.info("Fetching stock data for %s (%s)", stock["company name"], stock["stock code"])
-
-        async with self.semaphore:
-            page = await self.browser.new_page()
-            try:
-                await page.goto(url, timeout=30000)
-                logger.debug("Navigated to %s", url)
-
-                await page.wait_for_selector(".price-tag", timeout=30000)
-                price_text = await page.text_content(".price-tag")
-
-                await page.wait_for_selector(".bold-font-weight.refreshed-time", timeout=30000)
-                timestamp = await page.text_content(".bold-font-weight.refreshed-time")
-
-                await page.wait_for_selector(".currency-label.small-font-size.item-label strong", timeout=30000)
-                currency = await page.text_content(".currency-label.small-font-size.item-label strong", timeout=30000)
-                currency = re.sub(r'[^A-Za-z]', '', currency)
-
-                logger.info("Successfully fetched data for %s", stock["company name"])
-
-                result = {
-                    "stock code": stock["stock code"],
-                    "company name": stock["company name"],
-                    "price": f"{price_text}{currency}",
-                    "timestamp": timestamp.strip() if timestamp else None,
-                    "status": "success",
-                    "error": None,
-                }
-
-            except Exception as e:  # pylint:disable=broad-exception-caught
-                logger.error("Error fetching data for %s (%s): %s", stock["company name"], stock["stock code"], str(e))
-                result = {
-                    "stock code": stock["stock code"],
-                    "company name": stock["company name"],
-                    "price": None,
-                    "timestamp": None,
-                    "status": "failed",
-                    "error": str(e),
-                }
-
-            finally:
-                await page.close()
-                logger.debug("Closed page for %s", stock["company name"])
+        logger.info("Fetching stock data for %s (%s)", stock["company name"], stock["stock code"], extra=SAMPLED)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            async with self.limiter:
+                # checked once a slot is free, so fetches queued behind the limiter also fail fast
+                ticket = self.circuit_breaker.allow()
+                if ticket is None:
+                    logger.warning("Circuit breaker open, skipping %s (%s)", stock["company name"], stock["stock code"])
+                    error = "Circuit breaker open after repeated site errors"
+                    result = self._failed_result(stock, error, "circuit_open")
+                    break
+                result = await self._fetch_attempt(url, stock, ticket)
+            if result["status"] == "success" or not self.retry_policy.should_retry(result["error_class"], attempt):
+                break
+            delay = self.retry_policy.delay(attempt)
+            logger.info(
+                "Retrying %s after %s error in %.2fs (attempt %s/%s)",
+                stock["stock code"],
+                result["error_class"],
+                delay,
+                attempt + 1,
+                self.retry_policy.max_attempts,
+                extra=SAMPLED,
+            )
+            await asyncio.sleep(delay)
 
+        STOCK_RESULTS.labels(result["status"], result.get("error_class") or "").inc()
+        if self.cache is not None and result["status"] == "success":
+            self.cache.set(stock["stock code"], result)
         return result
 
-    async def crawl_all(self, stocks: list[dict]) -> list[dict]:
+    async def _throttle(self):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+    async def _fetch_attempt(self, url: str, stock: dict, ticket: int) -> dict:
+        await self._throttle()
+        started = asyncio.get_running_loop().time()
+        error_class = None
+        engine = self.engine
+        try:
+            result = None
+            if self.engine == "http":
+                result = await self._fetch_with_http(url, stock)
+                if result is None:
+                    await self._throttle()
+            if result is None:
+                engine = "browser"
+                page_pool = await self._get_page_pool()
+                async with page_pool.page() as page:
+                    with PAGES_IN_FLIGHT.track_inprogress():
+                        result = await self._scrape_page(page, url, stock)
+            logger.info("Successfully fetched data for %s", stock["company name"], extra=SAMPLED)
+
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            error_class = classify_error(e)
+            logger.error(
+                "Error fetching data for %s (%s) [%s]: %s",
+                stock["company name"],
+                stock["stock code"],
+                error_class,
+                str(e),
+            )
+            result = self._failed_result(stock, str(e), error_class)
+        elapsed = asyncio.get_running_loop().time() - started
+        FETCH_SECONDS.labels(engine).observe(elapsed)
+        self.limiter.record(elapsed, error_class)
+        CONCURRENCY_LIMIT.set(self.limiter.limit)
+        self.circuit_breaker.record(error_class, ticket)
+        return result
+
+    async def crawl_all(self, stocks: list[dict], force_refresh: Optional[bool] = None) -> list[dict]:
         logger.info("Starting crawl for %s stocks...", len(stocks))
-        tasks = [self.get_stock_data(stock) for stock in stocks]
+        unique = {}
+        for stock in stocks:
+            unique.setdefault(stock["stock code"], stock)
+        if len(unique) < len(stocks):
+            logger.info("Fetching %s unique stock codes for %s rows", len(unique), len(stocks))
+        tasks = [self.get_stock_data(stock, force_refresh=force_refresh) for stock in unique.values()]
+        fetched = dict(zip(unique, await asyncio.gather(*tasks)))
+        results = [{**fetched[stock["stock code"]], "company name": stock["company name"]} for stock in stocks]
         logger.info("Crawl completed for all stocks.")
-        return await asyncio.gather(*tasks)
+        if self.cache is not None:
+            logger.info("Quote cache stats: %s", self.cache.stats())
+        return results
+
+    async def crawl_iter(
+        self,
+        stocks: Union[Iterable[dict], AsyncIterable[dict]],
+        force_refresh: Optional[bool] = None,
+        fetch: Optional[Callable[..., Awaitable[dict]]] = None,
+    ) -> AsyncIterator[dict]:
+        logger.info("Starting streaming crawl...")
+        fetch = fetch if fetch is not None else self.get_stock_data
+        window = self.max_concurrent * 2
+        source = _aiter(stocks)
+        recent = OrderedDict()
+        pending = set()
+        exhausted = False
+        count = 0
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        stock = await anext(source)
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    previous = recent.get(stock["stock code"])
+                    if previous is not None:
+                        recent.move_to_end(stock["stock code"])
+                        count += 1
+                        yield {**previous, "company name": stock["company name"]}
+                        continue
+                    pending.add(asyncio.ensure_future(fetch(stock, force_refresh=force_refresh)))
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    recent[result["stock code"]] = result
+                    if len(recent) > RECENT_RESULTS:
+                        recent.popitem(last=False)
+                    count += 1
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+            logger.info("Streaming crawl finished after %s stocks.", count)
+            if self.cache is not None:
+                logger.info("Quote cache stats: %s", self.cache.stats())
+
+
+async def _aiter(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
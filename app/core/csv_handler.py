@@ -8,41 +8,197 @@ modes.
 It supports:
 - Reading CSV data from file paths or byte content.
 - Writing processed data to disk or returning it as a bytes buffer.
-- Automatic conversion of `NaN` values to `None` for JSON compatibility.
+- Automatic conversion of empty values to `None` for JSON compatibility.
 - Optional append mode for adding results to existing CSVs.
+- Chunked, low-memory reading (`iter_csv` / `iter_records`) from paths and byte
+  streams, with up-front validation of the required input columns.
+- Incremental, row-by-row writing to disk (`open_writer`) and to byte chunks
+  (`stream_csv`) for streaming pipelines.
+
+The default implementation uses the standard library `csv` module and keeps
+values as strings. pandas is imported only on demand, for the optional
+dataframe mode (`read_csv(..., as_dataframe=True)` or passing a DataFrame to
+`write_csv`).
+
+Read/write time and rows written are recorded in the `core.metrics` CSV metrics.
 """
 
+import csv
+import io
+from itertools import islice
 from pathlib import Path
-from io import BytesIO
-from typing import Optional, Union
-import pandas as pd
+from io import BytesIO, StringIO
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Iterable, Iterator, Optional, TextIO, Union
+from core.metrics import CSV_ROWS, CSV_SECONDS
+
+REQUIRED_COLUMNS = ("stock code", "company name")
+
+
+class CSVStreamWriter:
+
+    def __init__(self, path: Union[str, Path], append: bool = False):
+        self.path = Path(path)
+        write_header = not append or not self.path.exists() or self.path.stat().st_size == 0
+        # the writer owns the file for its lifetime and closes it in close() / __exit__
+        self._file = open(  # pylint:disable=consider-using-with
+            self.path, "a" if append else "w", newline="", encoding="utf-8"
+        )
+        self._writer = None
+        self._write_header = write_header
+        self.rows_written = 0
+
+    def write_row(self, row: dict):
+        with CSV_SECONDS.labels("write").time():
+            if self._writer is None:
+                self._writer = csv.DictWriter(self._file, fieldnames=list(row), lineterminator="\n")
+                if self._write_header:
+                    self._writer.writeheader()
+            self._writer.writerow(row)
+        self.rows_written += 1
+        CSV_ROWS.labels("write").inc()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _open_text(path_or_bytes: Union[str, Path, bytes, BinaryIO]) -> TextIO:
+    if isinstance(path_or_bytes, (str, Path)):
+        return open(path_or_bytes, newline="", encoding="utf-8-sig")
+    if isinstance(path_or_bytes, bytes):
+        path_or_bytes = BytesIO(path_or_bytes)
+    if hasattr(path_or_bytes, "read"):
+        return io.TextIOWrapper(path_or_bytes, encoding="utf-8-sig", newline="")
+    raise TypeError("Unsupported input type for CSV reading")
+
+
+def _record(row: dict) -> dict:
+    return {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def _fieldnames(data: list[dict]) -> list[str]:
+    fieldnames = {}
+    for row in data:
+        fieldnames.update(dict.fromkeys(row))
+    return list(fieldnames)
+
+
+def _import_pandas():
+    try:
+        import pandas as pd  # pylint:disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError("pandas is required for dataframe mode (pip install pandas)") from e
+    return pd
 
 
 class CSVHandler:
 
     @staticmethod
-    def read_csv(path_or_bytes: Union[str, bytes]) -> list[dict]:
-        if isinstance(path_or_bytes, (str, Path)):
-            df = pd.read_csv(path_or_bytes).where(pd.notnull, None)
-        elif isinstance(path_or_bytes, (bytes, BytesIO)):
-            df = pd.read_csv(BytesIO(path_or_bytes)).where(pd.notnull, None)
-        else:
-            raise TypeError("Unsupported input type for CSV reading")
-        return df.to_dict(orient="records")
+    def validate_columns(columns: Iterable[str], required_columns: Iterable[str] = REQUIRED_COLUMNS):
+        missing = [column for column in required_columns if column not in set(columns)]
+        if missing:
+            raise ValueError(f"CSV is missing required column(s): {', '.join(missing)}")
+
+    @staticmethod
+    def read_csv(path_or_bytes: Union[str, bytes], as_dataframe: bool = False):
+        if as_dataframe:
+            pd = _import_pandas()
+            source = BytesIO(path_or_bytes) if isinstance(path_or_bytes, bytes) else path_or_bytes
+            return pd.read_csv(source)
+        text = _open_text(path_or_bytes)
+        try:
+            with CSV_SECONDS.labels("read").time():
+                return [_record(row) for row in csv.DictReader(text)]
+        finally:
+            if hasattr(path_or_bytes, "read"):
+                text.detach()
+            else:
+                text.close()
+
+    @staticmethod
+    def iter_csv(
+        path_or_bytes: Union[str, Path, bytes, BinaryIO],
+        chunk_size: int = 1000,
+        required_columns: Optional[Iterable[str]] = REQUIRED_COLUMNS,
+    ) -> Iterator[list[dict]]:
+        text = _open_text(path_or_bytes)
+        reader = csv.DictReader(text)
+        try:
+            if required_columns:
+                CSVHandler.validate_columns(reader.fieldnames or [], required_columns)
+        except ValueError:
+            text.close()
+            raise
+        return CSVHandler._iter_chunks(text, reader, chunk_size)
+
+    @staticmethod
+    def _iter_chunks(text: TextIO, reader: csv.DictReader, chunk_size: int) -> Iterator[list[dict]]:
+        with text:
+            while True:
+                with CSV_SECONDS.labels("read").time():
+                    chunk = [_record(row) for row in islice(reader, chunk_size)]
+                if not chunk:
+                    return
+                yield chunk
+
+    @staticmethod
+    def iter_records(
+        path_or_bytes: Union[str, Path, bytes, BinaryIO],
+        chunk_size: int = 1000,
+        required_columns: Optional[Iterable[str]] = REQUIRED_COLUMNS,
+    ) -> Iterator[dict]:
+        chunks = CSVHandler.iter_csv(path_or_bytes, chunk_size=chunk_size, required_columns=required_columns)
+        return (record for chunk in chunks for record in chunk)
 
     @staticmethod
     def write_csv(
         data: list[dict], path: Optional[Union[str, Path]] = None, append: bool = False, as_bytes: bool = False
     ) -> Optional[BytesIO]:
-        df = pd.DataFrame(data)
-        if as_bytes:
-            buffer = BytesIO()
-            df.to_csv(buffer, index=False)
-            buffer.seek(0)
-            return buffer
-        if path is None:
+        if hasattr(data, "to_dict"):
+            data = data.astype(object).where(data.notnull(), None).to_dict(orient="records")
+        if not as_bytes and path is None:
             raise ValueError("path must be provided if as_bytes=False")
-        mode = "a" if append else "w"
-        header = not append or not Path(path).exists()
-        df.to_csv(path, mode=mode, header=header, index=False)
+        fieldnames = _fieldnames(data)
+        CSV_ROWS.labels("write").inc(len(data))
+        with CSV_SECONDS.labels("write").time():
+            if as_bytes:
+                text = StringIO()
+                CSVHandler._write_rows(text, data, fieldnames, header=True)
+                return BytesIO(text.getvalue().encode("utf-8"))
+            header = not append or not Path(path).exists()
+            with open(path, "a" if append else "w", newline="", encoding="utf-8") as f:
+                CSVHandler._write_rows(f, data, fieldnames, header=header)
         return None
+
+    @staticmethod
+    def _write_rows(f: TextIO, data: list[dict], fieldnames: list[str], header: bool):
+        if not fieldnames:
+            if header:
+                f.write("\n")
+            return
+        writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+        if header:
+            writer.writeheader()
+        writer.writerows(data)
+
+    @staticmethod
+    def open_writer(path: Union[str, Path], append: bool = False) -> CSVStreamWriter:
+        return CSVStreamWriter(path, append=append)
+
+    @staticmethod
+    async def stream_csv(rows: AsyncIterable[dict]) -> AsyncIterator[bytes]:
+        buffer = StringIO()
+        writer = None
+        async for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row), lineterminator="\n")
+                writer.writeheader()
+            writer.writerow(row)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
@@ -0,0 +1,117 @@
+"""
+Delta Filter
+-------------------
+This module defines the `DeltaFilter` class, which lets recurring crawls (Cron,
+Watchdog) write only quotes that changed since they were last emitted.
+
+Features:
+- Remembers the last emitted price and refresh timestamp per stock code, and
+  passes a row only when one of them changed (or the code is new).
+- State is persisted as JSON (written atomically) so it survives restarts.
+- Periodic full snapshots: when `snapshot_interval` seconds have passed since the
+  last one, a run emits every row again, so consumers can resynchronise.
+- Per-run context (`DeltaRun`, from `begin_run`) holding the snapshot decision and the
+  emitted/suppressed counts, so concurrent runs (e.g. the files of several Watchdog
+  batches) sharing one filter do not reset or mix each other's state.
+
+Delivery is at-least-once: a run's changes are staged in its `DeltaRun` and only
+applied (and saved) by `commit`, which `finish` calls once the run's output has been
+written and closed successfully. Rows of a run that failed or crashed before that
+are emitted again by the next run (`discard` drops the staged changes).
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DELTA_FIELDS = ("price", "timestamp")
+
+
+class DeltaRun:
+
+    def __init__(self, full_snapshot: bool = False, started_at: Optional[float] = None):
+        self.full_snapshot = full_snapshot
+        self.started_at = started_at
+        self.quotes = {}
+        self.emitted = 0
+        self.suppressed = 0
+
+
+class DeltaFilter:
+
+    def __init__(
+        self,
+        state_path: Optional[Union[str, Path]] = None,
+        snapshot_interval: float = 0,
+        fields: Iterable[str] = DELTA_FIELDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.state_path = Path(state_path) if state_path is not None else None
+        self.snapshot_interval = snapshot_interval
+        self.fields = tuple(fields)
+        self.clock = clock
+        self.quotes = {}
+        self.last_snapshot_at = None
+        self._load()
+
+    def _load(self):
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            self.quotes = state.get("quotes", {})
+            self.last_snapshot_at = state.get("last_snapshot_at")
+            logger.info("Loaded delta state for %s stock codes from %s", len(self.quotes), self.state_path)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable delta state %s: %s", self.state_path, str(e))
+
+    def begin_run(self) -> DeltaRun:
+        now = self.clock()
+        full_snapshot = self.snapshot_interval > 0 and (
+            self.last_snapshot_at is None or now - self.last_snapshot_at >= self.snapshot_interval
+        )
+        if full_snapshot:
+            logger.info("Delta output: emitting a full snapshot this run")
+        return DeltaRun(full_snapshot, now)
+
+    def should_emit(self, row: dict, run: DeltaRun) -> bool:
+        code = row["stock code"]
+        quote = {field: row.get(field) for field in self.fields}
+        changed = run.quotes.get(code, self.quotes.get(code)) != quote
+        if changed or run.full_snapshot:
+            run.quotes[code] = quote
+            run.emitted += 1
+            return True
+        run.suppressed += 1
+        return False
+
+    def finish(self, run: DeltaRun, delivered: bool):
+        # at-least-once: the state only moves on once the run's rows were written and the output closed
+        if delivered:
+            self.commit(run)
+        else:
+            self.discard(run)
+
+    def commit(self, run: DeltaRun):
+        logger.info("Delta output: %s rows emitted, %s unchanged rows suppressed", run.emitted, run.suppressed)
+        self.quotes.update(run.quotes)
+        if run.full_snapshot:
+            self.last_snapshot_at = max(self.last_snapshot_at or run.started_at, run.started_at)
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        temp_path.write_text(
+            json.dumps({"last_snapshot_at": self.last_snapshot_at, "quotes": self.quotes}), encoding="utf-8"
+        )
+        os.replace(temp_path, self.state_path)
+
+    def discard(self, run: DeltaRun):
+        logger.warning(
+            "Delta output: run not committed, its %s emitted rows will be emitted again by the next run", run.emitted
+        )
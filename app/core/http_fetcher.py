@@ -0,0 +1,188 @@
+"""
+HTTP Quote Fetcher
+-------------------------
+This module defines the `HttpQuoteFetcher` class, a browserless fast path that
+downloads LSE company pages over pooled keep-alive HTTP connections and extracts
+price, currency and timestamp in-process, without launching Chromium.
+
+Extraction is attempted in two ways:
+- From server-rendered HTML, using the same CSS classes the Playwright path waits for.
+- From embedded JSON state (`<script type="application/json">`), looking for
+  the quote keys listed in `JSON_FIELD_KEYS`.
+
+Fetching never raises: when the page cannot be downloaded or a field is
+missing, `fetch` returns `None` so the caller can fall back to the browser.
+"""
+
+import json
+import logging
+from html.parser import HTMLParser
+from typing import Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9",
+}
+
+# Class sets mirroring the selectors used by the Playwright path.
+PRICE_CLASSES = frozenset({"price-tag"})
+TIMESTAMP_CLASSES = frozenset({"bold-font-weight", "refreshed-time"})
+CURRENCY_CLASSES = frozenset({"currency-label", "small-font-size", "item-label"})
+
+JSON_FIELD_KEYS = {
+    "price": ("lastprice", "lastPrice"),
+    "currency": ("currency",),
+    "timestamp": ("lastupdate", "lastUpdate", "publicationtime"),
+}
+
+VOID_ELEMENTS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+)
+
+
+class QuoteHTMLParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.fields = {}
+        self.json_scripts = []
+        self._stack = []
+        self._capture = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        attributes = dict(attrs)
+        classes = frozenset((attributes.get("class") or "").split())
+        field = None
+        if PRICE_CLASSES <= classes:
+            field = "price"
+        elif TIMESTAMP_CLASSES <= classes:
+            field = "timestamp"
+        elif tag == "strong" and any(CURRENCY_CLASSES <= parent for _, parent, _ in self._stack):
+            field = "currency"
+        elif tag == "script" and attributes.get("type") == "application/json":
+            field = "json"
+        if field is not None and (field == "json" or field not in self.fields):
+            self._capture.append((field, len(self._stack), []))
+        self._stack.append((tag, classes, field))
+
+    def handle_endtag(self, tag):
+        if tag in VOID_ELEMENTS or not any(open_tag == tag for open_tag, _, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, _, _ = self._stack.pop()
+            depth = len(self._stack)
+            while self._capture and self._capture[-1][1] == depth:
+                field, _, parts = self._capture.pop()
+                text = "".join(parts)
+                if field == "json":
+                    self.json_scripts.append(text)
+                else:
+                    self.fields.setdefault(field, text.strip())
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        for _, _, parts in self._capture:
+            parts.append(data)
+
+
+def _search_json(node, keys: tuple):
+    if isinstance(node, dict):
+        for key in keys:
+            if node.get(key) not in (None, ""):
+                return node
+        for value in node.values():
+            found = _search_json(value, keys)
+            if found is not None:
+                return found
+    elif isinstance(node, list):
+        for value in node:
+            found = _search_json(value, keys)
+            if found is not None:
+                return found
+    return None
+
+
+def _first_key(node: dict, keys: tuple):
+    for key in keys:
+        if node.get(key) not in (None, ""):
+            return str(node[key])
+    return None
+
+
+def parse_quote_from_json(script: str) -> dict:
+    try:
+        state = json.loads(script)
+    except ValueError:
+        return {}
+    quote = _search_json(state, JSON_FIELD_KEYS["price"])
+    if quote is None:
+        return {}
+    fields = {name: _first_key(quote, keys) for name, keys in JSON_FIELD_KEYS.items()}
+    return {name: value for name, value in fields.items() if value is not None}
+
+
+def parse_quote(html: str) -> Optional[dict]:
+    parser = QuoteHTMLParser()
+    parser.feed(html)
+    parser.close()
+    fields = {name: value for name, value in parser.fields.items() if value}
+    for script in parser.json_scripts:
+        if len(fields) == 3:
+            break
+        for name, value in parse_quote_from_json(script).items():
+            fields.setdefault(name, value)
+    if {"price", "currency", "timestamp"} - fields.keys():
+        return None
+    return fields
+
+
+class HttpQuoteFetcher:
+
+    def __init__(self, max_connections: int = 10, timeout: float = 15.0, headers: Optional[dict] = None):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.headers = DEFAULT_HEADERS if headers is None else headers
+        self.client = None
+        self.hits = 0
+        self.misses = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def start(self):
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+        self.client = httpx.AsyncClient(
+            headers=self.headers, limits=limits, timeout=self.timeout, follow_redirects=True
+        )
+        logger.info("HTTP fetcher started with max_connections=%s", self.max_connections)
+
+    async def stop(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        logger.info("HTTP fetcher stopped (hits=%s, misses=%s).", self.hits, self.misses)
+
+    async def fetch(self, url: str) -> Optional[dict]:
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            fields = parse_quote(response.text)
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.debug("HTTP fast path failed for %s: %s", url, str(e), extra={"sampled": True})
+            fields = None
+        if fields is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return fields
@@ -0,0 +1,81 @@
+"""
+Metrics
+--------------
+This module defines the Prometheus metrics recorded by the crawl pipeline
+(`Crawler`, `StocksProcessor` and `CSVHandler`), in the default `prometheus_client`
+registry.
+
+Stages covered:
+- Browser launch, page navigation and the wait for each extracted field.
+- Whole fetch attempts per engine, and final stock results by status and failure class.
+- Pages in flight and the current concurrency limit.
+- Batch processing and CSV read/write time, and rows written.
+- Parquet output write, compaction and scan time, and rows written.
+- Scheduled (cron) run duration, lag behind schedule and skipped runs.
+- Event-loop lag (`core.async_io.LoopLagMonitor`).
+
+The API exposes the registry on `/metrics`; the batch adapters can write a snapshot
+in the Prometheus text format (`write_metrics_snapshot`), e.g. for the node-exporter
+textfile collector. When `PROMETHEUS_MULTIPROC_DIR` is set, metrics of sharded worker
+processes are aggregated into the snapshot as well.
+"""
+
+import os
+from pathlib import Path
+from typing import Union
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, multiprocess, write_to_textfile
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+BROWSER_LAUNCH_SECONDS = Histogram(
+    "lse_browser_launch_seconds", "Time to launch a Chromium browser.", buckets=LATENCY_BUCKETS
+)
+NAVIGATION_SECONDS = Histogram(
+    "lse_navigation_seconds", "Time for page.goto to return for a company page.", buckets=LATENCY_BUCKETS
+)
+SELECTOR_WAIT_SECONDS = Histogram(
+    "lse_selector_wait_seconds",
+    "Time after navigation until an extracted field was present.",
+    ["field"],
+    buckets=LATENCY_BUCKETS,
+)
+FETCH_SECONDS = Histogram(
+    "lse_fetch_attempt_seconds", "Duration of one fetch attempt.", ["engine"], buckets=LATENCY_BUCKETS
+)
+STOCK_RESULTS = Counter("lse_stock_results_total", "Stock fetch results.", ["status", "error_class"])
+PAGES_IN_FLIGHT = Gauge("lse_pages_in_flight", "Browser pages currently fetching a stock.", multiprocess_mode="livesum")
+CONCURRENCY_LIMIT = Gauge("lse_concurrency_limit", "Current crawler concurrency limit.", multiprocess_mode="livemax")
+PROCESS_SECONDS = Histogram(
+    "lse_process_batch_seconds", "Duration of StocksProcessor batches.", ["mode"], buckets=LATENCY_BUCKETS
+)
+CSV_SECONDS = Histogram("lse_csv_seconds", "Time spent reading or writing CSV.", ["operation"], buckets=LATENCY_BUCKETS)
+CSV_ROWS = Counter("lse_csv_rows_total", "CSV rows written.", ["operation"])
+PARQUET_SECONDS = Histogram(
+    "lse_parquet_seconds",
+    "Time spent writing, compacting or scanning Parquet output.",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+PARQUET_ROWS = Counter("lse_parquet_rows_total", "Rows written to Parquet output.", ["operation"])
+CRON_RUN_SECONDS = Histogram(
+    "lse_cron_run_seconds", "Duration of scheduled crawl runs.", ["outcome"], buckets=LATENCY_BUCKETS + (120, 300, 600)
+)
+CRON_LAG_SECONDS = Histogram(
+    "lse_cron_lag_seconds", "Delay between a scheduled tick and the start of its run.", buckets=LATENCY_BUCKETS
+)
+CRON_SKIPPED_RUNS = Counter("lse_cron_skipped_runs_total", "Scheduled runs that were skipped.", ["reason"])
+
+LOOP_LAG_SECONDS = Histogram(
+    "lse_event_loop_lag_seconds",
+    "How late the event loop woke up from a scheduled sleep.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+def write_metrics_snapshot(path: Union[str, Path]):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    write_to_textfile(str(path), registry)
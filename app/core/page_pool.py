@@ -0,0 +1,83 @@
+"""
+Page Pool
+----------------
+This module defines the `PagePool` class, which keeps a bounded set of warm
+Playwright pages inside a single browser context so they can be navigated
+again for the next stock instead of being opened and closed every time.
+
+Features:
+- Lazily creates up to `size` pages in one shared browser context.
+- Pages are handed out through an async context manager and returned afterwards.
+- Pages that crashed, were closed or raised an error are discarded and replaced.
+- Each page is recycled after `max_uses` navigations to keep memory bounded.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PagePool:
+
+    def __init__(self, context, size: int = 5, max_uses: int = 50):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.context = context
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = []
+        self._uses = {}
+        self._slots = asyncio.Semaphore(size)
+        self.created = 0
+        self.recycled = 0
+
+    async def _new_page(self):
+        page = await self.context.new_page()
+        self._uses[page] = 0
+        self.created += 1
+        logger.debug("Opened pooled page (%s created so far)", self.created)
+        return page
+
+    async def _discard(self, page):
+        self._uses.pop(page, None)
+        try:
+            await page.close()
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.debug("Error closing discarded page: %s", str(e))
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._slots:
+            page = None
+            while self._idle and page is None:
+                candidate = self._idle.pop()
+                if candidate.is_closed():
+                    self._uses.pop(candidate, None)
+                else:
+                    page = candidate
+            if page is None:
+                page = await self._new_page()
+            healthy = False
+            try:
+                yield page
+                healthy = True
+            finally:
+                self._uses[page] = self._uses.get(page, 0) + 1
+                if not healthy or page.is_closed():
+                    logger.debug("Replacing page after error or crash")
+                    await self._discard(page)
+                elif self._uses[page] >= self.max_uses:
+                    logger.debug("Recycling page after %s uses", self._uses[page])
+                    self.recycled += 1
+                    await self._discard(page)
+                else:
+                    self._idle.append(page)
+
+    async def close(self):
+        pages = list(self._uses)
+        self._idle = []
+        for page in pages:
+            await self._discard(page)
+        logger.debug("Page pool closed (%s pages).", len(pages))
@@ -0,0 +1,279 @@
+"""
+Parquet Quote Store
+--------------------------
+This module defines the `ParquetQuoteStore` class, an append-only, date-partitioned
+store of crawl results in Parquet, for analytics that should not re-parse a
+growing CSV.
+
+Layout: `<root>/date=YYYY-MM-DD/part-*.parquet` (hive partitioning on the London
+date of the crawl), with typed columns:
+- `stock_code`, `company_name`, `currency` (string)
+- `price` (float64)
+- `quote_time` (the page's refresh time) and `crawled_at` (timestamp, UTC)
+
+Features:
+- Row-by-row writer (`open_writer`) with the same interface as `CSVStreamWriter`;
+  rows are buffered and flushed as one new file per partition (every `flush_rows`
+  rows and on close). Files are written under a hidden temporary name and renamed,
+  so readers never see partial files.
+- Compaction (`compact`) of partitions with many small files into one file sorted
+  by stock code and crawl time. A hidden manifest names the output and the files it
+  replaces before the output is published. Readers skip replaced files still on disk,
+  and the next `compact` finishes (or rolls back) a compaction interrupted by a crash.
+  Rows are never counted twice.
+- Reader API (`scan`, `iter_batches`) with partition pruning on a date range and
+  filtering on stock codes, reading only the requested columns.
+
+pyarrow is imported only when a store is created (`pip install pyarrow`).
+Writes and compaction are not synchronised between processes: use one writer per
+store (e.g. a single cron service), and compact from that writer.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+from core.metrics import PARQUET_ROWS, PARQUET_SECONDS
+from core.quote_fields import LONDON, typed_quote
+
+logger = logging.getLogger(__name__)
+
+PARTITION_KEY = "date"
+MANIFEST = ".compaction.json"
+COLUMNS = ("stock_code", "company_name", "price", "currency", "quote_time", "crawled_at")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa  # pylint:disable=import-outside-toplevel
+        import pyarrow.dataset as ds  # pylint:disable=import-outside-toplevel
+        import pyarrow.parquet as pq  # pylint:disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Parquet output (pip install pyarrow)") from e
+    return pa, ds, pq
+
+
+class ParquetStreamWriter:
+
+    def __init__(self, store: "ParquetQuoteStore", flush_rows: int):
+        self.store = store
+        self.flush_rows = flush_rows
+        self.rows_written = 0
+        self._buffers = {}
+        self._buffered = 0
+
+    def write_row(self, row: dict):
+        record = typed_quote(row, self.store.clock())
+        partition = record["crawled_at"].astimezone(LONDON).date().isoformat()
+        self._buffers.setdefault(partition, []).append(record)
+        self._buffered += 1
+        self.rows_written += 1
+        if self._buffered >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        for partition, records in self._buffers.items():
+            self.store.write_partition(partition, records)
+        self._buffers = {}
+        self._buffered = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ParquetQuoteStore:
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        flush_rows: int = 10_000,
+        compression: str = "zstd",
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        if flush_rows < 1:
+            raise ValueError("flush_rows must be at least 1")
+        self.pa, self.ds, self.pq = _import_pyarrow()
+        self.root = Path(root)
+        self.flush_rows = flush_rows
+        self.compression = compression
+        self.clock = clock
+        self.schema = self.pa.schema(
+            [
+                ("stock_code", self.pa.string()),
+                ("company_name", self.pa.string()),
+                ("price", self.pa.float64()),
+                ("currency", self.pa.string()),
+                ("quote_time", self.pa.timestamp("us", tz="UTC")),
+                ("crawled_at", self.pa.timestamp("us", tz="UTC")),
+            ]
+        )
+        self.partitioning = self.ds.partitioning(self.pa.schema([(PARTITION_KEY, self.pa.string())]), flavor="hive")
+
+    def open_writer(self) -> ParquetStreamWriter:
+        return ParquetStreamWriter(self, self.flush_rows)
+
+    def write_rows(self, rows: Iterable[dict]) -> int:
+        with self.open_writer() as writer:
+            for row in rows:
+                writer.write_row(row)
+        return writer.rows_written
+
+    def _partition_dir(self, partition: str) -> Path:
+        return self.root / f"{PARTITION_KEY}={partition}"
+
+    def _write_table(
+        self, table, directory: Path, prefix: str, before_publish: Optional[Callable[[Path], None]] = None
+    ) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{prefix}-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+        # hidden while being written: dataset discovery skips files starting with "."
+        temp_path = directory / f".{name}.tmp"
+        self.pq.write_table(table, temp_path, compression=self.compression)
+        path = directory / name
+        if before_publish is not None:
+            before_publish(path)
+        os.replace(temp_path, path)
+        return path
+
+    def write_partition(self, partition: str, records: list[dict]) -> Path:
+        with PARQUET_SECONDS.labels("write").time():
+            table = self.pa.Table.from_pylist(records, schema=self.schema)
+            path = self._write_table(table, self._partition_dir(partition), "part")
+        PARQUET_ROWS.labels("write").inc(len(records))
+        logger.debug("Wrote %s rows to %s", len(records), path)
+        return path
+
+    def partitions(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        prefix = f"{PARTITION_KEY}="
+        return sorted(p.name[len(prefix) :] for p in self.root.iterdir() if p.is_dir() and p.name.startswith(prefix))
+
+    def files(self, partition: str) -> list[Path]:
+        return sorted(self._partition_dir(partition).glob("[!.]*.parquet"))
+
+    def _write_manifest(self, directory: Path, output: Path, inputs: list[Path]):
+        temp_path = directory / f"{MANIFEST}.tmp"
+        temp_path.write_text(json.dumps({"output": output.name, "inputs": [path.name for path in inputs]}))
+        os.replace(temp_path, directory / MANIFEST)
+
+    @staticmethod
+    def _read_manifest(directory: Path) -> Optional[dict]:
+        try:
+            return json.loads((directory / MANIFEST).read_text())
+        except FileNotFoundError:
+            return None
+
+    def _superseded(self) -> set[Path]:
+        # inputs of a published compaction that were not removed yet (compacting now, or interrupted)
+        superseded = set()
+        for partition in self.partitions():
+            directory = self._partition_dir(partition)
+            manifest = self._read_manifest(directory)
+            if manifest is not None and (directory / manifest["output"]).exists():
+                superseded.update(directory / name for name in manifest["inputs"])
+        return superseded
+
+    def _recover(self, partition: str):
+        directory = self._partition_dir(partition)
+        manifest = self._read_manifest(directory)
+        if manifest is None:
+            return
+        if (directory / manifest["output"]).exists():
+            for name in manifest["inputs"]:
+                (directory / name).unlink(missing_ok=True)
+            logger.warning("Finished interrupted compaction of partition %s into %s", partition, manifest["output"])
+        else:
+            (directory / f".{manifest['output']}.tmp").unlink(missing_ok=True)
+            logger.warning("Rolled back interrupted compaction of partition %s", partition)
+        (directory / MANIFEST).unlink()
+
+    def compact(self, min_files: int = 2, partitions: Optional[Iterable[str]] = None) -> int:
+        compacted = 0
+        for partition in partitions if partitions is not None else self.partitions():
+            self._recover(partition)
+            files = self.files(partition)
+            if len(files) < max(min_files, 2):
+                continue
+            directory = self._partition_dir(partition)
+            with PARQUET_SECONDS.labels("compact").time():
+                table = self.ds.dataset([str(file) for file in files], schema=self.schema, format="parquet").to_table()
+                table = table.sort_by([("stock_code", "ascending"), ("crawled_at", "ascending")])
+                path = self._write_table(
+                    table, directory, "compacted", lambda output: self._write_manifest(directory, output, files)
+                )
+                for file in files:
+                    file.unlink()
+                (directory / MANIFEST).unlink()
+            compacted += 1
+            logger.info(
+                "Compacted %s files (%s rows) of partition %s into %s", len(files), table.num_rows, partition, path
+            )
+        return compacted
+
+    def _dataset(self):
+        schema = self.schema.append(self.pa.field(PARTITION_KEY, self.pa.string()))
+        source = self.root
+        superseded = self._superseded()
+        if superseded:
+            source = [
+                str(path) for partition in self.partitions() for path in self.files(partition) if path not in superseded
+            ]
+        return self.ds.dataset(
+            source, schema=schema, format="parquet", partitioning=self.partitioning, partition_base_dir=str(self.root)
+        )
+
+    def _filter(self, stock_codes: Optional[Iterable[str]], start: Optional[date], end: Optional[date]):
+        field = self.ds.field
+        expression = None
+        conditions = []
+        if start is not None:
+            conditions.append(field(PARTITION_KEY) >= start.isoformat())
+        if end is not None:
+            conditions.append(field(PARTITION_KEY) <= end.isoformat())
+        if stock_codes is not None:
+            codes = [stock_codes] if isinstance(stock_codes, str) else list(stock_codes)
+            conditions.append(field("stock_code").isin(codes))
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def _scanner(self, stock_codes, start, end, columns):
+        dataset = self._dataset()
+        return dataset.scanner(
+            columns=list(columns) if columns is not None else list(COLUMNS),
+            filter=self._filter(stock_codes, start, end),
+        )
+
+    def scan(
+        self,
+        stock_codes: Optional[Union[str, Iterable[str]]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[Iterable[str]] = None,
+    ):
+        if not self.root.exists():
+            return self.schema.empty_table().select(list(columns) if columns is not None else list(COLUMNS))
+        with PARQUET_SECONDS.labels("scan").time():
+            return self._scanner(stock_codes, start, end, columns).to_table()
+
+    def iter_batches(
+        self,
+        stock_codes: Optional[Union[str, Iterable[str]]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> Iterator:
+        if not self.root.exists():
+            return iter(())
+        return self._scanner(stock_codes, start, end, columns).to_batches()
@@ -0,0 +1,221 @@
+"""
+Quote Cache
+------------------
+This module defines TTL + LRU caches for successful `Crawler` results, keyed by
+stock code, so repeated crawls of the same tickers within the TTL are served
+without opening a page.
+
+Backends:
+- `MemoryQuoteCache`: in-process `OrderedDict`, for a single long-running adapter.
+- `SQLiteQuoteCache`: on-disk SQLite database (WAL mode), shareable between the
+  API, CLI, Cron and Watchdog processes through a common file.
+
+Both implement the abstract `QuoteCache` base (an incomplete backend fails when it is
+created) and expose hit/miss/eviction statistics; statistics are counted per process.
+`SQLiteQuoteCache` can be pickled (e.g. into worker processes): the copy reopens
+the same database file.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteCache(ABC):
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 10_000, clock: Callable[[], float] = time.time):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, stock_code: str) -> Optional[dict]:
+        result = self._get(stock_code, self.clock() - self.ttl)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def set(self, stock_code: str, result: dict):
+        self._set(stock_code, result, self.clock())
+
+    @abstractmethod
+    def _get(self, stock_code: str, min_stored_at: float) -> Optional[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _set(self, stock_code: str, result: dict, stored_at: float):
+        raise NotImplementedError
+
+    @abstractmethod
+    def invalidate(self, stock_code: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+        }
+
+
+class MemoryQuoteCache(QuoteCache):
+
+    def __init__(self, ttl: float = 60.0, max_size: int = 10_000, clock: Callable[[], float] = time.time):
+        super().__init__(ttl=ttl, max_size=max_size, clock=clock)
+        self._entries = OrderedDict()
+
+    def _get(self, stock_code, min_stored_at):
+        entry = self._entries.get(stock_code)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if stored_at < min_stored_at:
+            del self._entries[stock_code]
+            return None
+        self._entries.move_to_end(stock_code)
+        return dict(result)
+
+    def _set(self, stock_code, result, stored_at):
+        self._entries[stock_code] = (stored_at, dict(result))
+        self._entries.move_to_end(stock_code)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, stock_code):
+        self._entries.pop(stock_code, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteQuoteCache(QuoteCache):
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: float = 60.0,
+        max_size: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(ttl=ttl, max_size=max_size, clock=clock)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connect()
+        logger.info("SQLite quote cache opened at %s (ttl=%ss, max_size=%s)", self.path, ttl, max_size)
+
+    def _connect(self):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quote_cache ("
+            "stock_code TEXT PRIMARY KEY, payload TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quote_cache_accessed ON quote_cache (accessed_at)")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_conn"], state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._connect()
+
+    def _get(self, stock_code, min_stored_at):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM quote_cache WHERE stock_code = ? AND stored_at >= ?", (stock_code, min_stored_at)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE quote_cache SET accessed_at = ? WHERE stock_code = ?", (self.clock(), stock_code)
+            )
+        return json.loads(row[0])
+
+    def _set(self, stock_code, result, stored_at):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO quote_cache (stock_code, payload, stored_at, accessed_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (stock_code, json.dumps(result), stored_at, stored_at),
+                )
+                (size,) = self._conn.execute("SELECT COUNT(*) FROM quote_cache").fetchone()
+                overflow = size - self.max_size
+                if overflow > 0:
+                    self._conn.execute(
+                        "DELETE FROM quote_cache WHERE stock_code IN "
+                        "(SELECT stock_code FROM quote_cache ORDER BY accessed_at LIMIT ?)",
+                        (overflow,),
+                    )
+                    self.evictions += overflow
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def invalidate(self, stock_code):
+        with self._lock:
+            self._conn.execute("DELETE FROM quote_cache WHERE stock_code = ?", (stock_code,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM quote_cache")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM quote_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_quote_cache(
+    path: Optional[Union[str, Path]] = None, ttl: float = 60.0, max_size: int = 10_000
+) -> Optional[QuoteCache]:
+    if ttl <= 0:
+        return None
+    if path:
+        return SQLiteQuoteCache(path, ttl=ttl, max_size=max_size)
+    return MemoryQuoteCache(ttl=ttl, max_size=max_size)
@@ -0,0 +1,87 @@
+"""
+Quote Fields
+-------------------
+This module provides helpers that turn the text fields of a `Crawler` result into
+typed values, shared by the typed output stores.
+
+- `split_price`: "1,234.50GBX" -> (1234.5, "GBX").
+- `parse_quote_time`: the page's refresh time ("16:35", "17:05:03 17-Oct-2026" or
+  ISO 8601), interpreted in London time and returned as an aware UTC datetime.
+  A bare time of day is placed on the most recent London date, relative to the
+  crawl time, at which it had already happened.
+- `typed_quote`: a crawl result row as a dict of typed columns.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+LONDON = ZoneInfo("Europe/London")
+
+PRICE_PATTERN = re.compile(r"^\s*([-+]?[\d,]*\.?\d+)\s*([A-Za-z]*)\s*$")
+TIME_OF_DAY_FORMATS = ("%H:%M", "%H:%M:%S")
+DATETIME_FORMATS = ("%H:%M:%S %d-%b-%Y", "%H:%M %d-%b-%Y", "%d-%b-%Y %H:%M:%S", "%d-%b-%Y %H:%M")
+
+
+def split_price(price: Optional[str]) -> tuple[Optional[float], Optional[str]]:
+    if price is None:
+        return None, None
+    match = PRICE_PATTERN.match(str(price))
+    if match is None:
+        return None, None
+    return float(match.group(1).replace(",", "")), match.group(2).upper() or None
+
+
+def parse_quote_time(text: Optional[str], crawled_at: Optional[datetime] = None) -> Optional[datetime]:
+    if not text:
+        return None
+    text = text.strip()
+    crawled_at = crawled_at or datetime.now(timezone.utc)
+    parsed = _parse_datetime(text)
+    if parsed is None:
+        time_of_day = _parse_time_of_day(text)
+        if time_of_day is None:
+            return None
+        local_crawl = crawled_at.astimezone(LONDON)
+        parsed = datetime.combine(local_crawl.date(), time_of_day)
+        # a refresh time later than the crawl (allowing for clock skew) belongs to the previous day
+        if parsed.replace(tzinfo=LONDON) > local_crawl + timedelta(minutes=5):
+            parsed -= timedelta(days=1)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=LONDON)
+    return parsed.astimezone(timezone.utc)
+
+
+def _parse_datetime(text: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for fmt in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_time_of_day(text: str):
+    for fmt in TIME_OF_DAY_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def typed_quote(row: dict, crawled_at: datetime) -> dict:
+    price, currency = split_price(row.get("price"))
+    return {
+        "stock_code": row["stock code"],
+        "company_name": row.get("company name"),
+        "price": price,
+        "currency": currency,
+        "quote_time": parse_quote_time(row.get("timestamp"), crawled_at),
+        "crawled_at": crawled_at.astimezone(timezone.utc),
+    }
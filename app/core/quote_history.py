@@ -0,0 +1,158 @@
+"""
+Quote History
+--------------------
+This module defines the `QuoteHistory` class, an SQLite-backed record of every
+successfully fetched quote, so the latest price of a ticker or its prices over a
+time range can be looked up without scanning output files or crawling again.
+
+Features:
+- WAL mode, so the API can read while a batch adapter (CLI, Cron, Watchdog) writes
+  to the same database file.
+- Typed columns (numeric price, currency, quote time and crawl time as Unix
+  seconds, via `core.quote_fields`), with indexes on (stock code, crawl time) and
+  (stock code, quote time).
+- Writes are buffered (`add`, which only reports when `batch_size` rows are waiting)
+  and committed in one transaction per `flush`/`close`. Flushes and queries block on
+  SQLite (up to the busy timeout while another process writes), so async callers run
+  them through `core.async_io.run_blocking`. `close` also checkpoints the WAL into the
+  database file, so every adapter closes its history when it stops.
+- `latest` (most recently crawled) and `history` (by quote time) queries returning
+  plain dicts with ISO 8601 UTC times.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional, Union
+from core.quote_fields import typed_quote
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("stock_code", "company_name", "price", "currency", "quote_time", "crawled_at")
+
+
+def _epoch(moment: Optional[datetime]) -> Optional[float]:
+    if moment is None:
+        return None
+    if moment.tzinfo is None:  # naive bounds are taken as UTC
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _isoformat(seconds: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat() if seconds is not None else None
+
+
+class QuoteHistory:
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = 100,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.clock = clock
+        self.rows_written = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quotes ("
+            "id INTEGER PRIMARY KEY, stock_code TEXT NOT NULL, company_name TEXT, price REAL, currency TEXT, "
+            "quote_time REAL, crawled_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quotes_code_crawled ON quotes (stock_code, crawled_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quotes_code_quoted ON quotes (stock_code, quote_time)")
+        logger.info("Quote history opened at %s (batch_size=%s)", self.path, batch_size)
+
+    def add(self, row: dict) -> bool:
+        # only buffers: the caller flushes (off the event loop) once this returns True
+        quote = typed_quote(row, self.clock())
+        values = (
+            quote["stock_code"],
+            quote["company_name"],
+            quote["price"],
+            quote["currency"],
+            _epoch(quote["quote_time"]),
+            _epoch(quote["crawled_at"]),
+        )
+        with self._pending_lock:
+            self._pending.append(values)
+            return len(self._pending) >= self.batch_size
+
+    def flush(self):
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO quotes (stock_code, company_name, price, currency, quote_time, crawled_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    pending,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.rows_written += len(pending)
+        logger.debug("Committed %s quotes to %s", len(pending), self.path)
+
+    def _query(self, sql: str, params: tuple) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {**dict(zip(COLUMNS, row)), "quote_time": _isoformat(row[4]), "crawled_at": _isoformat(row[5])}
+            for row in rows
+        ]
+
+    def latest(self, stock_code: str) -> Optional[dict]:
+        rows = self._query(
+            f"SELECT {', '.join(COLUMNS)} FROM quotes WHERE stock_code = ? ORDER BY crawled_at DESC LIMIT 1",
+            (stock_code,),
+        )
+        return rows[0] if rows else None
+
+    def history(
+        self,
+        stock_code: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 1000,
+    ) -> list[dict]:
+        return self._query(
+            f"SELECT {', '.join(COLUMNS)} FROM quotes WHERE stock_code = ? AND quote_time >= ? AND quote_time <= ? "
+            "ORDER BY quote_time, crawled_at LIMIT ?",
+            (
+                stock_code,
+                _epoch(start) if start is not None else float("-inf"),
+                _epoch(end) if end is not None else float("inf"),
+                limit,
+            ),
+        )
+
+    def stats(self) -> dict:
+        return {"path": str(self.path), "rows_written": self.rows_written, "pending": len(self._pending)}
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            # fold the WAL back into the database so it does not keep growing while readers stay open
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+
+
+def create_quote_history(path: Optional[Union[str, Path]] = None) -> Optional[QuoteHistory]:
+    return QuoteHistory(path) if path else None
@@ -0,0 +1,132 @@
+"""
+Rate Limiter
+-------------------
+This module defines token-bucket rate limiters bounding how many requests per
+second `Crawler` sends to the LSE website, independently of how many fetches run
+concurrently.
+
+Backends:
+- `TokenBucket`: in-process bucket, for a single crawler or all requests of the API.
+- `FileTokenBucket`: bucket state kept in a small JSON file guarded by an exclusive
+  `fcntl` lock, so the API, CLI, Cron and Watchdog processes (or containers sharing
+  a volume) draw from one global budget. POSIX only.
+
+Both refill at `rate` tokens per second up to `burst` tokens. Each request reserves
+one token; when the bucket is empty the reservation is taken from future refills
+and the caller sleeps until its token is due, so waiting callers are served in order
+without polling.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: int = 5, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.acquired = 0
+        self.delayed = 0
+        self.waited_seconds = 0.0
+        self._tokens = float(burst)
+        self._updated = None
+
+    def _take(self, tokens: float, updated: Optional[float], now: float) -> tuple[float, float]:
+        if updated is not None:
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        tokens -= 1
+        return tokens, max(0.0, -tokens / self.rate)
+
+    def _reserve(self) -> float:
+        now = self.clock()
+        self._tokens, wait = self._take(self._tokens, self._updated, now)
+        self._updated = now
+        return wait
+
+    async def acquire(self):
+        wait = await self._reserve_async()
+        self.acquired += 1
+        if wait > 0:
+            self.delayed += 1
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+
+    async def _reserve_async(self) -> float:
+        return self._reserve()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+class FileTokenBucket(TokenBucket):
+
+    def __init__(self, path: Union[str, Path], rate: float, burst: int = 5, clock: Callable[[], float] = time.time):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires fcntl (POSIX)")
+        super().__init__(rate=rate, burst=burst, clock=clock)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info("Shared rate limiter at %s (%s req/s, burst %s)", self.path, rate, burst)
+
+    def _reserve(self) -> float:
+        with open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read())
+                    tokens, updated = float(state["tokens"]), float(state["updated"])
+                except (ValueError, KeyError, TypeError):
+                    tokens, updated = float(self.burst), None
+                now = self.clock()
+                tokens, wait = self._take(tokens, updated, now)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": tokens, "updated": now}))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+    async def _reserve_async(self) -> float:
+        return await asyncio.to_thread(self._reserve)
+
+
+def create_rate_limiter(
+    rate: float = 0.0, burst: int = 5, path: Optional[Union[str, Path]] = None
+) -> Optional[TokenBucket]:
+    if rate <= 0:
+        return None
+    if path:
+        return FileTokenBucket(path, rate=rate, burst=burst)
+    return TokenBucket(rate=rate, burst=burst)
@@ -0,0 +1,178 @@
+"""
+Resilience
+-----------------
+This module defines the failure handling used by `Crawler` around each stock fetch.
+
+It provides:
+- Failure classification (`classify_error`) into `timeout`, `navigation`,
+  `missing_selector`, `not_found`, `circuit_open` and `unknown`.
+- `RetryPolicy`: bounded retries with jittered exponential backoff ("full jitter"),
+  applied to transient failure classes only (by default `timeout` and `navigation`).
+- `CircuitBreaker`: a host-level breaker over a rolling window of fetch outcomes.
+  Once the transient failure rate crosses a threshold it opens and every fetch fails
+  fast, until a single probe is let through after `reset_timeout` seconds.
+  `allow()` hands out a ticket that is passed back to `record()`, so only the probe's
+  outcome decides the half-open state, and results of fetches started before the
+  breaker last changed state are ignored.
+"""
+
+import asyncio
+import logging
+import random
+import itertools
+import time
+from collections import deque
+from typing import Callable, Iterable, Optional
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+TRANSIENT_ERROR_CLASSES = ("timeout", "navigation")
+
+
+class CrawlError(Exception):
+    error_class = "unknown"
+
+
+class NotFoundError(CrawlError):
+    error_class = "not_found"
+
+
+class MissingSelectorError(CrawlError):
+    error_class = "missing_selector"
+
+
+class CircuitOpenError(CrawlError):
+    error_class = "circuit_open"
+
+
+def classify_error(error: BaseException) -> str:
+    if isinstance(error, CrawlError):
+        return error.error_class
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, PlaywrightTimeoutError)):
+        return "timeout"
+    if isinstance(error, PlaywrightError):
+        message = str(error)
+        if "Timeout" in message:
+            return "timeout"
+        if "net::" in message or "Navigation" in message or "navigat" in message:
+            return "navigation"
+    return "unknown"
+
+
+class RetryPolicy:
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        retry_on: Iterable[str] = TRANSIENT_ERROR_CLASSES,
+        rng: Optional[random.Random] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = frozenset(retry_on)
+        self.rng = rng if rng is not None else random.Random()
+
+    def should_retry(self, error_class: str, attempt: int) -> bool:
+        return attempt < self.max_attempts and error_class in self.retry_on
+
+    def delay(self, attempt: int) -> float:
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        counted_errors: Iterable[str] = TRANSIENT_ERROR_CLASSES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < failure_threshold <= 1:
+            raise ValueError("failure_threshold must be between 0 and 1")
+        self.failure_threshold = failure_threshold
+        self.min_calls = min(min_calls, window)
+        self.reset_timeout = reset_timeout
+        self.counted_errors = frozenset(counted_errors)
+        self.clock = clock
+        self.state = "closed"
+        self.opened_at = None
+        self.rejected = 0
+        self.trips = 0
+        self._outcomes = deque(maxlen=window)
+        self._tickets = itertools.count(1)
+        self._closed_since = 0  # first ticket issued since the breaker last closed
+        self._probe = None
+        self._probe_started_at = None
+
+    def allow(self) -> Optional[int]:
+        # returns a ticket for `record`, or None when the fetch must fail fast
+        if self.state == "closed":
+            return next(self._tickets)
+        now = self.clock()
+        if self.state == "open":
+            if now - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return None
+            self.state = "half_open"
+            logger.info("Circuit breaker half-open, probing host")
+        # half-open: one probe at a time; a probe that never reported back is replaced after reset_timeout
+        if self._probe is not None and now - self._probe_started_at < self.reset_timeout:
+            self.rejected += 1
+            return None
+        self._probe = next(self._tickets)
+        self._probe_started_at = now
+        return self._probe
+
+    def record(self, error_class: Optional[str], ticket: int):
+        failed = error_class in self.counted_errors
+        if self.state == "half_open":
+            if ticket != self._probe:
+                return
+            self._probe = None
+            if failed:
+                self._open()
+            else:
+                logger.info("Circuit breaker closed")
+                self.state = "closed"
+                self._outcomes.clear()
+                self._closed_since = next(self._tickets)
+            return
+        if self.state == "open" or ticket < self._closed_since:
+            return
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls and self.failure_rate >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        logger.warning(
+            "Circuit breaker open (failure rate %.0f%%), failing fast for %ss",
+            self.failure_rate * 100,
+            self.reset_timeout,
+        )
+        self.state = "open"
+        self.opened_at = self.clock()
+        self.trips += 1
+        self._outcomes.clear()
+
+    @property
+    def failure_rate(self) -> float:
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failure_rate": round(self.failure_rate, 4),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
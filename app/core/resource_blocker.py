@@ -0,0 +1,103 @@
+"""
+Resource Blocker
+-----------------------
+This module defines the `ResourceBlocker` class, a Playwright route handler that
+aborts requests the crawler never needs (images, fonts, stylesheets, media and
+third-party trackers) so company pages load faster and use less bandwidth.
+
+Features:
+- Denylist by resource type and by domain (subdomains included).
+- Allowlist by resource type and by domain, which always takes precedence.
+- Counters for allowed and blocked requests, per blocked resource type.
+- Estimated bytes saved, based on configurable typical sizes per resource type
+  (blocked responses are never downloaded, so their real size is unknown).
+"""
+
+import logging
+from collections import Counter
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "font", "stylesheet", "media")
+
+DEFAULT_BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "linkedin.com",
+    "licdn.com",
+    "twitter.com",
+    "adsrvr.org",
+    "quantserve.com",
+    "scorecardresearch.com",
+    "newrelic.com",
+    "nr-data.net",
+    "cookielaw.org",
+    "onetrust.com",
+)
+
+DEFAULT_ESTIMATED_SIZES = {
+    "image": 40_000,
+    "font": 60_000,
+    "stylesheet": 50_000,
+    "media": 250_000,
+    "script": 80_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+}
+
+
+def _domain_matches(host: str, domains: frozenset) -> bool:
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+class ResourceBlocker:
+
+    def __init__(
+        self,
+        blocked_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        blocked_domains: Iterable[str] = DEFAULT_BLOCKED_DOMAINS,
+        allowed_resource_types: Iterable[str] = ("document",),
+        allowed_domains: Iterable[str] = (),
+        estimated_sizes: Optional[dict] = None,
+    ):
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self.blocked_domains = frozenset(d.lower() for d in blocked_domains)
+        self.allowed_resource_types = frozenset(allowed_resource_types)
+        self.allowed_domains = frozenset(d.lower() for d in allowed_domains)
+        self.estimated_sizes = DEFAULT_ESTIMATED_SIZES if estimated_sizes is None else estimated_sizes
+        self.requests_allowed = 0
+        self.requests_blocked = 0
+        self.bytes_saved = 0
+        self.blocked_by_type = Counter()
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        if resource_type in self.allowed_resource_types or _domain_matches(host, self.allowed_domains):
+            return False
+        return resource_type in self.blocked_resource_types or _domain_matches(host, self.blocked_domains)
+
+    async def handle(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.requests_blocked += 1
+            self.blocked_by_type[request.resource_type] += 1
+            self.bytes_saved += self.estimated_sizes.get(request.resource_type, 0)
+            await route.abort()
+        else:
+            self.requests_allowed += 1
+            await route.continue_()
+
+    def stats(self) -> dict:
+        return {
+            "requests_allowed": self.requests_allowed,
+            "requests_blocked": self.requests_blocked,
+            "estimated_bytes_saved": self.bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
@@ -0,0 +1,197 @@
+"""
+Sharded Crawler
+----------------------
+This module defines the `ShardedCrawler` class, which splits a stock list across
+N worker processes, each running its own event loop and `Crawler` (and therefore
+its own Chromium), and merges the results back in input order.
+
+It exposes the same `crawl_all` / `crawl_iter` interface as `Crawler`, so it can
+be passed to `StocksProcessor` unchanged; `create_crawler` picks one or the other
+from a worker count.
+
+Features:
+- Contiguous shards, one per worker, merged back in input order.
+- Per-worker crawler options (e.g. `max_concurrent` applies within each worker). An
+  in-process rate limit is split evenly between the workers; a `FileTokenBucket`
+  is already shared by all of them. Options are pickled for each shard, so an
+  in-memory quote cache and the circuit breaker do not keep state across shards or
+  runs (an SQLite quote cache does).
+- Workers are started with the `spawn` method, so no event loop or browser state
+  is inherited from the parent.
+- Clean shutdown: on cancellation, errors or SIGTERM the worker pool is terminated;
+  workers translate SIGTERM into `SystemExit` so their browsers are closed. The
+  terminate/join runs on a daemon thread, off the event loop, and workers still
+  alive after `terminate_timeout` seconds are killed (`Pool.terminate` can deadlock
+  joining its handler threads).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+from dataclasses import replace
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Optional, Union
+
+from core.crawler import Crawler, CrawlerOptions
+from core.rate_limiter import FileTokenBucket, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+def split_shards(stocks: list[dict], workers: int) -> list[list[dict]]:
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    size, remainder = divmod(len(stocks), workers)
+    shards, start = [], 0
+    for index in range(workers):
+        end = start + size + (1 if index < remainder else 0)
+        if end > start:
+            shards.append(stocks[start:end])
+        start = end
+    return shards
+
+
+def _exit_on_sigterm(signum, frame):
+    raise SystemExit(128 + signum)
+
+
+def _init_worker():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+
+async def _crawl(shard: list[dict], crawler_options: CrawlerOptions) -> list[dict]:
+    async with Crawler(crawler_options) as crawler:
+        return await crawler.crawl_all(shard)
+
+
+def crawl_shard(shard: list[dict], crawler_options: CrawlerOptions) -> list[dict]:
+    logger.info("Worker crawling shard of %s stocks", len(shard))
+    return asyncio.run(_crawl(shard, crawler_options))
+
+
+class ShardedCrawler:
+
+    def __init__(
+        self,
+        workers: int,
+        crawler_options: Optional[CrawlerOptions] = None,
+        shard_fn: Callable[[list[dict], CrawlerOptions], list[dict]] = crawl_shard,
+        terminate_timeout: float = 10.0,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.crawler_options = crawler_options or CrawlerOptions()
+        rate_limiter = self.crawler_options.rate_limiter
+        if isinstance(rate_limiter, TokenBucket) and not isinstance(rate_limiter, FileTokenBucket):
+            self.crawler_options = replace(
+                self.crawler_options,
+                rate_limiter=TokenBucket(rate_limiter.rate / workers, burst=max(1, rate_limiter.burst // workers)),
+            )
+        self.shard_fn = shard_fn
+        self.terminate_timeout = terminate_timeout
+        self.pool = None
+        logger.info("ShardedCrawler initialized with %s workers, options=%s", workers, self.crawler_options)
+
+    async def __aenter__(self):
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(self.workers, initializer=_init_worker)
+        return self
+
+    async def __aexit__(self, exc_type, *args):
+        if self.pool is None:
+            return
+        if exc_type is None:
+            self.pool.close()
+            await asyncio.to_thread(self.pool.join)
+        else:
+            logger.warning("Terminating %s crawl workers...", self.workers)
+            await self._terminate()
+        self.pool = None
+        logger.info("Crawl workers shut down.")
+
+    async def _terminate(self):
+        pool = self.pool
+        workers = list(pool._pool)  # pylint:disable=protected-access  # Pool exposes no handle on its processes
+
+        def terminate():
+            pool.terminate()
+            pool.join()
+
+        stopped = _run_in_daemon_thread(terminate)
+        try:
+            await asyncio.wait_for(asyncio.shield(stopped), self.terminate_timeout)
+        except asyncio.TimeoutError:
+            logger.error("Crawl workers did not stop within %.0fs, killing them", self.terminate_timeout)
+            for process in workers:
+                if process.is_alive():
+                    process.kill()
+
+    def _submit(self, shard: list[dict]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def on_result(result):
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(result))
+
+        def on_error(error):
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_exception(error))
+
+        self.pool.apply_async(self.shard_fn, (shard, self.crawler_options), callback=on_result, error_callback=on_error)
+        return future
+
+    async def crawl_all(self, stocks: list[dict]) -> list[dict]:
+        shards = split_shards(list(stocks), self.workers)
+        logger.info("Crawling %s stocks in %s shards...", sum(map(len, shards)), len(shards))
+        results = await asyncio.gather(*(self._submit(shard) for shard in shards))
+        return [result for shard_results in results for result in shard_results]
+
+    async def crawl_iter(self, stocks: Union[Iterable[dict], AsyncIterable[dict]]) -> AsyncIterator[dict]:
+        if hasattr(stocks, "__aiter__"):
+            stocks = [stock async for stock in stocks]
+        shards = split_shards(list(stocks), self.workers)
+        futures = [self._submit(shard) for shard in shards]
+        try:
+            for future in futures:
+                for result in await future:
+                    yield result
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _run_in_daemon_thread(fn: Callable[[], None]) -> asyncio.Future:
+    # unlike asyncio.to_thread, a thread stuck forever does not block interpreter exit
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(error: Optional[BaseException]):
+        if not future.done():
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def run():
+        error = None
+        try:
+            fn()
+        except BaseException as e:  # pylint:disable=broad-exception-caught
+            error = e
+        try:
+            loop.call_soon_threadsafe(settle, error)
+        except RuntimeError:  # the loop closed while waiting
+            pass
+
+    threading.Thread(target=run, name="lse-pool-terminate", daemon=True).start()
+    return future
+
+
+def create_crawler(
+    crawler_options: Optional[CrawlerOptions] = None, workers: int = 1
+) -> Union[Crawler, ShardedCrawler]:
+    if workers > 1:
+        return ShardedCrawler(workers, crawler_options)
+    return Crawler(crawler_options)
@@ -0,0 +1,62 @@
+"""
+Single Flight
+--------------------
+This module defines the `SingleFlight` class, which coalesces concurrent calls
+sharing the same key: while a call for a key is in flight, later callers await
+the same result instead of starting another one.
+
+Features:
+- One underlying task per key; every concurrent caller gets its result (or exception).
+- A cancelled caller does not cancel the shared task while others still wait on it;
+  the task is cancelled only when its last waiter goes away.
+- A counter of coalesced calls for monitoring.
+
+A `SingleFlight` can be shared by several callers of one `Crawler` (e.g. the files of
+a `BatchCrawler` batch). The shared task runs on the resources (page pool) of the
+crawler that started it, so it must not be shared with crawlers that may close
+first, such as the per-request crawlers of the API.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        entry = self._inflight.get(key)
+        if entry is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            entry = {"task": task, "waiters": 0}
+            self._inflight[key] = entry
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.coalesced += 1
+            logger.debug("Joining in-flight call for %s", key)
+
+        entry["waiters"] += 1
+        try:
+            return await asyncio.shield(entry["task"])
+        except asyncio.CancelledError:
+            if entry["waiters"] == 1 and not entry["task"].done():
+                entry["task"].cancel()
+            raise
+        finally:
+            entry["waiters"] -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        entry = self._inflight.get(key)
+        if entry is not None and entry["task"] is task:
+            del self._inflight[key]
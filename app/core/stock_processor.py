@@ -9,34 +9,88 @@ It acts as a higher-level abstraction over the `Crawler`, allowing:
 - Separation of successful and failed results.
 - Logging of successes and failures.
 - Cleaning and formatting of processed data for further use (e.g., CSV output or API response).
+- Streaming processing (`process_stream`) that filters and cleans results as they arrive,
+  with an optional per-result callback (e.g. for progress reporting).
+- Batch duration recorded in the `lse_process_batch_seconds` metric.
+- Optional `QuoteHistory`: successful results are recorded in batched transactions,
+  committed off the event loop (`core.async_io.run_blocking`).
 """
 
 import logging
+import time
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Optional, Union
+from core.async_io import run_blocking
+from core.metrics import PROCESS_SECONDS
+from core.quote_history import QuoteHistory
 
 
 logger = logging.getLogger(__name__)
 
 
 class StocksProcessor:
-    def __init__(self, crawler):
+    def __init__(self, crawler, history: Optional[QuoteHistory] = None):
         self.crawler = crawler
+        self.history = history
+
+    @staticmethod
+    def log_failure(item: dict):
+        # you could easily plug in some notification system here
+        logger.warning(
+            "Failed: %s (%s) | %s | Error: %s",
+            item["company name"],
+            item["stock code"],
+            item.get("error_class", "unknown"),
+            item["error"],
+        )
+
+    @staticmethod
+    def _clean(item: dict) -> dict:
+        return {k: v for k, v in item.items() if k not in ("status", "error", "error_class")}
 
     async def process_stocks(self, stocks: list[dict]) -> list[dict]:
         logger.info("Starting stock processing for %s entries...", len(stocks))
         try:
-            results = await self.crawler.crawl_all(stocks)
+            with PROCESS_SECONDS.labels("batch").time():
+                results = await self.crawler.crawl_all(stocks)
         except Exception as e:  # pylint:disable=broad-exception-caught
             logger.exception("Unexpected error during crawling: %s", str(e))
             return []
         succeeded = [r for r in results if r.get("status") == "success"]
         failed = [r for r in results if r.get("status") != "success"]
         logger.info("Processing complete. Success: %s, Failed: %s", len(succeeded), len(failed))
-        if failed:
-            for item in failed:
-                # you could easily plug in some notification system here
-                logger.warning("Failed: %s (%s) | Error: %s", item["company name"], item["stock code"], item["error"])
-        cleaned_data = [
-            {k: v for k, v in item.items() if k not in ("status", "error")}
-            for item in succeeded
-        ]
+        for item in failed:
+            self.log_failure(item)
+        if self.history is not None:
+            for item in succeeded:
+                self.history.add(item)
+            await run_blocking(self.history.flush)
+        cleaned_data = [self._clean(item) for item in succeeded]
         return cleaned_data
+
+    async def process_stream(
+        self,
+        stocks: Union[Iterable[dict], AsyncIterable[dict]],
+        on_result: Optional[Callable[[dict], None]] = None,
+    ) -> AsyncIterator[dict]:
+        logger.info("Starting streaming stock processing...")
+        started = time.perf_counter()
+        succeeded = failed = 0
+        try:
+            async for item in self.crawler.crawl_iter(stocks):
+                if on_result is not None:
+                    on_result(item)
+                if item.get("status") == "success":
+                    succeeded += 1
+                    if self.history is not None and self.history.add(item):
+                        await run_blocking(self.history.flush)
+                    yield self._clean(item)
+                else:
+                    failed += 1
+                    self.log_failure(item)
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.exception("Unexpected error during streaming crawl: %s", str(e))
+        finally:
+            if self.history is not None:
+                await run_blocking(self.history.flush)
+        PROCESS_SECONDS.labels("stream").observe(time.perf_counter() - started)
+        logger.info("Processing complete. Success: %s, Failed: %s", succeeded, failed)
@@ -4,46 +4,279 @@ Cron Adapter
 This module defines the `CronAdapter` class, which provides scheduled,
 asynchronous execution of the stock processing workflow using cron expressions.
 
-The adapter is designed for batch processing of stock CSV files.
+The adapter is designed for batch processing of stock CSV files. With
+`workers > 1` each run shards the stock list across worker processes. An optional
+Prometheus metrics snapshot is rewritten after every run.
+
+With a `MarketCalendar`, ticks outside the LSE session (nights, weekends and
+holidays) are skipped with a logged reason, or run at a reduced off-session
+frequency (`off_hours_interval`). The cron expression, calendar and run guards below
+are grouped in a `CronSchedule`.
+
+Each run streams results to the output CSV as stocks complete. Runs are guarded by:
+- An overlap policy for ticks that fire while the previous run is still going:
+  `skip` the new tick, `queue` at most one run behind it, or `cancel` the previous run.
+- An optional per-run deadline (`run_timeout`); stocks still unfinished at the deadline
+  are reported as failed with the `deadline` failure class.
+
+Run duration and lag behind the schedule are logged and recorded as metrics. Input
+parsing and output writes run off the event loop (`core.async_io`), whose lag is
+monitored while the schedule is active.
+
+Output goes to a CSV file (default) or, with `output_format="parquet"`, to a
+date-partitioned `ParquetQuoteStore` directory whose partitions are compacted after
+each run once they hold `compact_min_files` files.
+
+Successful quotes can also be recorded in a `QuoteHistory` database, which is closed
+when the schedule stops.
+
+With a `DeltaFilter`, only quotes whose price or timestamp changed since they were
+last written are appended, with optional periodic full snapshots.
 """
 
 import asyncio
 import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Callable, Optional
 from aiocron import crontab
+from cronsim import CronSim
 
-from core.crawler import Crawler
+from core.async_io import AsyncRowWriter, LoopLagMonitor, run_blocking
+from core.crawler import CrawlerOptions
+from core.sharding import create_crawler
 from core.stock_processor import StocksProcessor
 from core.csv_handler import CSVHandler
+from core.delta_filter import DeltaFilter, DeltaRun
+from core.parquet_store import ParquetQuoteStore
+from core.quote_history import QuoteHistory
+from core.metrics import CRON_LAG_SECONDS, CRON_RUN_SECONDS, CRON_SKIPPED_RUNS, STOCK_RESULTS, write_metrics_snapshot
+from cron.market_calendar import MarketCalendar
 
 logger = logging.getLogger(__name__)
 
+OVERLAP_POLICIES = ("skip", "queue", "cancel")
+OUTPUT_FORMATS = ("csv", "parquet")
+
+
+@dataclass
+class CronSchedule:
+    cron_expr: str = "*/5 * * * *"
+    overlap: str = "skip"
+    run_timeout: Optional[float] = None
+    calendar: Optional[MarketCalendar] = None
+    off_hours_interval: float = 0
+    now: Callable[[], datetime] = lambda: datetime.now(timezone.utc)
+
+    def __post_init__(self):
+        if self.overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"overlap must be one of {OVERLAP_POLICIES}, got {self.overlap!r}")
+        self.run_timeout = self.run_timeout or None
+
 
 class CronAdapter:
-    def __init__(self, input_csv: str, output_csv: str, cron_expr: str = "*/5 * * * *"):
+    def __init__(
+        self,
+        input_csv: str,
+        output_csv: str,
+        schedule: Optional[CronSchedule] = None,
+        crawler_options: Optional[CrawlerOptions] = None,
+        *,
+        workers: int = 1,
+        metrics_file: Optional[str] = None,
+        delta: Optional[DeltaFilter] = None,
+        output_format: str = "csv",
+        compact_min_files: int = 12,
+        history: Optional[QuoteHistory] = None,
+    ):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}, got {output_format!r}")
         self.input_csv = Path(input_csv)
         self.output_csv = Path(output_csv)
-        self.cron_expr = cron_expr
-        logger.info("CronAdapter initialized: input=%s, output=%s, schedule=%s", input_csv, output_csv, cron_expr)
+        self.schedule = schedule or CronSchedule()
+        self.crawler_options = crawler_options or CrawlerOptions(max_concurrent=5)
+        self.workers = workers
+        self.metrics_file = metrics_file
+        self.skipped_runs = 0
+        self._last_off_hours_run = None
+        self.last_run = None
+        self._current = None
+        self._queued = False
+        self.delta = delta
+        self.store = ParquetQuoteStore(output_csv) if output_format == "parquet" else None
+        self.compact_min_files = compact_min_files
+        self.history = history
+        self.loop_monitor = LoopLagMonitor()
+        logger.info(
+            "CronAdapter initialized: input=%s, output=%s, schedule=%s", input_csv, output_csv, self.schedule.cron_expr
+        )
 
-    async def _process_file(self):
+    async def _process_file(self) -> str:
         logger.info("Cron job started...")
+        stocks, finished, writer = [], set(), None
+        run = self.delta.begin_run() if self.delta is not None else None
         try:
-            stocks = CSVHandler.read_csv(self.input_csv)
-            logger.info("Loaded %s stock entries from %s", stocks, self.input_csv)
-            async with Crawler(max_concurrent=5) as crawler:
-                processor = StocksProcessor(crawler)
+            stocks = await run_blocking(CSVHandler.read_csv, self.input_csv)
+            logger.info("Loaded %s stock entries from %s", len(stocks), self.input_csv)
+            async with create_crawler(self.crawler_options, workers=self.workers) as crawler:
+                processor = StocksProcessor(crawler, history=self.history)
                 logger.info("Starting async stock processing...")
-                results = await processor.process_stocks(stocks)
-            CSVHandler.write_csv(results, self.output_csv, append=True)
-            logger.info("Cron job results appended to %s", self.output_csv)
+                async with AsyncRowWriter(self._open_writer()) as writer:
+                    await asyncio.wait_for(
+                        self._crawl(processor, stocks, writer, finished, run), self.schedule.run_timeout
+                    )
+            logger.info("Cron job results appended to %s (%s rows)", self.output_csv, writer.rows_written)
+            await self._compact()
+            return "completed"
+        except asyncio.TimeoutError:
+            self._report_unfinished(stocks, finished, f"Run deadline of {self.schedule.run_timeout}s exceeded")
+            await self._compact()
+            return "timed_out"
+        except asyncio.CancelledError:
+            self._report_unfinished(stocks, finished, "Run cancelled by a newer scheduled run")
+            raise
         except Exception as e:  # pylint:disable=broad-exception-caught
             logger.exception("Error during cron job execution': %s", str(e))
+            return "failed"
+        finally:
+            if self.delta is not None:
+                self.delta.finish(run, delivered=writer is not None and writer.closed)
+
+    def _open_writer(self):
+        if self.store is not None:
+            return self.store.open_writer()
+        return CSVHandler.open_writer(self.output_csv, append=True)
+
+    async def _compact(self):
+        if self.store is None:
+            return
+        try:
+            await run_blocking(self.store.compact, self.compact_min_files)
+        except Exception as e:  # pylint:disable=broad-exception-caught
+            logger.exception("Error compacting Parquet output %s: %s", self.output_csv, str(e))
+
+    async def _crawl(
+        self, processor: StocksProcessor, stocks: list[dict], writer, finished: set, run: Optional[DeltaRun] = None
+    ):
+        async for row in processor.process_stream(stocks, on_result=lambda item: finished.add(item["stock code"])):
+            if self.delta is None or self.delta.should_emit(row, run):
+                await writer.write_row(row)
+
+    @staticmethod
+    def _report_unfinished(stocks: list[dict], finished: set, error: str):
+        unfinished = [stock for stock in stocks if stock["stock code"] not in finished]
+        logger.warning("%s: %s of %s stocks did not finish", error, len(unfinished), len(stocks))
+        for stock in unfinished:
+            STOCK_RESULTS.labels("failed", "deadline").inc()
+            StocksProcessor.log_failure({**stock, "status": "failed", "error": error, "error_class": "deadline"})
+
+    def _scheduled_time(self, moment: datetime) -> datetime:
+        # the tick being served: the latest scheduled time at or before `moment`, in aiocron's local time zone
+        return next(CronSim(self.schedule.cron_expr, moment.astimezone() + timedelta(seconds=1), reverse=True))
+
+    def _interval(self, scheduled: datetime) -> float:
+        return (next(CronSim(self.schedule.cron_expr, scheduled)) - scheduled).total_seconds()
+
+    async def _run(self, scheduled: datetime):
+        lag = max(0.0, (self.schedule.now() - scheduled).total_seconds())
+        CRON_LAG_SECONDS.observe(lag)
+        logger.info("Cron run for %s started %.1fs behind schedule", scheduled.isoformat(), lag)
+        started = time.perf_counter()
+        outcome = "cancelled"
+        try:
+            outcome = await self._process_file()
+        finally:
+            duration = time.perf_counter() - started
+            CRON_RUN_SECONDS.labels(outcome).observe(duration)
+            self.last_run = {
+                "scheduled": scheduled.isoformat(),
+                "lag_seconds": round(lag, 3),
+                "duration_seconds": round(duration, 3),
+                "outcome": outcome,
+            }
+            logger.info("Cron run %s in %.1fs (lag %.1fs)", outcome, duration, lag)
+            interval = self._interval(scheduled)
+            if duration > interval:
+                logger.warning(
+                    "Cron run took %.1fs, longer than the %.0fs schedule interval; consider a longer interval",
+                    duration,
+                    interval,
+                )
+            if self.metrics_file:
+                write_metrics_snapshot(self.metrics_file)
+
+    def _skip(self, reason: str, message: str, *args):
+        self.skipped_runs += 1
+        CRON_SKIPPED_RUNS.labels(reason).inc()
+        logger.info("Skipping scheduled run: " + message, *args)
+
+    def _should_run(self, moment: datetime) -> bool:
+        if self.schedule.calendar is None:
+            return True
+        reason = self.schedule.calendar.closed_reason(moment)
+        if reason is None:
+            return True
+        if self.schedule.off_hours_interval > 0 and (
+            self._last_off_hours_run is None
+            or (moment - self._last_off_hours_run).total_seconds() >= self.schedule.off_hours_interval
+        ):
+            logger.info("Market closed (%s), running reduced-frequency off-session crawl", reason)
+            self._last_off_hours_run = moment
+            return True
+        self._skip(
+            "market_closed",
+            "market closed (%s), next session opens at %s",
+            reason,
+            self.schedule.calendar.next_open(moment).isoformat(),
+        )
+        return False
+
+    async def _resolve_overlap(self) -> bool:
+        running = self._current
+        if self.schedule.overlap == "skip":
+            self._skip("overlap", "previous run still in progress")
+            return False
+        if self.schedule.overlap == "queue":
+            if self._queued:
+                self._skip("overlap", "previous run still in progress and another run is already queued")
+                return False
+            logger.info("Previous run still in progress, queueing this run behind it")
+            self._queued = True
+            try:
+                await asyncio.wait({running})
+            finally:
+                self._queued = False
+            return True
+        logger.warning("Previous run still in progress, cancelling it")
+        running.cancel()
+        await asyncio.wait({running})
+        return True
 
     async def _cron_task(self):
-        await self._process_file()
+        moment = self.schedule.now()
+        scheduled = self._scheduled_time(moment)
+        if not self._should_run(moment):
+            return
+        if self._current is not None and not self._current.done() and not await self._resolve_overlap():
+            return
+        self._current = asyncio.create_task(self._run(scheduled))
+        await asyncio.wait({self._current})
 
     async def start(self):
-        logger.info("Starting CronAdapter schedule: %s", self.cron_expr)
-        crontab(self.cron_expr, func=self._cron_task)
-        await asyncio.Event().wait()
+        logger.info(
+            "Starting CronAdapter schedule: %s (overlap policy: %s)", self.schedule.cron_expr, self.schedule.overlap
+        )
+        cron = crontab(self.schedule.cron_expr, func=self._cron_task)
+        self.loop_monitor.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cron.stop()
+            await self.loop_monitor.stop()
+            if self._current is not None and not self._current.done():
+                self._current.cancel()
+                await asyncio.wait({self._current})
+            if self.history is not None:
+                await run_blocking(self.history.close)
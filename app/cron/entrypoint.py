@@ -8,6 +8,11 @@ Features:
 - Parses command-line arguments for input/output CSV files and cron expression.
 - Validates input file existence and prepares output directories.
 - Initializes the CronAdapter for scheduled asynchronous stock processing.
+- Optionally restricts runs to LSE trading hours (`--market-hours`), with a holiday
+  list and a reduced off-session frequency.
+- Configures the overlap policy and per-run deadline of scheduled runs.
+- Writes to a CSV file or a date-partitioned Parquet directory (`--output-format`).
+- Optionally appends only changed quotes (`--delta`), with periodic full snapshots.
 - Runs an asyncio event loop to continuously execute scheduled tasks.
 """
 
@@ -17,7 +22,11 @@ import logging
 import signal
 from pathlib import Path
 import sys
-from cron.cron_adapter import CronAdapter
+from cron.cron_adapter import OUTPUT_FORMATS, OVERLAP_POLICIES, CronAdapter, CronSchedule
+from cron.market_calendar import DEFAULT_HOLIDAYS_FILE, MarketCalendar
+from utils.crawler_options import add_crawler_arguments, crawler_options_from_args
+from utils.delta_options import add_delta_arguments, delta_filter_from_args
+from utils.history_options import add_history_arguments, quote_history_from_args
 from utils.logger_setup import setup_logging
 
 
@@ -28,10 +37,67 @@ logger = logging.getLogger(__name__)
 def parse_args():
     parser = argparse.ArgumentParser(description="Run CronAdapter for periodic stock updates.")
     parser.add_argument("--input", required=True, help="Path to the input CSV file containing stock symbols and names.")
-    parser.add_argument("--output", required=True, help="Path where the output CSV with stock results will be saved.")
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="Path where the output CSV with stock results will be saved (a directory with --output-format parquet).",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="Append results to a CSV file, or write date-partitioned Parquet files with typed columns "
+        "(requires pyarrow) (default: csv).",
+    )
+    parser.add_argument(
+        "--compact-min-files",
+        type=int,
+        default=12,
+        help="With --output-format parquet, merge a date partition into one file after a run once it holds "
+        "this many files (default: 12).",
+    )
     parser.add_argument(
         "--cron", default="*/5 * * * *", help="Cron expression defining the schedule (default: every 5 minutes)."
     )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of crawler processes per run (default: 1, no sharding)."
+    )
+    parser.add_argument(
+        "--metrics-file", help="Write a Prometheus metrics snapshot (text format) to this file after each run."
+    )
+    parser.add_argument(
+        "--market-hours",
+        action="store_true",
+        help="Only crawl during LSE trading hours (08:00-16:30 Europe/London, excluding weekends and holidays).",
+    )
+    parser.add_argument(
+        "--holidays",
+        default=str(DEFAULT_HOLIDAYS_FILE),
+        help="File of exchange holidays, one ISO date per line (default: bundled LSE list).",
+    )
+    parser.add_argument(
+        "--off-hours-interval",
+        type=float,
+        default=0,
+        help="With --market-hours, still crawl at most once every N minutes outside the session "
+        "(default: 0, skip all off-session runs).",
+    )
+    parser.add_argument(
+        "--overlap",
+        choices=OVERLAP_POLICIES,
+        default="skip",
+        help="What to do when a run is due while the previous one is still going: skip the new run, "
+        "queue one run behind it, or cancel the previous run (default: skip).",
+    )
+    parser.add_argument(
+        "--run-timeout",
+        type=float,
+        default=0,
+        help="Deadline in seconds for each run; unfinished stocks are reported as timed out (default: 0, none).",
+    )
+    add_history_arguments(parser)
+    add_crawler_arguments(parser)
+    add_delta_arguments(parser)
     return parser.parse_args()
 
 
@@ -47,7 +113,20 @@ async def main():
     adapter = CronAdapter(
         input_csv=str(input_path),
         output_csv=str(output_path),
-        cron_expr=args.cron,
+        schedule=CronSchedule(
+            cron_expr=args.cron,
+            overlap=args.overlap,
+            run_timeout=args.run_timeout,
+            calendar=MarketCalendar.from_file(args.holidays) if args.market_hours else None,
+            off_hours_interval=args.off_hours_interval * 60,
+        ),
+        crawler_options=crawler_options_from_args(args),
+        workers=args.workers,
+        metrics_file=args.metrics_file,
+        output_format=args.output_format,
+        compact_min_files=args.compact_min_files,
+        history=quote_history_from_args(args),
+        delta=delta_filter_from_args(args, f"{output_path}.delta.json"),
     )
     stop_event = asyncio.Event()
 
@@ -0,0 +1,103 @@
+"""
+Market Calendar
+----------------------
+This module defines the `MarketCalendar` class, which tells the `CronAdapter`
+whether the London Stock Exchange is in session, so scheduled crawls can skip
+(or thin out) runs when prices cannot change.
+
+Features:
+- Session hours in the exchange time zone (LSE: 08:00-16:30 Europe/London),
+  independent of the host time zone and daylight saving changes.
+- Weekends and a configurable holiday list, loaded from a text file with one ISO
+  date per line. A time after the date marks an early close (e.g. `2026-12-24 12:30`).
+- Human-readable reasons for a closed market, and the next session open.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOLIDAYS_FILE = Path(__file__).with_name("lse_holidays.txt")
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def load_holidays(path: Union[str, Path]) -> tuple[set[date], dict[date, time]]:
+    holidays, early_closes = set(), {}
+    for number, line in enumerate(Path(path).read_text(encoding="utf-8").splitlines(), start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            day, _, close = line.partition(" ")
+            if close.strip():
+                early_closes[date.fromisoformat(day)] = time.fromisoformat(close.strip())
+            else:
+                holidays.add(date.fromisoformat(day))
+        except ValueError as e:
+            raise ValueError(f"{path}:{number}: invalid holiday entry {line!r}") from e
+    logger.info("Loaded %s holidays and %s early closes from %s", len(holidays), len(early_closes), path)
+    return holidays, early_closes
+
+
+class MarketCalendar:
+
+    def __init__(
+        self,
+        timezone: str = "Europe/London",
+        open_time: time = time(8, 0),
+        close_time: time = time(16, 30),
+        holidays: Iterable[date] = (),
+        early_closes: Optional[dict[date, time]] = None,
+        weekend: Iterable[int] = (5, 6),
+    ):
+        self.timezone = ZoneInfo(timezone)
+        self.open_time = open_time
+        self.close_time = close_time
+        self.holidays = set(holidays)
+        self.early_closes = dict(early_closes or {})
+        self.weekend = frozenset(weekend)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path] = DEFAULT_HOLIDAYS_FILE, **kwargs) -> "MarketCalendar":
+        holidays, early_closes = load_holidays(path)
+        return cls(holidays=holidays, early_closes=early_closes, **kwargs)
+
+    def _local(self, moment: datetime) -> datetime:
+        if moment.tzinfo is None:
+            moment = moment.astimezone()
+        return moment.astimezone(self.timezone)
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() not in self.weekend and day not in self.holidays
+
+    def closing_time(self, day: date) -> time:
+        return self.early_closes.get(day, self.close_time)
+
+    def closed_reason(self, moment: datetime) -> Optional[str]:
+        local = self._local(moment)
+        day = local.date()
+        if day.weekday() in self.weekend:
+            return f"weekend ({WEEKDAY_NAMES[day.weekday()]})"
+        if day in self.holidays:
+            return f"exchange holiday ({day.isoformat()})"
+        if local.time() < self.open_time:
+            return f"before the {self.open_time:%H:%M} open"
+        if local.time() >= self.closing_time(day):
+            return f"after the {self.closing_time(day):%H:%M} close"
+        return None
+
+    def is_open(self, moment: datetime) -> bool:
+        return self.closed_reason(moment) is None
+
+    def next_open(self, moment: datetime) -> datetime:
+        local = self._local(moment)
+        day = local.date()
+        if local.time() >= self.open_time:
+            day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return datetime.combine(day, self.open_time, tzinfo=self.timezone)
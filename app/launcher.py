@@ -37,6 +37,8 @@ def run_all(args):
                     args.cli_input,
                     "--output",
                     args.cli_output,
+                    "--engine",
+                    args.engine,
                 ],
             )
         )
@@ -54,6 +56,8 @@ def run_all(args):
                     args.cron_output,
                     "--cron",
                     args.cron_expr,
+                    "--engine",
+                    args.engine,
                 ],
             )
         )
@@ -68,6 +72,8 @@ def run_all(args):
                     args.watchdog_input_dir,
                     "--output-dir",
                     args.watchdog_output_dir,
+                    "--engine",
+                    args.engine,
                 ],
             )
         )
@@ -86,7 +92,7 @@ def run_api():
 
 def run_cli(args):
     subprocess.run(
-        ["python", "-m", "cli.entrypoint", "--input", args.input, "--output", args.output],
+        ["python", "-m", "cli.entrypoint", "--input", args.input, "--output", args.output, "--engine", args.engine],
         check=True,
     )
 
@@ -103,6 +109,8 @@ def run_cron(args):
             args.output,
             "--cron",
             args.cron,
+            "--engine",
+            args.engine,
         ],
         check=True,
     )
@@ -118,6 +126,8 @@ def run_watchdog(args):
             args.input_dir,
             "--output-dir",
             args.output_dir,
+            "--engine",
+            args.engine,
         ],
         check=True,
     )
@@ -132,15 +142,18 @@ def main():
     cli_parser = subparsers.add_parser("cli", help="Run CLI adapter")
     cli_parser.add_argument("--input", "-i", required=True, help="Input CSV file")
     cli_parser.add_argument("--output", "-o", required=True, help="Output CSV file")
+    cli_parser.add_argument("--engine", choices=["browser", "http"], default="browser", help="Fetch engine")
 
     cron_parser = subparsers.add_parser("cron", help="Run Cron adapter")
     cron_parser.add_argument("--input", "-i", required=True)
     cron_parser.add_argument("--output", "-o", required=True)
     cron_parser.add_argument("--cron", default="*/5 * * * *", help="Cron schedule")
+    cron_parser.add_argument("--engine", choices=["browser", "http"], default="browser", help="Fetch engine")
 
     watch_parser = subparsers.add_parser("watchdog", help="Run Watchdog adapter")
     watch_parser.add_argument("--input-dir", "-i", required=True)
     watch_parser.add_argument("--output-dir", "-o", required=True)
+    watch_parser.add_argument("--engine", choices=["browser", "http"], default="browser", help="Fetch engine")
 
     all_parser = subparsers.add_parser("all", help="Run all adapters concurrently")
     all_parser.add_argument("--cli-input")
@@ -150,6 +163,7 @@ def main():
     all_parser.add_argument("--cron-expr", default="*/5 * * * *")
     all_parser.add_argument("--watchdog-input-dir")
     all_parser.add_argument("--watchdog-output-dir")
+    all_parser.add_argument("--engine", choices=["browser", "http"], default="browser", help="Fetch engine")
 
     args = parser.parse_args()
 
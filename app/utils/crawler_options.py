@@ -0,0 +1,126 @@
+"""
+Crawler Options
+---------------------
+This module provides helpers shared by the CLI, Cron and Watchdog entrypoints
+to expose `Crawler` settings as command-line arguments and turn the parsed
+arguments into the `CrawlerOptions` passed through the adapters (including the quote cache and
+the circuit breaker and rate limiter, which are created once per process so they
+survive between runs of a single-process crawler).
+
+With `--workers > 1` the options are pickled into the spawned worker processes for
+each shard, so an in-memory cache and the circuit breaker start afresh in every
+worker and their state is not carried between runs. Use `--cache-path` (SQLite) and
+`--rate-limit-file` for state shared across workers and runs.
+"""
+
+import argparse
+from core.concurrency import CONCURRENCY_MODES
+from core.crawler import ENGINES, EXTRACTION_MODES, CrawlerOptions
+from core.quote_cache import create_quote_cache
+from core.rate_limiter import create_rate_limiter
+from core.resilience import CircuitBreaker, RetryPolicy
+
+DEFAULT_MAX_CONCURRENT = 5
+
+
+def add_crawler_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("crawler")
+    group.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="browser",
+        help="Fetch engine: 'browser' (Playwright only) or 'http' (HTTP fast path with browser fallback).",
+    )
+    group.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT,
+        help=f"Maximum number of stocks fetched concurrently per crawler process (default: {DEFAULT_MAX_CONCURRENT}).",
+    )
+    group.add_argument(
+        "--concurrency",
+        choices=CONCURRENCY_MODES,
+        default="fixed",
+        help="Concurrency control: 'fixed' at --max-concurrent or 'adaptive' (AIMD between --min-concurrent "
+        "and --max-concurrent, backing off on slow responses and errors).",
+    )
+    group.add_argument(
+        "--min-concurrent",
+        type=int,
+        default=1,
+        help="Floor of the adaptive concurrency limit (default: 1).",
+    )
+    group.add_argument(
+        "--extraction",
+        choices=EXTRACTION_MODES,
+        default="single",
+        help="Field extraction: 'single' in-page wait for all fields or legacy 'sequential' selector waits.",
+    )
+    group.add_argument(
+        "--stock-timeout",
+        type=float,
+        default=30.0,
+        help="Overall per-stock deadline in seconds for single extraction (default: 30).",
+    )
+    group.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Attempts per stock for transient failures (timeouts, navigation errors) (default: 3).",
+    )
+    group.add_argument(
+        "--breaker-threshold",
+        type=float,
+        default=0.5,
+        help="Failure rate over recent fetches that opens the circuit breaker and fails fast (default: 0.5).",
+    )
+    group.add_argument(
+        "--breaker-reset",
+        type=float,
+        default=30.0,
+        help="Seconds the circuit breaker stays open before probing the site again (default: 30).",
+    )
+    group.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0,
+        help="Maximum requests per second sent to the website (default: 0, unlimited).",
+    )
+    group.add_argument(
+        "--rate-burst", type=int, default=5, help="Requests allowed in a burst above --rate-limit (default: 5)."
+    )
+    group.add_argument(
+        "--rate-limit-file",
+        help="State file for a --rate-limit budget shared between processes (default: per process).",
+    )
+    group.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        help="Serve quotes fetched less than this many seconds ago from the quote cache (default: 0, disabled).",
+    )
+    group.add_argument(
+        "--cache-path",
+        help="SQLite file for a quote cache shared between processes (default: in-memory cache).",
+    )
+    group.add_argument(
+        "--cache-size", type=int, default=10_000, help="Maximum number of cached quotes (default: 10000)."
+    )
+    group.add_argument("--refresh", action="store_true", help="Bypass cached quotes and refresh them from the website.")
+    return group
+
+
+def crawler_options_from_args(args: argparse.Namespace) -> CrawlerOptions:
+    return CrawlerOptions(
+        max_concurrent=args.max_concurrent,
+        concurrency=args.concurrency,
+        min_concurrent=args.min_concurrent,
+        engine=args.engine,
+        extraction=args.extraction,
+        stock_timeout=args.stock_timeout,
+        cache=create_quote_cache(args.cache_path, ttl=args.cache_ttl, max_size=args.cache_size),
+        force_refresh=args.refresh,
+        retry_policy=RetryPolicy(max_attempts=args.max_attempts),
+        rate_limiter=create_rate_limiter(args.rate_limit, burst=args.rate_burst, path=args.rate_limit_file),
+        circuit_breaker=CircuitBreaker(failure_threshold=args.breaker_threshold, reset_timeout=args.breaker_reset),
+    )
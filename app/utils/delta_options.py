@@ -0,0 +1,33 @@
+"""
+Delta Options
+-------------------
+This module provides helpers shared by the Cron and Watchdog entrypoints to expose
+the change-only (delta) output mode as command-line arguments and to build the
+`DeltaFilter` from the parsed arguments.
+"""
+
+import argparse
+from typing import Optional
+from core.delta_filter import DeltaFilter
+
+
+def add_delta_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("delta output")
+    group.add_argument(
+        "--delta",
+        action="store_true",
+        help="Only write quotes whose price or timestamp changed since they were last written.",
+    )
+    group.add_argument("--delta-state", help="JSON file keeping the last written quote per stock code.")
+    group.add_argument(
+        "--snapshot-interval",
+        type=float,
+        default=0,
+        help="With --delta, write every quote again once every N minutes (default: 0, never).",
+    )
+
+
+def delta_filter_from_args(args: argparse.Namespace, default_state_path: str) -> Optional[DeltaFilter]:
+    if not args.delta:
+        return None
+    return DeltaFilter(args.delta_state or default_state_path, snapshot_interval=args.snapshot_interval * 60)
@@ -0,0 +1,22 @@
+"""
+History Options
+---------------------
+This module provides helpers shared by the CLI, Cron and Watchdog entrypoints to
+expose the quote history store as a command-line argument and to open it from the
+parsed arguments.
+"""
+
+import argparse
+from typing import Optional
+from core.quote_history import QuoteHistory, create_quote_history
+
+
+def add_history_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--history-db",
+        help="SQLite database recording every fetched quote (e.g. shared with the API's QUOTE_HISTORY_PATH).",
+    )
+
+
+def quote_history_from_args(args: argparse.Namespace) -> Optional[QuoteHistory]:
+    return create_quote_history(args.history_db)
@@ -10,23 +10,148 @@ Features:
 - Timed rotating log files (daily rotation at midnight) with retention of 90 days.
 - Console logging to stdout.
 - Log level configurable via LOG_LEVEL environment variable (default: INFO).
-- Log messages formatted with timestamp, logger name, level, and message.
+- Log messages formatted with timestamp, logger name, level, and message, or as one
+  JSON object per line (LOG_FORMAT=json).
+- Non-blocking: callers only put records on a queue (`QueueHandler`); formatting and
+  file/console I/O happen on a background thread (`QueueListener`), so logging does
+  not stall the event loop.
+- Sampling and rate limiting of repeated messages below WARNING that are marked with
+  `extra={"sampled": True}` (the per-stock lines on the crawl hot path), per logger and
+  message template: LOG_SAMPLE_EVERY keeps one in N repeats, LOG_RATE_LIMIT caps each
+  template at N messages per second (0: no limit). The next record of a template that
+  gets through reports how many similar ones were suppressed. Unmarked records (e.g.
+  operational messages such as skipped scheduled runs), warnings and errors are never
+  dropped.
 
 """
 
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
-from logging.handlers import TimedRotatingFileHandler
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Callable, Optional
 
+LOG_FORMATS = ("text", "json")
+MAX_TEMPLATES = 10_000
 
-def setup_logging(file_name):
+_listener = None
+
+
+class LogSampler(logging.Filter):
+
+    def __init__(
+        self,
+        sample_every: int = 1,
+        rate_limit: float = 0,
+        exempt_level: int = logging.WARNING,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.rate_limit = rate_limit
+        self.exempt_level = exempt_level
+        self.clock = clock
+        self.burst = max(1.0, rate_limit)
+        self.suppressed = 0
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level or not getattr(record, "sampled", False):
+            return True
+        if self.sample_every == 1 and self.rate_limit <= 0:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            now = self.clock()
+            state = self._templates.get(key)
+            if state is None:
+                if len(self._templates) >= MAX_TEMPLATES:  # guards against messages formatted before logging
+                    self._templates.clear()
+                # seen count, rate-limit tokens, last refill, suppressed since the last emitted record
+                state = self._templates[key] = [0, self.burst, now, 0]
+            state[0] += 1
+            keep = (state[0] - 1) % self.sample_every == 0
+            if keep and self.rate_limit > 0:
+                state[1] = min(self.burst, state[1] + (now - state[2]) * self.rate_limit)
+                state[2] = now
+                keep = state[1] >= 1
+                if keep:
+                    state[1] -= 1
+            if not keep:
+                state[3] += 1
+                self.suppressed += 1
+                return False
+            record.suppressed, state[3] = state[3], 0
+        return True
+
+
+class _QueueHandler(QueueHandler):
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # resolve the message and traceback in the calling thread, keeping the traceback separate for JSON output
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class TextFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} [{suppressed} similar suppressed]" if suppressed else text
+
+
+class JSONFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JSONFormatter()
+    return TextFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+
+def setup_logging(file_name, log_format: Optional[str] = None):
+    global _listener  # pylint:disable=global-statement
+    if _listener is not None:
+        return
     log_dir = os.getenv("LOG_DIR", "logs")
     os.makedirs(log_dir, exist_ok=True)
     log_file = os.path.join(log_dir, f"{file_name}.log")
     log_level_str = os.getenv("LOG_LEVEL", "info").upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    log_format = (log_format or os.getenv("LOG_FORMAT", "text")).lower()
+    if log_format not in LOG_FORMATS:
+        log_format = "text"
+    formatter = _formatter(log_format)
     file_handler = TimedRotatingFileHandler(
         log_file, when="midnight", interval=1, delay=True, backupCount=90, encoding="utf-8"
     )
@@ -36,4 +161,25 @@ def setup_logging(file_name):
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_handler.setFormatter(formatter)
     stream_handler.setLevel(log_level)
-    logging.basicConfig(level=log_level, handlers=[file_handler, stream_handler])
+
+    queue_handler = _QueueHandler(queue.SimpleQueue())
+    queue_handler.setLevel(log_level)
+    queue_handler.addFilter(
+        LogSampler(
+            sample_every=int(os.getenv("LOG_SAMPLE_EVERY", "1")),
+            rate_limit=float(os.getenv("LOG_RATE_LIMIT", "0")),
+        )
+    )
+    _listener = QueueListener(queue_handler.queue, file_handler, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    logging.basicConfig(level=log_level, handlers=[queue_handler])
+
+
+def stop_logging():
+    global _listener  # pylint:disable=global-statement
+    if _listener is None:
+        return
+    # flushes records still queued, e.g. at interpreter exit
+    _listener.stop()
+    _listener = None
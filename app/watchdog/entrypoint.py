@@ -8,13 +8,20 @@ Features:
 - Watches a specified input directory for new CSV files.
 - Automatically processes detected CSV files and saves output to a target directory.
 - Uses asynchronous execution for efficient file monitoring and processing.
+- Processes several files at once (`--file-workers`) with one shared crawler, once
+  each file has stopped growing (`--settle-interval`).
+- Optionally writes only quotes that changed since the previous file (`--delta`).
 """
 
 import asyncio
 import argparse
 import logging
+import os
 import sys
 from watchdog.watchdog_adapter import WatcherAdapter
+from utils.crawler_options import add_crawler_arguments, crawler_options_from_args
+from utils.delta_options import add_delta_arguments, delta_filter_from_args
+from utils.history_options import add_history_arguments, quote_history_from_args
 from utils.logger_setup import setup_logging
 
 
@@ -27,12 +34,36 @@ def main():
 
     parser.add_argument("--input-dir", "-i", required=True, help="Directory to watch for new CSV files.")
     parser.add_argument("--output-dir", "-o", required=True, help="Directory to save processed CSV output.")
+    parser.add_argument(
+        "--metrics-file", help="Write a Prometheus metrics snapshot (text format) to this file after each run."
+    )
+    parser.add_argument(
+        "--file-workers", type=int, default=2, help="Number of files processed concurrently (default: 2)."
+    )
+    parser.add_argument(
+        "--settle-interval",
+        type=float,
+        default=1.0,
+        help="Seconds a new file's size must stay unchanged before it is read (default: 1).",
+    )
+    add_history_arguments(parser)
+    add_crawler_arguments(parser)
+    add_delta_arguments(parser)
 
     args = parser.parse_args()
     logger.info("Watcher Entrypoint started")
 
     try:
-        adapter = WatcherAdapter(args.input_dir, args.output_dir)
+        adapter = WatcherAdapter(
+            args.input_dir,
+            args.output_dir,
+            crawler_options_from_args(args),
+            metrics_file=args.metrics_file,
+            delta=delta_filter_from_args(args, os.path.join(args.output_dir, ".delta_state.json")),
+            workers=args.file_workers,
+            settle_interval=args.settle_interval,
+            history=quote_history_from_args(args),
+        )
         asyncio.run(adapter.watch())
     except KeyboardInterrupt:
         logger.warning("Watcher stopped by user (Ctrl+C)")
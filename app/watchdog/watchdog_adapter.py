@@ -13,61 +13,179 @@ It integrates:
 
 Features:
 - Automatically detects new CSV files added to the input directory.
-- Processes each CSV asynchronously and saves results to the output directory.
-- Timestamps output files to prevent overwriting.
-- Handles errors and logs progress at each stage.
+- Waits until a new file's size stops changing before reading it, so files still
+  being written are not picked up half-way.
+- Processes files concurrently in a bounded pool of workers that share one
+  long-lived crawler (one browser for the lifetime of the watcher).
+- Files detected together form a batch; a stock code listed in several files of a
+  batch is fetched only once (`BatchCrawler`).
+- Streams results to the output directory as they arrive, in output files named
+  after the input file and timestamped to prevent overwriting.
+- Handles errors and logs progress at each stage; a failing file does not stop the watcher.
+- Reads input and writes output off the event loop (`core.async_io`), and monitors
+  event-loop lag while watching.
+- Optionally rewrites a Prometheus metrics snapshot after each processed file.
+- Optionally records successful quotes in a `QuoteHistory` database, closed when the watcher stops.
+- Optional delta output (`DeltaFilter`): only quotes that changed since they were last
+  written to any output file are written, with optional periodic full snapshots
+  (decided once per batch; each file counts its rows in its own `DeltaRun`).
 """
 
 import os
 import asyncio
 import logging
 from datetime import datetime
+from pathlib import Path
+from typing import Optional
 from watchfiles import awatch, Change
-from core.crawler import Crawler
+from core.async_io import AsyncRowWriter, LoopLagMonitor, open_records, run_blocking
+from core.batch_crawler import BatchCrawler
+from core.crawler import Crawler, CrawlerOptions
 from core.stock_processor import StocksProcessor
 from core.csv_handler import CSVHandler
+from core.delta_filter import DeltaFilter, DeltaRun
+from core.metrics import write_metrics_snapshot
+from core.quote_history import QuoteHistory
 
 logger = logging.getLogger(__name__)
 
 
 class WatcherAdapter:
-    def __init__(self, input_dir: str, output_dir: str):
+    def __init__(
+        self,
+        input_dir: str,
+        output_dir: str,
+        crawler_options: Optional[CrawlerOptions] = None,
+        *,
+        metrics_file: Optional[str] = None,
+        delta: Optional[DeltaFilter] = None,
+        workers: int = 2,
+        settle_interval: float = 1.0,
+        settle_timeout: float = 60.0,
+        history: Optional[QuoteHistory] = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
         self.input_dir = input_dir
         os.makedirs(self.input_dir, exist_ok=True)
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
-        logger.info("WatcherAdapter initialized. Watching: '%s', Output: '%s'", input_dir, output_dir)
+        self.crawler_options = crawler_options or CrawlerOptions(max_concurrent=5)
+        self.metrics_file = metrics_file
+        self.delta = delta
+        self.workers = workers
+        self.settle_interval = settle_interval
+        self.settle_timeout = settle_timeout
+        self.history = history
+        self.crawler = None
+        self.queue = asyncio.Queue()
+        self._batches = set()
+        self.loop_monitor = LoopLagMonitor()
+        logger.info(
+            "WatcherAdapter initialized. Watching: '%s', Output: '%s', workers: %s", input_dir, output_dir, workers
+        )
 
     async def watch(self):
         await asyncio.sleep(1)
         logger.info("Started watching directory: %s", self.input_dir)
         try:
-            async for changes in awatch(self.input_dir):
-                for change, path in changes:
-                    if change == Change.added and path.endswith(".csv"):
-                        logger.info("Detected new CSV file: %s", path)
-                        await self._process_file(path)
+            async with Crawler(self.crawler_options) as crawler, self.loop_monitor:
+                self.crawler = crawler
+                workers = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+                try:
+                    async for changes in awatch(self.input_dir):
+                        paths = sorted(
+                            path for change, path in changes if change == Change.added and path.endswith(".csv")
+                        )
+                        if paths:
+                            logger.info("Detected %s new CSV file(s): %s", len(paths), ", ".join(paths))
+                            self.submit_batch(paths)
+                finally:
+                    for task in [*self._batches, *workers]:
+                        task.cancel()
+                    await asyncio.gather(*self._batches, *workers, return_exceptions=True)
+                    self.crawler = None
         except Exception as e:
             logger.error("Error while watching directory '%s': %s", self.input_dir, str(e))
             raise
         finally:
+            if self.history is not None:
+                await run_blocking(self.history.close)
             logger.info("Stopped watching directory: %s", self.input_dir)
 
-    async def _process_file(self, file_path: str):
+    def submit_batch(self, paths: list[str]) -> asyncio.Task:
+        task = asyncio.create_task(self._enqueue_batch(paths))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+        return task
+
+    async def _enqueue_batch(self, paths: list[str]):
+        ready = [path for path in await asyncio.gather(*(self._wait_until_stable(path) for path in paths)) if path]
+        if not ready:
+            return
+        run = self.delta.begin_run() if self.delta is not None else DeltaRun()
+        batch = BatchCrawler(self.crawler)
+        for path in ready:
+            # each file stages and commits its own rows; the batch shares the snapshot decision
+            self.queue.put_nowait((path, batch, DeltaRun(run.full_snapshot, run.started_at)))
+        logger.info("Queued %s file(s) for processing (%s waiting)", len(ready), self.queue.qsize())
+
+    async def _wait_until_stable(self, path: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.settle_timeout
+        previous = None
+        while True:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                logger.warning("File disappeared before it could be processed: %s", path)
+                return None
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current == previous and stat.st_size > 0:
+                return path
+            if loop.time() >= deadline:
+                logger.warning("File still changing after %.0fs, processing it anyway: %s", self.settle_timeout, path)
+                return path
+            previous = current
+            await asyncio.sleep(self.settle_interval)
+
+    async def _worker(self, index: int):
+        while True:
+            path, batch, run = await self.queue.get()
+            try:
+                await self._process_file(path, batch, run)
+            except Exception:  # pylint:disable=broad-exception-caught
+                pass  # already logged, keep watching
+            finally:
+                self.queue.task_done()
+                logger.debug("Worker %s finished %s", index, path)
+
+    async def _process_file(self, file_path: str, batch: BatchCrawler, run: Optional[DeltaRun] = None):
         logger.info("Processing file: %s", file_path)
+        writer = None
         try:
-            stocks = CSVHandler.read_csv(file_path)
-            logger.info("Loaded %s stock entries from %s", len(stocks), file_path)
-            async with Crawler(max_concurrent=5) as crawler:
-                processor = StocksProcessor(crawler)
-                logger.info("Processing stock data...")
-                results = await processor.process_stocks(stocks)
-                logger.info("Completed processing for %s", file_path)
+            stocks = await open_records(file_path)
+            logger.info("Reading stock entries lazily from %s", file_path)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"stocks_output_{timestamp}.csv"
+            output_filename = f"stocks_output_{timestamp}_{Path(file_path).stem}.csv"
             output_path = os.path.join(self.output_dir, output_filename)
-            CSVHandler.write_csv(results, output_path)
-            logger.info("Results saved to %s", output_path)
+            processor = StocksProcessor(batch, history=self.history)
+            logger.info("Processing stock data...")
+            async with AsyncRowWriter(CSVHandler.open_writer(output_path)) as writer:
+                async for row in processor.process_stream(stocks):
+                    if self.delta is None or self.delta.should_emit(row, run):
+                        await writer.write_row(row)
+            logger.info(
+                "Completed processing for %s (%s repeated stock codes in its batch served without a new fetch)",
+                file_path,
+                batch.deduplicated,
+            )
+            logger.info("Results saved to %s (%s rows)", output_path, writer.rows_written)
         except Exception as e:
             logger.exception("Error processing file '%s': %s", file_path, str(e))
             raise
+        finally:
+            if self.delta is not None:
+                self.delta.finish(run, delivered=writer is not None and writer.closed)
+            if self.metrics_file:
+                write_metrics_snapshot(self.metrics_file)
@@ -0,0 +1,190 @@
+"""
+Crawler Benchmark
+------------------------
+Measures `Crawler` throughput and latency offline, against the synthetic
+`lse_stand_in` server, over a matrix of engines, `max_concurrent` values and
+input sizes.
+
+Each cell runs in a fresh worker process (so peak memory is per cell) and reports:
+- stocks/sec over the whole crawl, and success / failure counts.
+- p50 / p95 / p99 latency of a single stock (retries included), in milliseconds,
+  timed through the `fetch` hook of `Crawler.crawl_iter`, excluding the time spent
+  queued for a concurrency slot, which is reported separately (`queued_ms`).
+- Number of fetch attempts and their mean duration, from the `lse_fetch_attempt_seconds`
+  metric (`FETCH_SECONDS`).
+- Peak RSS of the crawler process and of its largest child process (Chromium with
+  the browser engine), in MiB.
+
+Results are printed as JSON (or written with `--output`) so they can be compared
+between releases.
+
+Usage:
+    python benchmarks/crawler_benchmark.py --engines http,browser --concurrency 1,5,10 --sizes 50,200 \\
+        --latency 0.2 --jitter 0.1 --error-rate 0.02 --slow-assets 6
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCHMARKS_DIR.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from core.concurrency import create_limiter  # noqa: E402  pylint:disable=wrong-import-position
+from core.crawler import Crawler  # noqa: E402  pylint:disable=wrong-import-position
+from core.metrics import FETCH_SECONDS  # noqa: E402  pylint:disable=wrong-import-position
+from lse_stand_in import StandInServer, add_server_arguments, server_options_from_args  # noqa: E402
+
+
+def _percentiles(latencies: list[float]) -> dict:
+    if len(latencies) < 2:
+        value = round(latencies[0] * 1000, 1) if latencies else None
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {name: round(cuts[index] * 1000, 1) for name, index in (("p50", 49), ("p95", 94), ("p99", 98))}
+
+
+def _peak_rss_mib(who: int) -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    return round(resource.getrusage(who).ru_maxrss / scale, 1)
+
+
+# seconds each stock waited for a limiter slot; set per stock by the timed fetch and
+# inherited by the tasks it starts (single-flight)
+QUEUE_WAITS = contextvars.ContextVar("queue_waits")
+
+
+class TimedLimiter:
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    def __getattr__(self, name):
+        return getattr(self.limiter, name)
+
+    async def __aenter__(self):
+        started = time.perf_counter()
+        await self.limiter.__aenter__()
+        waits = QUEUE_WAITS.get(None)
+        if waits is not None:
+            waits.append(time.perf_counter() - started)
+        return self
+
+    async def __aexit__(self, *args):
+        return await self.limiter.__aexit__(*args)
+
+
+def _fetch_attempts() -> tuple[float, float]:
+    # count and total seconds of fetch attempts over every engine label, since process start
+    totals = {"_count": 0.0, "_sum": 0.0}
+    for metric in FETCH_SECONDS.collect():
+        for sample in metric.samples:
+            for suffix in totals:
+                if sample.name.endswith(suffix):
+                    totals[suffix] += sample.value
+    return totals["_count"], totals["_sum"]
+
+
+async def _crawl(base_url: str, engine: str, max_concurrent: int, size: int, stock_timeout: float) -> dict:
+    stocks = [{"stock code": f"B{index:05d}", "company name": f"Bench Company {index}"} for index in range(size)]
+    latencies, queued = [], []
+    limiter = TimedLimiter(create_limiter("fixed", max_concurrent))
+    async with Crawler(
+        max_concurrent=max_concurrent, engine=engine, stock_timeout=stock_timeout, limiter=limiter
+    ) as crawler:
+        crawler.base_url = base_url
+
+        async def timed_fetch(stock, force_refresh=None):
+            waits = []
+            QUEUE_WAITS.set(waits)
+            started = time.perf_counter()
+            try:
+                return await crawler.get_stock_data(stock, force_refresh=force_refresh)
+            finally:
+                queued.append(sum(waits))
+                latencies.append(time.perf_counter() - started - queued[-1])
+
+        started = time.perf_counter()
+        results = [result async for result in crawler.crawl_iter(stocks, fetch=timed_fetch)]
+        elapsed = time.perf_counter() - started
+    succeeded = sum(1 for result in results if result["status"] == "success")
+    attempts, attempt_seconds = _fetch_attempts()
+    return {
+        "seconds": round(elapsed, 3),
+        "stocks_per_second": round(size / elapsed, 2),
+        "succeeded": succeeded,
+        "failed": size - succeeded,
+        "attempts": int(attempts),
+        "mean_attempt_ms": round(attempt_seconds / attempts * 1000, 1) if attempts else None,
+        "latency_ms": _percentiles(latencies),
+        "queued_ms": _percentiles(queued),
+    }
+
+
+def run_cell(base_url: str, engine: str, max_concurrent: int, size: int, stock_timeout: float) -> dict:
+    result = asyncio.run(_crawl(base_url, engine, max_concurrent, size, stock_timeout))
+    result["peak_rss_mib"] = {
+        "crawler": _peak_rss_mib(resource.RUSAGE_SELF),
+        "largest_child": _peak_rss_mib(resource.RUSAGE_CHILDREN),
+    }
+    return result
+
+
+def run(engines: list[str], concurrency: list[int], sizes: list[int], stock_timeout: float, server_options: dict):
+    cells = []
+    with StandInServer(**server_options) as server:
+        for engine in engines:
+            for max_concurrent in concurrency:
+                for size in sizes:
+                    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                        future = executor.submit(run_cell, server.base_url, engine, max_concurrent, size, stock_timeout)
+                        result = future.result()
+                    cells.append({"engine": engine, "max_concurrent": max_concurrent, "stocks": size, **result})
+                    print(
+                        f"{engine:>7} max_concurrent={max_concurrent:<3} stocks={size:<5} "
+                        f"{result['stocks_per_second']} stocks/s",
+                        file=sys.stderr,
+                    )
+        return {"server": {**server_options, **server.stats()}, "python": platform.python_version(), "results": cells}
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crawler against a synthetic LSE stand-in server.")
+    parser.add_argument("--engines", default="http", help="Comma-separated engines to compare (default: http).")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 5, 10], help="Comma-separated max_concurrent.")
+    parser.add_argument("--sizes", type=_int_list, default=[50], help="Comma-separated numbers of stocks per run.")
+    parser.add_argument("--stock-timeout", type=float, default=30.0, help="Per-stock deadline in seconds.")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    report = run(
+        [engine for engine in args.engines.split(",") if engine],
+        args.concurrency,
+        args.sizes,
+        args.stock_timeout,
+        server_options_from_args(args),
+    )
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+CSV Benchmark
+--------------------
+Compares the default standard-library CSV path of `CSVHandler` with the optional
+pandas dataframe mode.
+
+Measures:
+- Startup: wall time of a fresh interpreter importing `core.csv_handler`
+  (stdlib path) versus importing it and pandas (dataframe mode).
+- Throughput: rows/sec for reading and writing a synthetic stocks CSV.
+
+Results are printed as JSON.
+
+Usage:
+    python benchmarks/csv_benchmark.py --rows 200000 --repeat 3
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+sys.path.insert(0, str(APP_DIR))
+
+from core.csv_handler import CSVHandler  # noqa: E402  pylint:disable=wrong-import-position
+
+
+def _startup_seconds(statement: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=APP_DIR, check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def _rows_per_second(fn, rows: int, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return rows / statistics.median(timings)
+
+
+def run(rows: int, repeat: int) -> dict:
+    data = [
+        {
+            "stock code": f"S{i:06d}",
+            "company name": f"Company {i}",
+            "price": f"{i % 1000}.50GBX",
+            "timestamp": "16:35:00 17-Oct-2026",
+        }
+        for i in range(rows)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "stocks.csv"
+        CSVHandler.write_csv(data, path=path)
+        dataframe = CSVHandler.read_csv(path, as_dataframe=True)
+        return {
+            "rows": rows,
+            "startup_seconds": {
+                "stdlib": _startup_seconds("import core.csv_handler", repeat),
+                "pandas": _startup_seconds("import core.csv_handler, pandas", repeat),
+            },
+            "read_rows_per_second": {
+                "stdlib": _rows_per_second(lambda: CSVHandler.read_csv(path), rows, repeat),
+                "stdlib_chunked": _rows_per_second(lambda: sum(1 for _ in CSVHandler.iter_records(path)), rows, repeat),
+                "pandas": _rows_per_second(lambda: CSVHandler.read_csv(path, as_dataframe=True), rows, repeat),
+            },
+            "write_rows_per_second": {
+                "stdlib": _rows_per_second(
+                    lambda: CSVHandler.write_csv(data, path=Path(tmp) / "out.csv"), rows, repeat
+                ),
+                "pandas": _rows_per_second(
+                    lambda: dataframe.to_csv(Path(tmp) / "out_pd.csv", index=False), rows, repeat
+                ),
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stdlib vs pandas CSV handling.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of rows in the synthetic CSV.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (median is reported).")
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
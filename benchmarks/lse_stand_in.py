@@ -0,0 +1,219 @@
+"""
+LSE Stand-in Server
+--------------------------
+A local HTTP server serving LSE company pages for offline benchmarks and the unit
+tests (`lse_server` fixture).
+
+Every `/stock/<code>/<slug>/company-page` path returns a page with the markup the
+`Crawler` selectors expect (price, currency and refresh timestamp): pages registered
+with `add_company`, otherwise (unless `synthetic=False`) a synthetic page with a price
+derived from the stock code so results are deterministic.
+
+Knobs:
+- `latency` (+ `jitter`): seconds slept before answering a company page.
+- `payload_kb`: filler markup added to each page, to emulate the real page weight.
+- `error_rate`: fraction of company page requests answered with HTTP 503.
+- `slow_assets` / `asset_delay`: number of stylesheet, script and image references
+  per page, each served after `asset_delay` seconds (exercises resource blocking).
+
+Usage:
+    python benchmarks/lse_stand_in.py --port 8080 --latency 0.2 --error-rate 0.05
+"""
+
+import argparse
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{code} company page</title>{assets}</head>
+<body>
+  <div class="price-container">
+    <span class="price-tag">{price}</span>
+    <div class="currency-label small-font-size item-label">Price (<strong>{currency}</strong>)</div>
+    <br>
+    <span class="bold-font-weight refreshed-time">{timestamp}</span>
+  </div>
+  <div hidden>{filler}</div>
+</body>
+</html>
+"""
+
+ASSET_TAGS = (
+    '<link rel="stylesheet" href="/assets/{index}.css">',
+    '<script src="/assets/{index}.js"></script>',
+    '<img src="/assets/{index}.png" alt="">',
+)
+
+ASSET_TYPES = {".css": "text/css", ".js": "application/javascript", ".png": "image/png"}
+
+
+class StandInServer:
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        payload_kb: int = 0,
+        error_rate: float = 0.0,
+        slow_assets: int = 0,
+        asset_delay: float = 0.0,
+        seed: int = 0,
+        synthetic: bool = True,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.payload_kb = payload_kb
+        self.error_rate = error_rate
+        self.slow_assets = slow_assets
+        self.asset_delay = asset_delay
+        self.synthetic = synthetic
+        self.pages = {}
+        self.requests = 0
+        self.errors = 0
+        self.asset_requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/stock/"
+
+    def add_company(self, code, name, price="123.45", currency="GBX", timestamp="17:05:03 17-Oct-2026"):
+        slug = name.lower().replace(" ", "-")
+        self.pages[f"/stock/{code}/{slug}/company-page"] = self._render(code, price, currency, timestamp)
+
+    def render_page(self, code: str) -> str:
+        price = f"{zlib.crc32(code.encode()) % 100000 / 100:,.2f}"
+        return self._render(code, price, "GBX", time.strftime("%H:%M:%S %d-%b-%Y"))
+
+    def _render(self, code: str, price: str, currency: str, timestamp: str) -> str:
+        assets = "".join(ASSET_TAGS[index % len(ASSET_TAGS)].format(index=index) for index in range(self.slow_assets))
+        return PAGE_TEMPLATE.format(
+            code=code,
+            price=price,
+            currency=currency,
+            timestamp=timestamp,
+            assets=assets,
+            filler="x" * (self.payload_kb * 1024),
+        )
+
+    def _roll(self) -> tuple[float, bool]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+            self.errors += failed
+        return delay, failed
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in separate writes; without TCP_NODELAY, Nagle's algorithm
+            # and delayed ACKs add ~40 ms to every response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):  # noqa: N802
+                path = self.path.split("?")[0]
+                parts = path.strip("/").split("/")
+                if len(parts) == 4 and parts[0] == "stock" and parts[3] == "company-page":
+                    delay, failed = server._roll()
+                    time.sleep(delay)
+                    page = server.pages.get(path)
+                    if page is None and server.synthetic:
+                        page = server.render_page(parts[1])
+                    if failed:
+                        self._send(503, "text/plain", b"service unavailable")
+                    elif page is None:
+                        self._send(404, "text/plain", b"not found")
+                    else:
+                        self._send(200, "text/html; charset=utf-8", page.encode("utf-8"))
+                elif parts[0] == "assets":
+                    with server._lock:
+                        server.asset_requests += 1
+                    time.sleep(server.asset_delay)
+                    suffix = parts[-1][parts[-1].rfind(".") :]
+                    self._send(200, ASSET_TYPES.get(suffix, "application/octet-stream"), b"")
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def _send(self, status: int, content_type: str, payload: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors": self.errors, "asset_requests": self.asset_requests}
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("stand-in server")
+    group.add_argument("--latency", type=float, default=0.05, help="Seconds before each company page is served.")
+    group.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, uniform in [0, jitter].")
+    group.add_argument("--payload-kb", type=int, default=0, help="Filler KiB added to each company page.")
+    group.add_argument("--error-rate", type=float, default=0.0, help="Fraction of page requests answered with 503.")
+    group.add_argument("--slow-assets", type=int, default=0, help="Slow asset references per page.")
+    group.add_argument("--asset-delay", type=float, default=0.5, help="Seconds before each asset is served.")
+    return group
+
+
+def server_options_from_args(args: argparse.Namespace) -> dict:
+    return {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "payload_kb": args.payload_kb,
+        "error_rate": args.error_rate,
+        "slow_assets": args.slow_assets,
+        "asset_delay": args.asset_delay,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic LSE company pages.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    server = StandInServer(host=args.host, port=args.port, **server_options_from_args(args))
+    print(f"Serving synthetic company pages at {server.base_url}<CODE>/<slug>/company-page")
+    server.start()
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
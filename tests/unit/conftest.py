@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+from lse_stand_in import StandInServer
+
+
+@pytest.fixture
+def lse_server():
+    # only pages registered with `add_company` are served; other company pages are 404
+    with StandInServer(synthetic=False) as server:
+        yield server
+
+
+class FakeCrawler:
+    # every stock succeeds at its price in `prices` (read at crawl time, so tests can change it between runs)
+    # after its delay in `delays`; `fields` are added to every result
+
+    def __init__(self, prices=None, delays=None, **fields):
+        self.prices = prices if prices is not None else {}
+        self.delays = delays if delays is not None else {}
+        self.fields = fields
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def crawl_iter(self, stocks):
+        if hasattr(stocks, "__aiter__"):
+            stocks = [stock async for stock in stocks]
+        for stock in stocks:
+            code = stock["stock code"]
+            if code in self.delays:
+                await asyncio.sleep(self.delays[code])
+            yield {**stock, "price": self.prices.get(code, "1GBX"), **self.fields, "status": "success", "error": None}
+
+
+@pytest.fixture
+def fake_crawler(monkeypatch):
+    # replaces an adapter's `create_crawler` (e.g. "cron.cron_adapter.create_crawler") with a FakeCrawler
+    def install(target, prices=None, delays=None, **fields):
+        crawler = FakeCrawler(prices, delays, **fields)
+        monkeypatch.setattr(target, lambda options, workers: crawler)
+        return crawler
+
+    return install
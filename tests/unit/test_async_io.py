@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+import pytest
+from core.async_io import AsyncRowWriter, BlockingPool, LoopLagMonitor, open_records
+from core.csv_handler import CSVHandler
+
+
+class RecordingWriter:
+    def __init__(self, fail_on=None):
+        self.rows = []
+        self.threads = set()
+        self.closed = False
+        self.fail_on = fail_on
+
+    def write_row(self, row):
+        if row["n"] == self.fail_on:
+            raise OSError("disk full")
+        self.threads.add(threading.get_ident())
+        self.rows.append(row)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_in_order_off_the_event_loop():
+    target = RecordingWriter()
+    async with AsyncRowWriter(target, batch_size=3, max_pending_batches=1) as writer:
+        for n in range(10):
+            await writer.write_row({"n": n})
+    assert [row["n"] for row in target.rows] == list(range(10))
+    assert writer.rows_written == 10
+    assert threading.get_ident() not in target.threads
+    assert target.closed
+
+
+@pytest.mark.asyncio
+async def test_write_errors_reach_the_producer():
+    target = RecordingWriter(fail_on=2)
+    writer = AsyncRowWriter(target, batch_size=1, max_pending_batches=1)
+    with pytest.raises(OSError, match="disk full"):
+        for n in range(10):
+            await writer.write_row({"n": n})
+        await writer.close()
+    assert target.rows == [{"n": 0}, {"n": 1}]
+
+
+@pytest.mark.asyncio
+async def test_open_records_validates_up_front_and_streams_chunks(tmp_path):
+    path = tmp_path / "in.csv"
+    CSVHandler.write_csv([{"stock code": f"C{n}", "company name": f"Co {n}"} for n in range(5)], path)
+    records = await open_records(path, chunk_size=2)
+    assert [record["stock code"] async for record in records] == ["C0", "C1", "C2", "C3", "C4"]
+
+    (tmp_path / "bad.csv").write_text("code,name\nX,Y\n")
+    with pytest.raises(ValueError, match="stock code"):
+        await open_records(tmp_path / "bad.csv")
+
+
+@pytest.mark.asyncio
+async def test_blocking_pool_bounds_submitted_calls():
+    pool = BlockingPool(max_workers=1, max_pending=1)
+    running = []
+
+    def work():
+        running.append(pool.pending)
+        time.sleep(0.01)
+
+    await asyncio.gather(*(pool.run(work) for _ in range(3)))
+    assert running == [1, 1, 1]
+    with pytest.raises(ValueError):
+        BlockingPool(max_workers=2, max_pending=1)
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_reports_blocking_calls():
+    async with LoopLagMonitor(interval=0.01, warn_threshold=0.05) as monitor:
+        await asyncio.sleep(0.03)
+        time.sleep(0.1)  # stalls the loop
+        await asyncio.sleep(0.03)
+    assert monitor.max_lag >= 0.05
+    assert monitor.warnings >= 1
+    assert monitor.stats()["samples"] == monitor.samples > 1
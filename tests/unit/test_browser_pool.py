@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from core import browser_pool
+from core.browser_pool import BrowserPool
+from core.crawler import Crawler
+
+
+def make_browser(connected=True):
+    browser = AsyncMock()
+    browser.is_connected = MagicMock(return_value=connected)
+    return browser
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    playwright = AsyncMock()
+    playwright.chromium.launch.side_effect = lambda **kwargs: make_browser()
+    starter = MagicMock()
+    starter.start = AsyncMock(return_value=playwright)
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: starter)
+    return playwright
+
+
+@pytest.mark.asyncio
+async def test_pool_launches_browsers_once(fake_playwright):
+    async with BrowserPool(size=2) as pool:
+        first = await pool.acquire()
+        second = await pool.acquire()
+        third = await pool.acquire()
+        assert first is not second
+        assert third is first
+        assert pool.health() == {"ready": True, "size": 2, "connected": 2}
+    assert fake_playwright.chromium.launch.call_count == 2
+    fake_playwright.stop.assert_called_once()
+    assert pool.health()["ready"] is False
+
+
+@pytest.mark.asyncio
+async def test_pool_relaunches_disconnected_browser(fake_playwright):
+    async with BrowserPool(size=1) as pool:
+        dead = await pool.acquire()
+        dead.is_connected.return_value = False
+        replacement = await pool.acquire()
+        assert replacement is not dead
+        assert fake_playwright.chromium.launch.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_requires_started_pool():
+    with pytest.raises(RuntimeError):
+        await BrowserPool().acquire()
+
+
+@pytest.mark.asyncio
+async def test_crawler_does_not_close_shared_browser():
+    browser = make_browser()
+    async with Crawler(browser=browser) as crawler:
+        assert crawler.browser is browser
+    browser.close.assert_not_called()
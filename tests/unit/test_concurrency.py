@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from core.concurrency import AIMDLimiter, FixedLimiter, create_limiter
+from core.crawler import Crawler
+from core.resilience import RetryPolicy
+
+
+async def run_tasks(limiter, count, delay=0.01):
+    peak = 0
+
+    async def task():
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(delay)
+
+    await asyncio.gather(*(task() for _ in range(count)))
+    return peak
+
+
+@pytest.mark.asyncio
+async def test_fixed_limiter_bounds_in_flight():
+    limiter = FixedLimiter(3)
+    assert await run_tasks(limiter, 10) == 3
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_aimd_limiter_bounds_in_flight_to_current_limit():
+    limiter = AIMDLimiter(initial=2, floor=1, ceiling=8)
+    assert await run_tasks(limiter, 10) == 2
+
+
+def test_aimd_additive_increase_and_multiplicative_decrease():
+    limiter = AIMDLimiter(initial=4, floor=2, ceiling=6, latency_target=1.0, window=2)
+    for _ in range(6):
+        limiter.record(0.1, None)
+    assert limiter.limit == 6
+    limiter.record(0.1, "timeout")
+    assert limiter.limit == 3
+    limiter.record(0.1, "navigation")
+    assert limiter.limit == 2
+    limiter.record(5.0, None)
+    assert limiter.limit == 2
+    assert limiter.stats()["decreases"] == 3
+
+
+def test_aimd_ignores_failures_that_are_not_overload():
+    limiter = AIMDLimiter(initial=4, floor=1, ceiling=6, latency_target=1.0, window=2)
+    for error_class in ("not_found", "missing_selector", "not_found", "unknown"):
+        limiter.record(0.1, error_class)
+    assert limiter.limit == 6
+    assert limiter.stats()["decreases"] == 0
+
+
+def test_create_limiter_modes():
+    assert isinstance(create_limiter("fixed", 5), FixedLimiter)
+    adaptive = create_limiter("adaptive", 10, min_concurrent=2)
+    assert (adaptive.floor, adaptive.limit, adaptive.ceiling) == (2, 5, 10)
+    with pytest.raises(ValueError):
+        create_limiter("unbounded", 5)
+
+
+async def crawl(lse_server, limiter, count):
+    stocks = [{"stock code": f"S{i}", "company name": f"Company {i}"} for i in range(count)]
+    for stock in stocks:
+        lse_server.add_company(stock["stock code"], stock["company name"])
+    async with Crawler(
+        max_concurrent=limiter.ceiling, engine="http", limiter=limiter, retry_policy=RetryPolicy(max_attempts=1)
+    ) as crawler:
+        crawler.base_url = lse_server.base_url
+        # the browser fallback for pages the HTTP path could not read times out, like an overloaded site
+        crawler._get_page_pool = AsyncMock(side_effect=asyncio.TimeoutError())
+        return await crawler.crawl_all(stocks)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_grows_against_healthy_server(lse_server):
+    limiter = AIMDLimiter(initial=2, floor=1, ceiling=6, latency_target=1.0, window=4)
+    results = await crawl(lse_server, limiter, 40)
+    assert all(result["status"] == "success" for result in results)
+    assert limiter.limit == 6
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_backs_off_on_errors_and_latency(lse_server):
+    lse_server.error_rate = 1.0
+    limiter = AIMDLimiter(initial=6, floor=1, ceiling=6, window=4)
+    await crawl(lse_server, limiter, 20)
+    assert limiter.limit == 1
+
+    lse_server.error_rate = 0.0
+    lse_server.latency = 0.05
+    limiter = AIMDLimiter(initial=6, floor=2, ceiling=6, latency_target=0.01, window=4)
+    results = await crawl(lse_server, limiter, 20)
+    assert all(result["status"] == "success" for result in results)
+    assert limiter.limit == 2
@@ -1,6 +1,8 @@
+import asyncio
 import pytest
-from unittest.mock import AsyncMock
-from core.crawler import Crawler
+from unittest.mock import AsyncMock, MagicMock
+from core import crawler as crawler_module
+from core.crawler import Crawler, CrawlerOptions
 
 
 @pytest.mark.asyncio
@@ -11,15 +13,29 @@ async def test_build_url():
     assert url == "https://www.londonstockexchange.com/stock/VOD/vodafone-group/company-page"
 
 
+def test_keyword_overrides_apply_to_a_copy_of_the_options():
+    options = CrawlerOptions(max_concurrent=3, engine="http")
+    crawler = Crawler(options, force_refresh=True)
+    assert (crawler.max_concurrent, crawler.engine, crawler.force_refresh) == (3, "http", True)
+    assert options.force_refresh is False
+    with pytest.raises(TypeError):
+        Crawler(options, max_concurent=4)
+    with pytest.raises(ValueError, match="extraction"):
+        Crawler(options, extraction="parallel")
+
+
 @pytest.mark.asyncio
 async def test_get_stock_data_failure(monkeypatch):
     crawler = Crawler(max_concurrent=1)
     fake_page = AsyncMock()
     fake_page.goto.side_effect = Exception("timeout")
     fake_page.close = AsyncMock()
+    fake_page.is_closed = MagicMock(return_value=False)
 
+    fake_context = AsyncMock()
+    fake_context.new_page.return_value = fake_page
     fake_browser = AsyncMock()
-    fake_browser.new_page.return_value = fake_page
+    fake_browser.new_context.return_value = fake_context
     crawler.browser = fake_browser
 
     stock = {"company name": "Vodafone", "stock code": "VOD"}
@@ -50,3 +66,89 @@ async def test_crawl_all(monkeypatch):
     assert len(results) == 2
     assert all(r["status"] == "success" for r in results)
     assert mock_get.call_count == 2
+
+
+def make_crawler_with_page(fake_page, **kwargs):
+    crawler = Crawler(max_concurrent=1, **kwargs)
+    fake_page.is_closed = MagicMock(return_value=False)
+    fake_context = AsyncMock()
+    fake_context.new_page.return_value = fake_page
+    fake_browser = AsyncMock()
+    fake_browser.new_context.return_value = fake_context
+    crawler.browser = fake_browser
+    return crawler
+
+
+@pytest.mark.asyncio
+async def test_single_extraction_reads_all_fields_in_one_evaluation():
+    fake_page = AsyncMock()
+    fake_page.evaluate.return_value = {
+        "fields": {"price": " 72.50 ", "timestamp": " 16:35 ", "currency": "(GBX)"},
+        "timings": {"price": 12.0, "timestamp": 15.0, "currency": 15.0},
+        "missing": [],
+    }
+    crawler = make_crawler_with_page(fake_page, stock_timeout=5)
+
+    result = await crawler.get_stock_data({"company name": "Vodafone", "stock code": "VOD"})
+
+    assert result["status"] == "success"
+    assert result["price"] == "72.50GBX"
+    assert result["timestamp"] == "16:35"
+    fake_page.evaluate.assert_called_once()
+    fake_page.wait_for_selector.assert_not_called()
+    assert fake_page.goto.call_args.kwargs["timeout"] == 5000
+
+
+@pytest.mark.asyncio
+async def test_single_extraction_reports_missing_selectors():
+    fake_page = AsyncMock()
+    fake_page.evaluate.return_value = {"fields": {"price": "72.50"}, "timings": {"price": 3.0}, "missing": ["currency"]}
+    crawler = make_crawler_with_page(fake_page)
+
+    result = await crawler.get_stock_data({"company name": "Vodafone", "stock code": "VOD"})
+
+    assert result["status"] == "failed"
+    assert ".currency-label" in result["error"]
+    fake_page.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_crawl_iter_yields_results_as_they_complete():
+    crawler = Crawler(max_concurrent=2)
+    delays = {"SLOW": 0.05, "FAST": 0.0}
+
+    async def fake_fetch(stock):
+        await asyncio.sleep(delays.get(stock["stock code"], 0.01))
+        return {"stock code": stock["stock code"], "company name": stock["company name"], "status": "success"}
+
+    crawler._fetch_stock_data = fake_fetch
+    stocks = iter(
+        [
+            {"stock code": "SLOW", "company name": "Slow plc"},
+            {"stock code": "FAST", "company name": "Fast plc"},
+            {"stock code": "FAST", "company name": "Fast Again plc"},
+        ]
+    )
+    codes = [r["stock code"] async for r in crawler.crawl_iter(stocks)]
+
+    assert codes[0] == "FAST"
+    assert sorted(codes) == ["FAST", "FAST", "SLOW"]
+
+
+@pytest.mark.asyncio
+async def test_crawl_iter_keeps_a_bounded_set_of_recent_results(monkeypatch):
+    monkeypatch.setattr(crawler_module, "RECENT_RESULTS", 2)
+    crawler = Crawler(max_concurrent=1)
+    fetched = []
+
+    async def fake_fetch(stock, force_refresh=None):
+        fetched.append(stock["stock code"])
+        return {"stock code": stock["stock code"], "company name": stock["company name"], "status": "success"}
+
+    codes = ["A", "B", "A", "C", "D", "A"]
+    stocks = [{"stock code": code, "company name": f"{code} plc"} for code in codes]
+    results = [r async for r in crawler.crawl_iter(stocks, fetch=fake_fetch)]
+
+    assert sorted(r["stock code"] for r in results) == sorted(codes)
+    # the second "A" reuses the first result; by the third, "C" and "D" have evicted it
+    assert fetched == ["A", "B", "C", "D", "A"]
@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from core.delta_filter import DeltaFilter
+from cron.cron_adapter import CronAdapter, CronSchedule
+
+TICK = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc)
+
+
+def make_adapter(tmp_path, **kwargs):
+    adapter = CronAdapter(
+        tmp_path / "in.csv", tmp_path / "out.csv", CronSchedule("*/5 * * * *", now=lambda: TICK, **kwargs)
+    )
+    release = asyncio.Event()
+    started = []
+
+    async def slow_process_file():
+        started.append(len(started))
+        await release.wait()
+        return "completed"
+
+    adapter._process_file = slow_process_file
+    return adapter, release, started
+
+
+@pytest.mark.asyncio
+async def test_overlap_skip_drops_ticks_while_running(tmp_path):
+    adapter, release, started = make_adapter(tmp_path, overlap="skip")
+    first = asyncio.create_task(adapter._cron_task())
+    await asyncio.sleep(0)
+    await adapter._cron_task()
+    release.set()
+    await first
+    assert started == [0]
+    assert adapter.skipped_runs == 1
+    assert adapter.last_run["outcome"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_overlap_queue_keeps_one_run_waiting(tmp_path):
+    adapter, release, started = make_adapter(tmp_path, overlap="queue")
+    first = asyncio.create_task(adapter._cron_task())
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(adapter._cron_task())
+    await asyncio.sleep(0)
+    await adapter._cron_task()
+    assert adapter.skipped_runs == 1
+    release.set()
+    await asyncio.gather(first, queued)
+    assert started == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_overlap_cancel_replaces_previous_run(tmp_path):
+    adapter, release, started = make_adapter(tmp_path, overlap="cancel")
+    first = asyncio.create_task(adapter._cron_task())
+    await asyncio.sleep(0)
+    previous = adapter._current
+    second = asyncio.create_task(adapter._cron_task())
+    await asyncio.sleep(0.01)
+    assert previous.cancelled()
+    release.set()
+    await asyncio.gather(first, second)
+    assert started == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_run_deadline_reports_unfinished_stocks(tmp_path, fake_crawler, caplog):
+    (tmp_path / "in.csv").write_text("stock code,company name\nFAST,Fast Co\nSLOW,Slow Co\n")
+
+    fake_crawler("cron.cron_adapter.create_crawler", delays={"SLOW": 10})
+    adapter = CronAdapter(tmp_path / "in.csv", tmp_path / "out.csv", CronSchedule(now=lambda: TICK, run_timeout=0.05))
+    await adapter._cron_task()
+
+    assert adapter.last_run["outcome"] == "timed_out"
+    assert (tmp_path / "out.csv").read_text() == "stock code,company name,price\nFAST,Fast Co,1GBX\n"
+    assert "Failed: Slow Co (SLOW) | deadline" in caplog.text
+    assert "Fast Co (FAST) | deadline" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_delta_mode_appends_only_changed_quotes(tmp_path, fake_crawler):
+    (tmp_path / "in.csv").write_text("stock code,company name\nAAA,A plc\nBBB,B plc\n")
+    prices = {"AAA": "1GBX", "BBB": "2GBX"}
+
+    fake_crawler("cron.cron_adapter.create_crawler", prices)
+    delta = DeltaFilter(tmp_path / "delta.json")
+    adapter = CronAdapter(tmp_path / "in.csv", tmp_path / "out.csv", CronSchedule(now=lambda: TICK), delta=delta)
+    await adapter._cron_task()
+    prices["BBB"] = "3GBX"
+    await adapter._cron_task()
+
+    assert (tmp_path / "out.csv").read_text().splitlines()[1:] == ["AAA,A plc,1GBX", "BBB,B plc,2GBX", "BBB,B plc,3GBX"]
+    assert (tmp_path / "delta.json").exists()
+
+    class FailingWriter:
+        def write_row(self, row):
+            pass
+
+        def close(self):
+            raise OSError("disk full")
+
+    prices["BBB"] = "4GBX"
+    open_writer = adapter._open_writer
+    adapter._open_writer = FailingWriter
+    await adapter._cron_task()
+    assert adapter.last_run["outcome"] == "failed"
+    adapter._open_writer = open_writer
+    await adapter._cron_task()
+    assert (tmp_path / "out.csv").read_text().splitlines()[-1] == "BBB,B plc,4GBX"
+
+
+@pytest.mark.asyncio
+async def test_parquet_output_writes_typed_partitions(tmp_path, fake_crawler):
+    (tmp_path / "in.csv").write_text("stock code,company name\nAAA,A plc\n")
+
+    fake_crawler("cron.cron_adapter.create_crawler", {"AAA": "1,250.5GBX"}, timestamp="16:35")
+    adapter = CronAdapter(
+        tmp_path / "in.csv",
+        tmp_path / "quotes",
+        CronSchedule(now=lambda: TICK),
+        output_format="parquet",
+        compact_min_files=2,
+    )
+    await adapter._cron_task()
+    await adapter._cron_task()
+
+    [partition] = adapter.store.partitions()
+    assert len(adapter.store.files(partition)) == 1
+    assert adapter.store.scan(columns=["price"]).column("price").to_pylist() == [1250.5, 1250.5]
@@ -1,4 +1,5 @@
 import io
+from pathlib import Path
 import pytest
 import pandas as pd
 from core.csv_handler import CSVHandler
@@ -53,3 +54,69 @@ def test_read_csv_invalid_type():
 def test_write_csv_missing_path():
     with pytest.raises(ValueError):
         CSVHandler.write_csv([{"a": 1}], as_bytes=False)
+
+
+def test_open_writer_appends_rows_incrementally(tmp_path):
+    output_path = tmp_path / "stream.csv"
+    with CSVHandler.open_writer(output_path, append=True) as writer:
+        writer.write_row({"name": "Vodafone", "code": "VOD"})
+    with CSVHandler.open_writer(output_path, append=True) as writer:
+        writer.write_row({"name": "BT", "code": "BT"})
+    df = pd.read_csv(output_path)
+    assert list(df["code"]) == ["VOD", "BT"]
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_yields_header_then_rows():
+    async def rows():
+        yield {"name": "Vodafone", "code": "VOD"}
+        yield {"name": "BT", "code": "BT"}
+
+    chunks = [chunk async for chunk in CSVHandler.stream_csv(rows())]
+    assert chunks == [b"name,code\nVodafone,VOD\n", b"BT,BT\n"]
+
+
+def test_iter_csv_yields_bounded_chunks(tmp_path):
+    file_path = tmp_path / "stocks.csv"
+    rows = [{"stock code": f"S{i}", "company name": f"Company {i}"} for i in range(5)]
+    pd.DataFrame(rows).to_csv(file_path, index=False)
+    chunks = list(CSVHandler.iter_csv(file_path, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0][0] == {"stock code": "S0", "company name": "Company 0"}
+
+
+def test_iter_records_from_byte_stream_maps_missing_values_to_none():
+    data = b"stock code,company name\nVOD,Vodafone\nBT,\n"
+    records = list(CSVHandler.iter_records(io.BytesIO(data), chunk_size=1))
+    assert records == [
+        {"stock code": "VOD", "company name": "Vodafone"},
+        {"stock code": "BT", "company name": None},
+    ]
+
+
+def test_iter_csv_validates_columns_up_front():
+    with pytest.raises(ValueError, match="company name"):
+        CSVHandler.iter_csv(b"stock code,name\nVOD,Vodafone\n")
+
+
+def test_read_csv_does_not_import_pandas_by_default():
+    import subprocess
+    import sys
+
+    code = "import sys; from core.csv_handler import CSVHandler; print('pandas' in sys.modules)"
+    app_dir = Path(__file__).resolve().parents[2] / "app"
+    result = subprocess.run([sys.executable, "-c", code], cwd=app_dir, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_read_csv_as_dataframe():
+    df = CSVHandler.read_csv(b"name,code\nVodafone,VOD\n", as_dataframe=True)
+    assert isinstance(df, pd.DataFrame)
+    assert df.iloc[0]["code"] == "VOD"
+
+
+def test_write_csv_accepts_dataframe_and_blank_values():
+    df = pd.DataFrame([{"name": "Vodafone", "price": None}, {"name": "BT", "price": "10GBX"}])
+    buf = CSVHandler.write_csv(df, as_bytes=True)
+    assert buf.getvalue() == b"name,price\nVodafone,\nBT,10GBX\n"
+    assert CSVHandler.read_csv(buf.getvalue())[0] == {"name": "Vodafone", "price": None}
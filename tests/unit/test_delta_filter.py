@@ -0,0 +1,79 @@
+import json
+from core.delta_filter import DeltaFilter
+
+
+def row(code, price, timestamp="10:00"):
+    return {"stock code": code, "company name": f"{code} plc", "price": price, "timestamp": timestamp}
+
+
+def test_only_changed_quotes_are_emitted_and_state_survives_restart(tmp_path):
+    state_path = tmp_path / "delta.json"
+    delta = DeltaFilter(state_path)
+    run = delta.begin_run()
+    assert [delta.should_emit(r, run) for r in (row("AAA", "1GBX"), row("BBB", "2GBX"))] == [True, True]
+    delta.commit(run)
+
+    delta = DeltaFilter(state_path)
+    run = delta.begin_run()
+    assert not delta.should_emit(row("AAA", "1GBX"), run)
+    assert delta.should_emit(row("BBB", "2GBX", "10:05"), run)
+    assert delta.should_emit(row("CCC", "3GBX"), run)
+    assert (run.emitted, run.suppressed) == (2, 1)
+    delta.commit(run)
+    assert json.loads(state_path.read_text())["quotes"]["BBB"] == {"price": "2GBX", "timestamp": "10:05"}
+
+
+def test_periodic_full_snapshot_emits_unchanged_quotes():
+    now = [0.0]
+    delta = DeltaFilter(snapshot_interval=600, clock=lambda: now[0])
+    run = delta.begin_run()
+    assert run.full_snapshot and delta.should_emit(row("AAA", "1GBX"), run)
+    delta.commit(run)
+    now[0] = 300
+    run = delta.begin_run()
+    assert not run.full_snapshot and not delta.should_emit(row("AAA", "1GBX"), run)
+    delta.commit(run)
+    now[0] = 600
+    run = delta.begin_run()
+    assert run.full_snapshot and delta.should_emit(row("AAA", "1GBX"), run)
+
+
+def test_concurrent_runs_keep_their_own_snapshot_flag_and_counts():
+    now = [0.0]
+    delta = DeltaFilter(snapshot_interval=600, clock=lambda: now[0])
+    first = delta.begin_run()
+    delta.should_emit(row("AAA", "1GBX"), first)
+    delta.commit(first)
+    now[0] = 300
+    incremental = delta.begin_run()
+    now[0] = 600
+    snapshot = delta.begin_run()
+    assert delta.should_emit(row("AAA", "1GBX"), snapshot)
+    assert not delta.should_emit(row("AAA", "1GBX"), incremental)
+    assert delta.should_emit(row("AAA", "1GBX"), snapshot)
+    assert (snapshot.emitted, snapshot.suppressed) == (2, 0)
+    assert (incremental.emitted, incremental.suppressed) == (0, 1)
+
+
+def test_unreadable_state_starts_empty(tmp_path):
+    state_path = tmp_path / "delta.json"
+    state_path.write_text("{not json")
+    delta = DeltaFilter(state_path)
+    assert delta.should_emit(row("AAA", "1GBX"), delta.begin_run())
+
+
+def test_discarded_run_is_emitted_again(tmp_path):
+    now = [0.0]
+    delta = DeltaFilter(tmp_path / "delta.json", snapshot_interval=600, clock=lambda: now[0])
+    failed = delta.begin_run()
+    assert delta.should_emit(row("AAA", "1GBX"), failed)
+    delta.finish(failed, delivered=False)
+    assert not (tmp_path / "delta.json").exists()
+
+    now[0] = 60
+    retry = delta.begin_run()
+    assert retry.full_snapshot
+    assert delta.should_emit(row("AAA", "1GBX"), retry)
+    delta.finish(retry, delivered=True)
+    assert delta.last_snapshot_at == 60
+    assert not delta.should_emit(row("AAA", "1GBX"), delta.begin_run())
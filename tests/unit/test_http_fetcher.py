@@ -0,0 +1,63 @@
+import json
+import pytest
+from unittest.mock import AsyncMock
+from core.crawler import Crawler
+from core.http_fetcher import HttpQuoteFetcher, parse_quote
+
+
+def test_parse_quote_from_html():
+    html = """
+    <span class="price-tag">1,234.50</span>
+    <div class="currency-label small-font-size item-label">Price (<strong>GBX</strong>)<img src="x.png"></div>
+    <span class="bold-font-weight refreshed-time"> 16:35 </span>
+    """
+    assert parse_quote(html) == {"price": "1,234.50", "currency": "GBX", "timestamp": "16:35"}
+
+
+def test_parse_quote_from_embedded_json():
+    state = {"quote": {"tidm": "VOD", "lastprice": 72.5, "currency": "GBX", "lastupdate": "2026-10-17T16:35:00"}}
+    html = f'<script id="ng-state" type="application/json">{json.dumps(state)}</script>'
+    assert parse_quote(html) == {"price": "72.5", "currency": "GBX", "timestamp": "2026-10-17T16:35:00"}
+
+
+def test_parse_quote_incomplete_returns_none():
+    assert parse_quote('<span class="price-tag">10</span>') is None
+
+
+@pytest.mark.asyncio
+async def test_fetcher_against_fixture_server(lse_server):
+    lse_server.add_company("VOD", "Vodafone Group", price="72.50", currency="GBX")
+    async with HttpQuoteFetcher(max_connections=2) as fetcher:
+        hit = await fetcher.fetch(f"{lse_server.base_url}VOD/vodafone-group/company-page")
+        miss = await fetcher.fetch(f"{lse_server.base_url}BT/bt-group/company-page")
+    assert hit["price"] == "72.50"
+    assert hit["currency"] == "GBX"
+    assert miss is None
+    assert (fetcher.hits, fetcher.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_http_engine_keeps_result_shape_and_falls_back(lse_server):
+    lse_server.add_company("VOD", "Vodafone Group", price="72.50", currency="GBX", timestamp="16:35")
+    async with Crawler(max_concurrent=2, engine="http") as crawler:
+        crawler.base_url = lse_server.base_url
+        fallback = {"stock code": "BT", "company name": "BT Group", "status": "success"}
+        crawler._get_page_pool = AsyncMock(side_effect=RuntimeError("browser fallback"))
+        hit = await crawler.get_stock_data({"stock code": "VOD", "company name": "Vodafone Group"})
+        miss = await crawler.get_stock_data(fallback)
+    assert hit == {
+        "stock code": "VOD",
+        "company name": "Vodafone Group",
+        "price": "72.50GBX",
+        "timestamp": "16:35",
+        "status": "success",
+        "error": None,
+    }
+    assert miss["status"] == "failed"
+    assert "browser fallback" in miss["error"]
+    crawler._get_page_pool.assert_called_once()
+
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        Crawler(engine="telnet")
@@ -0,0 +1,88 @@
+import io
+import asyncio
+import pytest
+from api.job_manager import JobManager, JobQueueFullError
+
+CSV = b"stock code,company name\nVOD,Vodafone\nBT,BT Group\nBARC,Barclays\n"
+
+
+class FakeCrawler:
+    def __init__(self, gate=None):
+        self.gate = gate
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def crawl_iter(self, stocks):
+        async for stock in stocks:
+            if self.gate is not None:
+                await self.gate.wait()
+            failed = stock["stock code"] == "BT"
+            yield {**stock, "price": "1GBX", "status": "failed" if failed else "success", "error": None}
+
+
+async def wait_for(job, status):
+    for _ in range(200):
+        if job.status == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job stayed {job.status}")
+
+
+@pytest.mark.asyncio
+async def test_job_runs_in_background_and_reports_progress(tmp_path):
+    gate = asyncio.Event()
+
+    async def factory(refresh):
+        return FakeCrawler(gate)
+
+    async with JobManager(factory, workers=1, result_dir=tmp_path) as manager:
+        job = await manager.submit(io.BytesIO(CSV), "stocks.csv")
+        assert job.to_dict()["total"] == 3
+        await wait_for(job, "running")
+        assert job.processed == 0
+        gate.set()
+        await wait_for(job, "done")
+
+    assert (job.processed, job.succeeded, job.failed) == (3, 2, 1)
+    assert job.result_path.read_text() == "stock code,company name,price\nVOD,Vodafone,1GBX\nBARC,Barclays,1GBX\n"
+    assert not job.input_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_submit_applies_backpressure_when_queue_is_full(tmp_path):
+    gate = asyncio.Event()
+
+    async def factory(refresh):
+        return FakeCrawler(gate)
+
+    async with JobManager(factory, workers=1, max_queue=1, result_dir=tmp_path) as manager:
+        running = await manager.submit(io.BytesIO(CSV), "a.csv")
+        await wait_for(running, "running")
+        queued = await manager.submit(io.BytesIO(CSV), "b.csv")
+        with pytest.raises(JobQueueFullError):
+            await manager.submit(io.BytesIO(CSV), "c.csv")
+        assert manager.stats()["queued"] == 1
+        gate.set()
+        await wait_for(queued, "done")
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_missing_columns_and_records_failures(tmp_path):
+    async def factory(refresh):
+        raise RuntimeError("no browser available")
+
+    async with JobManager(factory, workers=1, result_dir=tmp_path, max_finished_jobs=1) as manager:
+        with pytest.raises(ValueError):
+            await manager.submit(io.BytesIO(b"code,name\nVOD,Vodafone\n"), "bad.csv")
+        first = await manager.submit(io.BytesIO(CSV), "a.csv")
+        await wait_for(first, "failed")
+        assert "no browser available" in first.error
+        second = await manager.submit(io.BytesIO(CSV), "b.csv")
+        await wait_for(second, "failed")
+        await asyncio.sleep(0.01)
+        assert manager.get(first.id) is None
+        assert manager.get(second.id) is second
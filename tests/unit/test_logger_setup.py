@@ -0,0 +1,77 @@
+import json
+import logging
+import pytest
+from utils import logger_setup
+from utils.logger_setup import JSONFormatter, LogSampler, TextFormatter
+
+
+def make_record(msg, *args, level=logging.INFO, name="core.crawler", sampled=True):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    if sampled:
+        record.sampled = True
+    return record
+
+
+def test_sampler_keeps_one_in_n_repeats_of_a_template_and_reports_suppressed():
+    sampler = LogSampler(sample_every=3)
+    kept = [sampler.filter(make_record("Fetching %s", code)) for code in ("A", "B", "C", "D")]
+    assert kept == [True, False, False, True]
+    assert sampler.filter(make_record("Crawler initialized"))
+    record = make_record("Fetching %s", "E")
+    for _ in range(2):
+        sampler.filter(make_record("Fetching %s", "x"))
+    assert sampler.filter(record) and record.suppressed == 2
+    assert sampler.filter(make_record("Error fetching %s", "A", level=logging.ERROR))
+
+
+def test_sampler_passes_records_not_marked_as_sampled():
+    sampler = LogSampler(sample_every=10, rate_limit=1, clock=lambda: 0.0)
+    skipped = [sampler.filter(make_record("Skipping scheduled run: %s", n, sampled=False)) for n in range(5)]
+    assert skipped == [True] * 5
+    assert sampler.suppressed == 0
+
+
+def test_sampler_rate_limits_each_template():
+    now = [0.0]
+    sampler = LogSampler(rate_limit=2, clock=lambda: now[0])
+    assert [sampler.filter(make_record("Fetching %s", n)) for n in range(4)] == [True, True, False, False]
+    now[0] = 0.5
+    record = make_record("Fetching %s", 4)
+    assert sampler.filter(record) and record.suppressed == 2
+    assert sampler.suppressed == 2
+
+
+def test_json_and_text_formatters():
+    record = make_record("Fetched %s", "VOD")
+    record.suppressed = 3
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "Fetched VOD" and entry["level"] == "INFO" and entry["suppressed"] == 3
+    assert TextFormatter("%(message)s").format(record) == "Fetched VOD [3 similar suppressed]"
+
+
+def test_setup_logging_writes_through_a_background_listener(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOG_DIR", str(tmp_path))
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    monkeypatch.setattr(logger_setup, "_listener", None)
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers = []
+    try:
+        logger_setup.setup_logging("test")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("core.crawler").exception("Error fetching %s", "VOD")
+    finally:
+        logger_setup.stop_logging()
+        for handler in root.handlers:
+            handler.close()
+        root.handlers, root.level = saved_handlers, saved_level
+    entry = json.loads((tmp_path / "test.log").read_text().splitlines()[-1])
+    assert entry["message"] == "Error fetching VOD"
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_sampler_rejects_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        LogSampler(sample_every=0)
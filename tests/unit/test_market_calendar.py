@@ -0,0 +1,63 @@
+from datetime import date, datetime, time, timezone
+from zoneinfo import ZoneInfo
+import pytest
+from cron.cron_adapter import CronAdapter, CronSchedule
+from cron.market_calendar import DEFAULT_HOLIDAYS_FILE, MarketCalendar, load_holidays
+
+LONDON = ZoneInfo("Europe/London")
+
+
+def london(*args):
+    return datetime(*args, tzinfo=LONDON)
+
+
+def test_session_hours_follow_london_time_across_dst():
+    calendar = MarketCalendar()
+    assert calendar.is_open(london(2026, 10, 16, 8, 0))
+    assert not calendar.is_open(london(2026, 10, 16, 16, 30))
+    # 07:30 UTC is 08:30 in London during BST, but 07:30 in winter
+    assert calendar.is_open(datetime(2026, 7, 1, 7, 30, tzinfo=timezone.utc))
+    assert not calendar.is_open(datetime(2026, 12, 1, 7, 30, tzinfo=timezone.utc))
+
+
+def test_closed_reasons_and_next_open():
+    calendar = MarketCalendar.from_file()
+    assert calendar.closed_reason(london(2026, 10, 17, 12, 0)) == "weekend (Saturday)"
+    assert calendar.closed_reason(london(2026, 12, 25, 12, 0)) == "exchange holiday (2026-12-25)"
+    assert calendar.closed_reason(london(2026, 12, 24, 13, 0)) == "after the 12:30 close"
+    assert calendar.closed_reason(london(2026, 10, 19, 7, 59)) == "before the 08:00 open"
+    assert calendar.next_open(london(2026, 12, 24, 13, 0)) == london(2026, 12, 29, 8, 0)
+
+
+def test_load_holidays_rejects_invalid_lines(tmp_path):
+    holidays, early_closes = load_holidays(DEFAULT_HOLIDAYS_FILE)
+    assert date(2026, 4, 3) in holidays
+    assert early_closes[date(2026, 12, 31)] == time(12, 30)
+    path = tmp_path / "holidays.txt"
+    path.write_text("2026-13-01\n")
+    with pytest.raises(ValueError, match="holidays.txt:1"):
+        load_holidays(path)
+
+
+@pytest.mark.asyncio
+async def test_cron_adapter_skips_off_session_runs_or_thins_them_out(tmp_path):
+    adapter = CronAdapter(
+        tmp_path / "in.csv", tmp_path / "out.csv", CronSchedule(calendar=MarketCalendar(), off_hours_interval=3600)
+    )
+    runs = []
+
+    async def fake_process_file():
+        runs.append(True)
+        return "completed"
+
+    adapter._process_file = fake_process_file
+    for moment in (london(2026, 10, 17, 12, 0), london(2026, 10, 17, 12, 5), london(2026, 10, 17, 13, 0)):
+        adapter.schedule.now = lambda moment=moment: moment
+        await adapter._cron_task()
+    assert len(runs) == 2
+    assert adapter.skipped_runs == 1
+
+    adapter.schedule.off_hours_interval = 0
+    adapter.schedule.now = lambda: london(2026, 10, 19, 9, 0)
+    await adapter._cron_task()
+    assert len(runs) == 3
@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from prometheus_client import REGISTRY
+from core.crawler import Crawler
+from core.csv_handler import CSVHandler
+from core.metrics import write_metrics_snapshot
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def make_crawler(evaluate_result):
+    crawler = Crawler(max_concurrent=1)
+    fake_page = AsyncMock()
+    fake_page.is_closed = MagicMock(return_value=False)
+    fake_page.evaluate.return_value = evaluate_result
+    fake_context = AsyncMock()
+    fake_context.new_page.return_value = fake_page
+    crawler.browser = AsyncMock()
+    crawler.browser.new_context.return_value = fake_context
+    return crawler
+
+
+@pytest.mark.asyncio
+async def test_crawler_records_stage_timings_and_results():
+    navigations = sample("lse_navigation_seconds_count")
+    price_waits = sample("lse_selector_wait_seconds_count", field="price")
+    successes = sample("lse_stock_results_total", status="success", error_class="")
+    missing = sample("lse_stock_results_total", status="failed", error_class="missing_selector")
+
+    crawler = make_crawler(
+        {
+            "fields": {"price": "72.50", "timestamp": "16:35", "currency": "GBX"},
+            "timings": {"price": 12.0, "timestamp": 15.0, "currency": 15.0},
+            "missing": [],
+        }
+    )
+    await crawler.get_stock_data({"company name": "Vodafone", "stock code": "VOD"})
+    crawler = make_crawler({"fields": {}, "timings": {}, "missing": ["price", "timestamp", "currency"]})
+    await crawler.get_stock_data({"company name": "Vodafone", "stock code": "VOD"})
+
+    assert sample("lse_navigation_seconds_count") == navigations + 2
+    assert sample("lse_selector_wait_seconds_count", field="price") == price_waits + 1
+    assert sample("lse_stock_results_total", status="success", error_class="") == successes + 1
+    assert sample("lse_stock_results_total", status="failed", error_class="missing_selector") == missing + 1
+    assert sample("lse_pages_in_flight") == 0
+    assert sample("lse_concurrency_limit") == 1
+
+
+def test_metrics_snapshot_includes_csv_metrics(tmp_path):
+    rows = sample("lse_csv_rows_total", operation="write")
+    CSVHandler.write_csv([{"stock code": "VOD", "company name": "Vodafone"}], path=tmp_path / "out.csv")
+    assert sample("lse_csv_rows_total", operation="write") == rows + 1
+
+    snapshot = tmp_path / "metrics" / "cli.prom"
+    write_metrics_snapshot(snapshot)
+    text = snapshot.read_text()
+    assert "lse_csv_seconds_bucket" in text
+    assert "lse_stock_results_total" in text
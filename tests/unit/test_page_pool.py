@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from core.page_pool import PagePool
+
+
+def make_context():
+    context = AsyncMock()
+
+    def new_page():
+        page = AsyncMock()
+        page.is_closed = MagicMock(return_value=False)
+        return page
+
+    context.new_page.side_effect = new_page
+    return context
+
+
+@pytest.mark.asyncio
+async def test_page_is_reused_between_stocks():
+    pool = PagePool(make_context(), size=2, max_uses=10)
+    async with pool.page() as first:
+        pass
+    async with pool.page() as second:
+        pass
+    assert first is second
+    assert pool.created == 1
+    first.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_page_is_replaced():
+    pool = PagePool(make_context(), size=1)
+    with pytest.raises(RuntimeError):
+        async with pool.page() as broken:
+            raise RuntimeError("page crashed")
+    broken.close.assert_called_once()
+    async with pool.page() as fresh:
+        pass
+    assert fresh is not broken
+    assert pool.created == 2
+
+
+@pytest.mark.asyncio
+async def test_page_recycled_after_max_uses():
+    pool = PagePool(make_context(), size=1, max_uses=2)
+    for _ in range(2):
+        async with pool.page() as page:
+            pass
+    page.close.assert_called_once()
+    assert pool.recycled == 1
+    async with pool.page() as next_page:
+        pass
+    assert next_page is not page
+
+
+@pytest.mark.asyncio
+async def test_close_releases_all_pages():
+    pool = PagePool(make_context(), size=2)
+    async with pool.page() as page:
+        pass
+    await pool.close()
+    page.close.assert_called_once()
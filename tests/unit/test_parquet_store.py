@@ -0,0 +1,101 @@
+from datetime import date, datetime, timezone
+from pathlib import Path
+import pytest
+from core.parquet_store import MANIFEST, ParquetQuoteStore
+from core.quote_fields import parse_quote_time, split_price
+
+CRAWLED_AT = datetime(2026, 10, 16, 15, 40, tzinfo=timezone.utc)
+
+
+def row(code, price, timestamp="16:35"):
+    return {"stock code": code, "company name": f"{code} plc", "price": price, "timestamp": timestamp}
+
+
+def test_quote_fields_are_parsed_into_typed_values():
+    assert split_price("1,234.50GBX") == (1234.5, "GBX")
+    assert split_price("n/a") == (None, None)
+    assert parse_quote_time("16:35", CRAWLED_AT) == datetime(2026, 10, 16, 15, 35, tzinfo=timezone.utc)
+    # a refresh time later than the crawl is from the previous trading day
+    assert parse_quote_time("16:50", CRAWLED_AT) == datetime(2026, 10, 15, 15, 50, tzinfo=timezone.utc)
+    assert parse_quote_time("17:05:03 17-Oct-2026", CRAWLED_AT) == datetime(2026, 10, 17, 16, 5, 3, tzinfo=timezone.utc)
+
+
+def test_rows_are_written_typed_and_partitioned_by_date(tmp_path):
+    moments = iter([CRAWLED_AT, CRAWLED_AT, datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc)])
+    store = ParquetQuoteStore(tmp_path / "quotes", flush_rows=2, clock=lambda: next(moments))
+    assert store.write_rows([row("VOD", "72.50GBX"), row("BT", "1,150GBX"), row("VOD", "73GBX", "09:00")]) == 3
+
+    assert store.partitions() == ["2026-10-16", "2026-10-19"]
+    table = store.scan()
+    assert table.schema.field("price").type == "double"
+    assert sorted(table.column("price").to_pylist()) == [72.5, 73.0, 1150.0]
+
+    vod = store.scan("VOD", start=date(2026, 10, 17), columns=["stock_code", "price", "quote_time"]).to_pylist()
+    assert vod == [
+        {"stock_code": "VOD", "price": 73.0, "quote_time": datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)}
+    ]
+    assert sum(batch.num_rows for batch in store.iter_batches(["BT"], end=date(2026, 10, 16))) == 1
+
+
+def test_compaction_merges_small_files_of_a_partition(tmp_path):
+    store = ParquetQuoteStore(tmp_path / "quotes", flush_rows=1, clock=lambda: CRAWLED_AT)
+    store.write_rows([row("VOD", "72GBX"), row("BT", "1GBX"), row("VOD", "73GBX")])
+    assert len(store.files("2026-10-16")) == 3
+    assert store.compact(min_files=4) == 0
+
+    assert store.compact(min_files=3) == 1
+    files = store.files("2026-10-16")
+    assert len(files) == 1 and files[0].name.startswith("compacted-")
+    assert store.scan().column("stock_code").to_pylist() == ["BT", "VOD", "VOD"]
+
+
+def test_compaction_interrupted_after_publishing_is_not_double_counted(tmp_path, monkeypatch):
+    store = ParquetQuoteStore(tmp_path / "quotes", flush_rows=1, clock=lambda: CRAWLED_AT)
+    store.write_rows([row("VOD", "72GBX"), row("BT", "1GBX")])
+    inputs = store.files("2026-10-16")
+    unlink = Path.unlink
+
+    def crash_on_inputs(path, missing_ok=False):
+        if path in inputs:
+            raise OSError("crashed")
+        unlink(path, missing_ok=missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", crash_on_inputs)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.setattr(Path, "unlink", unlink)
+    assert len(store.files("2026-10-16")) == 3
+    assert store.scan().num_rows == 2
+
+    store.write_rows([row("BT", "2GBX")])
+    assert store.compact(min_files=3) == 0  # recovery removed the replaced inputs
+    assert [file.name.split("-")[0] for file in store.files("2026-10-16")] == ["compacted", "part"]
+    assert not (tmp_path / "quotes" / "date=2026-10-16" / MANIFEST).exists()
+    assert store.scan().num_rows == 3
+
+
+def test_compaction_interrupted_before_publishing_is_rolled_back(tmp_path, monkeypatch):
+    store = ParquetQuoteStore(tmp_path / "quotes", flush_rows=1, clock=lambda: CRAWLED_AT)
+    store.write_rows([row("VOD", "72GBX"), row("BT", "1GBX")])
+    monkeypatch.setattr("core.parquet_store.os.replace", _replace_manifest_only)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.undo()
+    assert store.scan().num_rows == 2
+
+    assert store.compact() == 1
+    assert [path.name.split("-")[0] for path in (tmp_path / "quotes" / "date=2026-10-16").iterdir()] == ["compacted"]
+    assert store.scan().num_rows == 2
+
+
+def _replace_manifest_only(source, target):
+    if not str(target).endswith(MANIFEST):
+        raise OSError("crashed")
+    Path(source).rename(target)
+
+
+def test_scan_of_empty_store_returns_empty_table(tmp_path):
+    store = ParquetQuoteStore(tmp_path / "missing")
+    assert store.scan().num_rows == 0
+    with pytest.raises(ValueError):
+        ParquetQuoteStore(tmp_path, flush_rows=0)
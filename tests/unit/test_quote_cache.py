@@ -0,0 +1,114 @@
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from core.crawler import Crawler
+from core.quote_cache import MemoryQuoteCache, QuoteCache, SQLiteQuoteCache, create_quote_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+QUOTE = {
+    "stock code": "VOD",
+    "company name": "Vodafone",
+    "price": "72.5GBX",
+    "timestamp": "16:35",
+    "status": "success",
+    "error": None,
+}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == "memory":
+            return MemoryQuoteCache(**kwargs)
+        return SQLiteQuoteCache(tmp_path / "cache.sqlite", **kwargs)
+
+    return factory
+
+
+def test_cache_hit_until_ttl_expires(make_cache):
+    clock = FakeClock()
+    cache = make_cache(ttl=60, clock=clock)
+    assert cache.get("VOD") is None
+    cache.set("VOD", QUOTE)
+    clock.now += 59
+    assert cache.get("VOD") == QUOTE
+    clock.now += 2
+    assert cache.get("VOD") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_cache_evicts_least_recently_used(make_cache):
+    clock = FakeClock()
+    cache = make_cache(ttl=60, max_size=2, clock=clock)
+    cache.set("A", QUOTE)
+    clock.now += 1
+    cache.set("B", QUOTE)
+    clock.now += 1
+    cache.get("A")
+    clock.now += 1
+    cache.set("C", QUOTE)
+    assert cache.get("B") is None
+    assert cache.get("A") is not None
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = tmp_path / "shared.sqlite"
+    SQLiteQuoteCache(path, ttl=60).set("VOD", QUOTE)
+    assert SQLiteQuoteCache(path, ttl=60).get("VOD") == QUOTE
+
+
+def test_create_quote_cache_disabled_by_zero_ttl(tmp_path):
+    assert create_quote_cache(ttl=0) is None
+    assert isinstance(create_quote_cache(ttl=5), MemoryQuoteCache)
+    assert isinstance(create_quote_cache(tmp_path / "c.sqlite", ttl=5), SQLiteQuoteCache)
+
+
+@pytest.mark.asyncio
+async def test_crawler_serves_cached_quotes_and_honours_refresh():
+    crawler = Crawler(cache=MemoryQuoteCache(ttl=60))
+
+    @asynccontextmanager
+    async def fake_page():
+        yield MagicMock()
+
+    page_pool = MagicMock()
+    page_pool.page = fake_page
+    crawler._get_page_pool = AsyncMock(return_value=page_pool)
+    crawler._scrape_page = AsyncMock(return_value=dict(QUOTE))
+    stock = {"stock code": "VOD", "company name": "Vodafone Group"}
+
+    await crawler.get_stock_data(stock)
+    cached = await crawler.get_stock_data(stock)
+    await crawler.get_stock_data(stock, force_refresh=True)
+
+    assert cached["price"] == "72.5GBX"
+    assert cached["company name"] == "Vodafone Group"
+    assert crawler._scrape_page.call_count == 2
+
+
+def test_sqlite_cache_survives_pickling(tmp_path):
+    import pickle
+
+    cache = SQLiteQuoteCache(tmp_path / "cache.sqlite", ttl=60)
+    cache.set("VOD", QUOTE)
+    assert pickle.loads(pickle.dumps(cache)).get("VOD") == QUOTE
+
+
+def test_incomplete_backend_fails_on_creation():
+    class GetOnlyCache(QuoteCache):
+        def _get(self, stock_code, min_stored_at):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyCache()
@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from cli.cli_adapter import CLIAdapter
+from core.quote_history import QuoteHistory
+from core.stock_processor import StocksProcessor
+
+START = datetime(2026, 10, 16, 8, 0, tzinfo=timezone.utc)
+
+
+def row(code, price, timestamp="09:00"):
+    return {
+        "stock code": code,
+        "company name": f"{code} plc",
+        "price": price,
+        "timestamp": timestamp,
+        "status": "success",
+    }
+
+
+def test_quotes_are_committed_in_batches_and_queried_by_quote_time(tmp_path):
+    moments = iter(START + timedelta(minutes=30 + 5 * index) for index in range(10))
+    history = QuoteHistory(tmp_path / "history.sqlite", batch_size=3, clock=lambda: next(moments))
+    # London (BST) refresh times 09:00, 09:05, ... are 08:00, 08:05, ... UTC, all before the crawl times
+    due = [history.add(row("VOD", f"{70 + index}GBX", f"09:{5 * index:02d}")) for index in range(3)]
+    assert due == [False, False, True]
+    assert history.stats()["rows_written"] == 0
+    history.flush()
+    history.add(row("VOD", "73GBX", "09:15"))
+    history.add(row("BT", "1,150GBX"))
+    assert history.stats()["pending"] == 2
+    history.flush()
+    assert history.stats()["rows_written"] == 5
+
+    latest = history.latest("VOD")
+    assert latest["price"] == 73.0 and latest["currency"] == "GBX"
+    assert latest["crawled_at"] == "2026-10-16T08:45:00+00:00"
+    assert latest["quote_time"] == "2026-10-16T08:15:00+00:00"
+    window = history.history("VOD", start=START + timedelta(minutes=5), end=datetime(2026, 10, 16, 8, 10))
+    assert [quote["price"] for quote in window] == [71.0, 72.0]
+    assert history.latest("BARC") is None
+    history.close()
+
+    reopened = QuoteHistory(tmp_path / "history.sqlite")
+    assert reopened.latest("BT")["price"] == 1150.0
+    assert reopened._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = reopened._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM quotes WHERE stock_code = ? AND quote_time >= ?", ("VOD", 0)
+    ).fetchall()
+    assert "idx_quotes_code_quoted" in str(plan)
+
+
+@pytest.mark.asyncio
+async def test_processor_records_successful_results(tmp_path):
+    class StreamingCrawler:
+        async def crawl_iter(self, stocks):
+            for stock in stocks:
+                failed = stock["stock code"] == "BT"
+                yield {**row(stock["stock code"], "72.5GBX"), "status": "failed" if failed else "success"}
+
+    history = QuoteHistory(tmp_path / "history.sqlite", batch_size=100)
+    processor = StocksProcessor(StreamingCrawler(), history=history)
+    rows = [r async for r in processor.process_stream([{"stock code": "VOD"}, {"stock code": "BT"}])]
+
+    assert len(rows) == 1
+    assert history.stats() == {"path": str(tmp_path / "history.sqlite"), "rows_written": 1, "pending": 0}
+    assert history.latest("BT") is None
+
+
+@pytest.mark.asyncio
+async def test_cli_run_closes_history_and_checkpoints_the_wal(tmp_path, fake_crawler):
+    path = tmp_path / "history.sqlite"
+    (tmp_path / "in.csv").write_text("stock code,company name\nVOD,VOD plc\n")
+    fake_crawler("cli.cli_adapter.create_crawler", {"VOD": "72.5GBX"}, timestamp="09:00")
+    reader = QuoteHistory(path)  # an open reader keeps the WAL file from being removed on close
+    history = QuoteHistory(path)
+    await CLIAdapter.run(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), history=history)
+
+    with pytest.raises(Exception, match="closed"):
+        history.latest("VOD")
+    assert (tmp_path / "history.sqlite-wal").stat().st_size == 0
+    assert reader.latest("VOD")["price"] == 72.5
+    reader.close()
@@ -0,0 +1,73 @@
+import asyncio
+import multiprocessing
+import time
+import pytest
+from core.crawler import Crawler, CrawlerOptions
+from core.rate_limiter import FileTokenBucket, TokenBucket, create_rate_limiter
+from core.sharding import ShardedCrawler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+    assert [bucket._reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket._reserve() == pytest.approx(0.5)
+    assert bucket._reserve() == pytest.approx(1.0)
+    clock.now = 10
+    assert bucket._reserve() == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_bounds_request_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    started = time.monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(11)))
+    assert time.monotonic() - started >= 0.18
+    assert bucket.stats()["delayed"] == 10
+
+
+def _reserve_from_file(path):
+    bucket = FileTokenBucket(path, rate=1, burst=2)
+    return [bucket._reserve() for _ in range(2)]
+
+
+def test_file_token_bucket_is_shared_between_processes(tmp_path):
+    path = tmp_path / "rate_limit.json"
+    with multiprocessing.get_context("spawn").Pool(2) as pool:
+        waits = sorted(wait for waits in pool.map(_reserve_from_file, [path, path]) for wait in waits)
+    assert waits[:2] == [0, 0]
+    assert waits[2] > 0.9 and waits[3] > 1.9
+
+
+def test_create_rate_limiter(tmp_path):
+    assert create_rate_limiter(0) is None
+    assert type(create_rate_limiter(5, burst=2)) is TokenBucket
+    assert isinstance(create_rate_limiter(5, path=tmp_path / "rl.json"), FileTokenBucket)
+
+
+def test_sharded_crawler_splits_in_process_budget():
+    sharded = ShardedCrawler(4, CrawlerOptions(rate_limiter=TokenBucket(rate=8, burst=8)))
+    assert (sharded.crawler_options.rate_limiter.rate, sharded.crawler_options.rate_limiter.burst) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_crawler_throttles_requests(lse_server):
+    stocks = [{"stock code": f"S{i}", "company name": f"Company {i}"} for i in range(6)]
+    for stock in stocks:
+        lse_server.add_company(stock["stock code"], stock["company name"])
+    bucket = TokenBucket(rate=20, burst=1)
+    async with Crawler(max_concurrent=6, engine="http", rate_limiter=bucket) as crawler:
+        crawler.base_url = lse_server.base_url
+        started = time.monotonic()
+        results = await crawler.crawl_all(stocks)
+    assert all(result["status"] == "success" for result in results)
+    assert time.monotonic() - started >= 0.2
+    assert bucket.acquired == 6
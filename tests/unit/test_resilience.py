@@ -0,0 +1,121 @@
+import asyncio
+import random
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from playwright.async_api import Error as PlaywrightError
+from core.crawler import Crawler
+from core.resilience import CircuitBreaker, MissingSelectorError, NotFoundError, RetryPolicy, classify_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_classify_error():
+    assert classify_error(asyncio.TimeoutError()) == "timeout"
+    assert classify_error(PlaywrightError("net::ERR_CONNECTION_REFUSED at https://x")) == "navigation"
+    assert classify_error(NotFoundError("404")) == "not_found"
+    assert classify_error(MissingSelectorError(".price-tag")) == "missing_selector"
+    assert classify_error(ValueError("boom")) == "unknown"
+
+
+def test_retry_policy_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=3.0, rng=random.Random(1))
+    assert policy.should_retry("timeout", 1)
+    assert not policy.should_retry("timeout", 3)
+    assert not policy.should_retry("not_found", 1)
+    delays = [policy.delay(attempt) for attempt in (1, 2, 3, 4, 5)]
+    assert all(0 <= delay <= cap for delay, cap in zip(delays, (1.0, 2.0, 3.0, 3.0, 3.0)))
+
+
+def test_circuit_breaker_opens_fails_fast_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=0.5, window=4, min_calls=4, reset_timeout=10, clock=clock)
+    for error_class in (None, "timeout", "not_found", "navigation"):
+        ticket = breaker.allow()
+        assert ticket
+        breaker.record(error_class, ticket)
+    assert breaker.state == "open"
+    assert breaker.allow() is None
+
+    clock.now = 10
+    probe = breaker.allow()
+    assert probe
+    assert breaker.allow() is None  # only one probe while half-open
+    breaker.record("timeout", probe)
+    assert breaker.state == "open"
+
+    clock.now = 20
+    probe = breaker.allow()
+    breaker.record(None, probe)
+    assert breaker.state == "closed"
+    assert breaker.stats()["trips"] == 2
+
+
+def test_circuit_breaker_ignores_in_flight_results_while_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=0.5, window=2, min_calls=2, reset_timeout=10, clock=clock)
+    tickets = [breaker.allow() for _ in range(4)]
+    breaker.record("timeout", tickets[0])
+    breaker.record("timeout", tickets[1])
+    assert breaker.state == "open"
+
+    clock.now = 10
+    probe = breaker.allow()
+    breaker.record(None, tickets[2])  # started before the breaker opened
+    assert breaker.state == "half_open"
+    breaker.record(None, probe)
+    assert breaker.state == "closed"
+    breaker.record("timeout", tickets[3])  # late failure from before the trip
+    breaker.record("timeout", breaker.allow())
+    assert breaker.state == "closed"
+    assert breaker.failure_rate == 1.0
+
+
+def make_crawler(goto, **kwargs):
+    crawler = Crawler(max_concurrent=1, retry_policy=RetryPolicy(base_delay=0, max_delay=0), **kwargs)
+    fake_page = AsyncMock()
+    fake_page.goto.side_effect = goto
+    fake_page.is_closed = MagicMock(return_value=False)
+    fake_page.evaluate.return_value = {
+        "fields": {"price": "72.50", "timestamp": "16:35", "currency": "GBX"},
+        "timings": {},
+        "missing": [],
+    }
+    fake_context = AsyncMock()
+    fake_context.new_page.return_value = fake_page
+    crawler.browser = AsyncMock()
+    crawler.browser.new_context.return_value = fake_context
+    return crawler, fake_page
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried():
+    crawler, page = make_crawler([asyncio.TimeoutError(), PlaywrightError("net::ERR_TIMED_OUT"), MagicMock(status=200)])
+    result = await crawler.get_stock_data({"company name": "Vodafone", "stock code": "VOD"})
+    assert result["status"] == "success"
+    assert page.goto.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_classified_and_not_retried():
+    crawler, page = make_crawler([MagicMock(status=404)])
+    result = await crawler.get_stock_data({"company name": "Vodafone", "stock code": "VOD"})
+    assert result["status"] == "failed"
+    assert result["error_class"] == "not_found"
+    assert page.goto.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_rest_of_batch_fast():
+    breaker = CircuitBreaker(window=4, min_calls=4, reset_timeout=60)
+    crawler, page = make_crawler(asyncio.TimeoutError(), circuit_breaker=breaker)
+    stocks = [{"company name": f"Company {i}", "stock code": f"S{i}"} for i in range(10)]
+    results = await crawler.crawl_all(stocks)
+    assert all(result["status"] == "failed" for result in results)
+    assert [result["error_class"] for result in results].count("circuit_open") >= 7
+    assert page.goto.call_count == 4
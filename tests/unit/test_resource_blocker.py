@@ -0,0 +1,47 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from core.resource_blocker import ResourceBlocker
+
+
+def make_route(resource_type, url):
+    route = AsyncMock()
+    route.request = MagicMock(resource_type=resource_type, url=url)
+    return route
+
+
+@pytest.mark.parametrize(
+    "resource_type, url, blocked",
+    [
+        ("document", "https://www.londonstockexchange.com/stock/VOD/vodafone/company-page", False),
+        ("image", "https://www.londonstockexchange.com/logo.png", True),
+        ("font", "https://fonts.example.com/font.woff2", True),
+        ("script", "https://www.googletagmanager.com/gtm.js", True),
+        ("script", "https://www.londonstockexchange.com/main.js", False),
+    ],
+)
+def test_default_rules(resource_type, url, blocked):
+    assert ResourceBlocker().should_block(resource_type, url) is blocked
+
+
+def test_allowlist_takes_precedence():
+    blocker = ResourceBlocker(allowed_domains=["londonstockexchange.com"], allowed_resource_types=["font"])
+    assert not blocker.should_block("image", "https://cdn.londonstockexchange.com/a.png")
+    assert not blocker.should_block("font", "https://fonts.example.com/font.woff2")
+    assert blocker.should_block("image", "https://other.example.com/a.png")
+
+
+@pytest.mark.asyncio
+async def test_handle_counts_requests_and_bytes():
+    blocker = ResourceBlocker(estimated_sizes={"image": 100})
+    blocked = make_route("image", "https://www.londonstockexchange.com/a.png")
+    allowed = make_route("document", "https://www.londonstockexchange.com/")
+    await blocker.handle(blocked)
+    await blocker.handle(allowed)
+    blocked.abort.assert_called_once()
+    allowed.continue_.assert_called_once()
+    assert blocker.stats() == {
+        "requests_allowed": 1,
+        "requests_blocked": 1,
+        "estimated_bytes_saved": 100,
+        "blocked_by_type": {"image": 1},
+    }
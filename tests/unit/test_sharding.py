@@ -0,0 +1,82 @@
+import asyncio
+import os
+import threading
+import time
+import pytest
+from core.crawler import CrawlerOptions
+from core.sharding import ShardedCrawler, split_shards
+
+
+def fake_shard(shard, crawler_options):
+    return [
+        {**stock, "status": "success", "worker": os.getpid(), "max_concurrent": crawler_options.max_concurrent}
+        for stock in shard
+    ]
+
+
+def failing_shard(shard, crawler_options):
+    raise RuntimeError("worker crashed")
+
+
+def stuck_shard(shard, crawler_options):
+    time.sleep(60)
+
+
+def make_stocks(count):
+    return [{"stock code": f"S{i}", "company name": f"Company {i}"} for i in range(count)]
+
+
+def test_split_shards_is_contiguous_and_balanced():
+    shards = split_shards(make_stocks(7), 3)
+    assert [len(shard) for shard in shards] == [3, 2, 2]
+    assert [stock for shard in shards for stock in shard] == make_stocks(7)
+    assert split_shards(make_stocks(1), 4) == [make_stocks(1)]
+
+
+@pytest.mark.asyncio
+async def test_sharded_crawl_merges_results_in_input_order():
+    stocks = make_stocks(10)
+    async with ShardedCrawler(
+        workers=2, crawler_options=CrawlerOptions(max_concurrent=3), shard_fn=fake_shard
+    ) as crawler:
+        results = await crawler.crawl_all(stocks)
+    assert [r["stock code"] for r in results] == [s["stock code"] for s in stocks]
+    assert {r["max_concurrent"] for r in results} == {3}
+
+
+@pytest.mark.asyncio
+async def test_sharded_crawl_iter_yields_every_stock():
+    async with ShardedCrawler(workers=2, shard_fn=fake_shard) as crawler:
+        codes = [r["stock code"] async for r in crawler.crawl_iter(iter(make_stocks(5)))]
+    assert sorted(codes) == sorted(s["stock code"] for s in make_stocks(5))
+
+
+@pytest.mark.asyncio
+async def test_worker_errors_propagate_and_pool_is_terminated():
+    crawler = ShardedCrawler(workers=2, shard_fn=failing_shard)
+    with pytest.raises(RuntimeError, match="worker crashed"):
+        async with crawler:
+            await crawler.crawl_all(make_stocks(4))
+    assert crawler.pool is None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_crawl_kills_workers_even_if_terminate_hangs():
+    crawler = ShardedCrawler(workers=2, shard_fn=stuck_shard, terminate_timeout=0.5)
+    workers = []
+
+    async def crawl():
+        async with crawler:
+            workers.extend(crawler.pool._pool)
+            crawler.pool.join = threading.Event().wait  # simulates the Pool.terminate deadlock
+            await crawler.crawl_all(make_stocks(4))
+
+    task = asyncio.create_task(crawl())
+    await asyncio.sleep(0.5)
+    task.cancel()
+    done, _ = await asyncio.wait({task}, timeout=10)
+    assert done and task.cancelled()
+    assert crawler.pool is None
+    for process in workers:
+        process.join(timeout=5)
+        assert not process.is_alive()
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from core.crawler import Crawler
+from core.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"price": "1"}
+
+    results = await asyncio.gather(*(flight.do("VOD", fetch) for _ in range(5)))
+    assert calls == 1
+    assert all(r == {"price": "1"} for r in results)
+    assert flight.coalesced == 4
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_exceptions_propagate_to_all_waiters():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(flight.do("X", fail), flight.do("X", fail), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("VOD", fetch))
+    second = asyncio.create_task(flight.do("VOD", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == "done"
+
+
+@pytest.mark.asyncio
+async def test_crawl_all_fetches_repeated_codes_once():
+    crawler = Crawler()
+    fetched = []
+
+    async def fake_fetch(stock):
+        fetched.append(stock["stock code"])
+        await asyncio.sleep(0)
+        return {"stock code": stock["stock code"], "company name": stock["company name"], "status": "success"}
+
+    crawler._fetch_stock_data = fake_fetch
+    stocks = [
+        {"stock code": "VOD", "company name": "Vodafone"},
+        {"stock code": "BT", "company name": "BT Group"},
+        {"stock code": "VOD", "company name": "Vodafone Group"},
+    ]
+    results = await crawler.crawl_all(stocks)
+
+    assert sorted(fetched) == ["BT", "VOD"]
+    assert [r["company name"] for r in results] == ["Vodafone", "BT Group", "Vodafone Group"]
@@ -25,3 +25,16 @@ async def test_process_stocks_partial_success(monkeypatch):
     processor = StocksProcessor(MixedCrawler())
     result = await processor.process_stocks([{"company name": "Vodafone"}, {"company name": "BT"}])
     assert len(result) == 1
+
+
+@pytest.mark.asyncio
+async def test_process_stream_filters_and_cleans_incrementally():
+    class StreamingCrawler:
+        async def crawl_iter(self, stocks):
+            for stock in stocks:
+                yield {**stock, "status": "failed" if stock["stock code"] == "BT" else "success", "error": None}
+
+    processor = StocksProcessor(StreamingCrawler())
+    stocks = [{"company name": "Vodafone", "stock code": "V"}, {"company name": "BT", "stock code": "BT"}]
+    result = [row async for row in processor.process_stream(stocks)]
+    assert result == [{"company name": "Vodafone", "stock code": "V"}]
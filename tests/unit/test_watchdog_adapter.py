@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from core.batch_crawler import BatchCrawler
+from core.crawler import Crawler
+from watchdog.watchdog_adapter import WatcherAdapter
+
+
+def make_crawler(fetched):
+    crawler = Crawler(max_concurrent=4)
+
+    async def fake_fetch(stock):
+        fetched.append(stock["stock code"])
+        await asyncio.sleep(0.01)
+        return {**stock, "price": "1GBX", "status": "success", "error": None}
+
+    crawler._fetch_stock_data = fake_fetch
+    return crawler
+
+
+@pytest.mark.asyncio
+async def test_batch_crawler_fetches_each_code_once():
+    fetched = []
+    batch = BatchCrawler(make_crawler(fetched))
+    first = [{"stock code": "VOD", "company name": "Vodafone"}, {"stock code": "BT", "company name": "BT Group"}]
+    second = [{"stock code": "VOD", "company name": "Vodafone Group"}]
+
+    async def collect(stocks):
+        return [row async for row in batch.crawl_iter(stocks)]
+
+    results = await asyncio.gather(collect(first), collect(second))
+    later = await collect(second)
+
+    assert sorted(fetched) == ["BT", "VOD"]
+    assert results[1][0]["company name"] == "Vodafone Group"
+    assert later[0]["price"] == "1GBX"
+    assert batch.deduplicated == 2
+
+
+@pytest.mark.asyncio
+async def test_files_of_one_batch_share_fetches_and_are_processed_concurrently(tmp_path):
+    input_dir, output_dir = tmp_path / "in", tmp_path / "out"
+    adapter = WatcherAdapter(str(input_dir), str(output_dir), workers=2, settle_interval=0.01)
+    fetched = []
+    adapter.crawler = make_crawler(fetched)
+    paths = []
+    for name, rows in (("a", "VOD,Vodafone\nBT,BT Group\n"), ("b", "VOD,Vodafone\nBARC,Barclays\n")):
+        path = input_dir / f"{name}.csv"
+        path.write_text("stock code,company name\n" + rows)
+        paths.append(str(path))
+    workers = [asyncio.create_task(adapter._worker(index)) for index in range(2)]
+
+    await adapter.submit_batch(paths)
+    await adapter.queue.join()
+    for task in workers:
+        task.cancel()
+
+    assert sorted(fetched) == ["BARC", "BT", "VOD"]
+    outputs = sorted(output_dir.glob("stocks_output_*.csv"))
+    assert [p.name.rsplit("_", 1)[1] for p in outputs] == ["a.csv", "b.csv"]
+    assert "VOD,Vodafone,1GBX" in outputs[1].read_text()
+
+
+@pytest.mark.asyncio
+async def test_wait_until_stable_waits_for_writer(tmp_path):
+    adapter = WatcherAdapter(str(tmp_path / "in"), str(tmp_path / "out"), settle_interval=0.02)
+    path = tmp_path / "in" / "growing.csv"
+    path.write_text("stock code,company name\n")
+
+    async def keep_writing():
+        for index in range(3):
+            await asyncio.sleep(0.01)
+            with open(path, "a") as f:
+                f.write(f"CODE{index},Company {index}\n")
+
+    writer = asyncio.create_task(keep_writing())
+    assert await adapter._wait_until_stable(str(path)) == str(path)
+    assert writer.done()
+    assert await adapter._wait_until_stable(str(tmp_path / "in" / "missing.csv")) is None